@@ -0,0 +1,144 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+class DeliveryQueue(object):
+    """
+    A background queue that delivers finished messages so report jobs don't wait on the chat platform.
+
+    Each channel gets its own worker thread, so messages for one channel are delivered in the order they were
+    submitted and a slow or rate limited channel doesn't hold up the others.
+
+    Attributes
+    ----------
+    delivered : int
+        The number of messages delivered.
+    failed : int
+        The number of messages that could not be delivered.
+    """
+
+    def __init__(self):
+        self.delivered = 0
+        self.failed = 0
+        self._channels = {}
+        self._latencies = []
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "DeliveryQueue(depth=%d, delivered=%d, failed=%d)" % (self.depth(), self.delivered, self.failed)
+
+    def submit(self, bot, message):
+        """
+        Queues a message for delivery through a chat bot.
+
+        Parameters
+        ----------
+        bot : object
+            The chat bot to send the message with, e.g. a Discord object.
+        message : str
+            The message to send.
+        """
+
+        self._channel(bot).put((bot.send_message, message, time.monotonic()))
+
+    def submit_embeds(self, bot, sections):
+        """
+        Queues several report sections for delivery as one batch of embeds.
+
+        Parameters
+        ----------
+        bot : object
+            The chat bot to send the sections with, e.g. a Discord object.
+        sections : list of str
+            The report sections to send.
+        """
+
+        self._channel(bot).put((bot.send_embeds, sections, time.monotonic()))
+
+    def _channel(self, bot):
+        with self._lock:
+            channel = self._channels.get(repr(bot))
+            if channel is None:
+                channel = queue.Queue()
+                worker = threading.Thread(target=self._work, args=(bot, channel), daemon=True,
+                                          name='delivery-%d' % len(self._channels))
+                self._channels[repr(bot)] = channel
+                worker.start()
+            return channel
+
+    def _work(self, bot, channel):
+        while True:
+            send, message, queued_at = channel.get()
+            try:
+                send(message)
+                with self._lock:
+                    self.delivered += 1
+                    self._latencies = self._latencies[-99:] + [time.monotonic() - queued_at]
+            except Exception:
+                logger.exception("Failed to deliver message through %s" % bot)
+                with self._lock:
+                    self.failed += 1
+            finally:
+                channel.task_done()
+
+    def depth(self):
+        """
+        Returns the number of messages waiting to be delivered across all channels.
+
+        Returns
+        -------
+        int
+            The number of queued messages.
+        """
+
+        return sum(channel.qsize() for channel in list(self._channels.values()))
+
+    def latency(self):
+        """
+        Returns delivery latency statistics, measured from submission to delivery, over the last 100 messages.
+
+        Returns
+        -------
+        dict
+            A dictionary with the last, average and maximum latency in seconds.
+        """
+
+        with self._lock:
+            latencies = list(self._latencies)
+        if not latencies:
+            return {'last': 0, 'avg': 0, 'max': 0}
+        return {'last': latencies[-1], 'avg': sum(latencies) / len(latencies), 'max': max(latencies)}
+
+    def join(self):
+        """
+        Blocks until every queued message has been delivered or has failed.
+        """
+
+        for channel in list(self._channels.values()):
+            channel.join()
+
+
+def get_queue():
+    """
+    Returns the process-wide delivery queue, which is drained before the process exits.
+
+    Returns
+    -------
+    DeliveryQueue
+        The shared delivery queue.
+    """
+
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = DeliveryQueue()
+            atexit.register(_queue.join)
+        return _queue
@@ -1,9 +1,79 @@
 import requests
 import json
 import logging
+import threading
+import time
+from requests.adapters import HTTPAdapter
+import gamedaybot.utils.util as util
+from gamedaybot.utils.metrics import span
 
 logger = logging.getLogger(__name__)
 
+_session = None
+_session_lock = threading.Lock()
+# when each webhook's emptied rate limit bucket resets, shared by every Discord object posting to it
+_ready_at = {}
+_ready_at_lock = threading.Lock()
+
+# Discord webhook limits, and the quote prefix every plain message is sent with
+MESSAGE_PREFIX = '>>> '
+EMBED_DESCRIPTION_LIMIT = 4096
+EMBEDS_PER_MESSAGE = 10
+EMBED_CHARS_PER_MESSAGE = 6000
+
+
+def get_session():
+    """
+    Returns the keep-alive HTTP session shared by every Discord webhook in the process.
+
+    Returns
+    -------
+    requests.Session
+        The shared session.
+    """
+
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            _session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+        return _session
+
+
+def pack_embeds(sections):
+    """
+    Packs report sections into as few webhook payloads as Discord's embed limits allow.
+
+    Sections longer than an embed description are split into several embeds.
+
+    Parameters
+    ----------
+    sections : list of str
+        The report sections to send.
+
+    Returns
+    -------
+    list of list
+        A list of embed lists, one per webhook payload.
+    """
+
+    payloads = []
+    embeds = []
+    chars = 0
+    for section in sections:
+        for description in util.str_chunks(section, EMBED_DESCRIPTION_LIMIT):
+            if not description:
+                continue
+            if len(embeds) == EMBEDS_PER_MESSAGE or chars + len(description) > EMBED_CHARS_PER_MESSAGE:
+                payloads.append(embeds)
+                embeds = []
+                chars = 0
+            embeds.append({"description": description})
+            chars += len(description)
+    if embeds:
+        payloads.append(embeds)
+    return payloads
+
 
 class DiscordException(Exception):
     pass
@@ -17,20 +87,38 @@ class Discord(object):
     ----------
     webhook_url : str
         The URL of the Discord webhook to send messages to.
+    timeout : tuple, optional
+        The (connect, read) timeouts in seconds for each request (default is (5, 15)).
+    max_retries : int, optional
+        The number of times a rate limited or failed request is retried (default is 5).
+    backoff : float, optional
+        The delay in seconds before the first retry, doubled on each following retry (default is 1).
 
     Attributes
     ----------
     webhook_url : str
         The URL of the Discord webhook to send messages to.
+    session : requests.Session
+        The pooled HTTP session used to send messages.
+    prefix : str
+        The text added before every message, which counts toward Discord's 2000 character limit.
 
     Methods
     -------
     send_message(text: str)
         Sends a message to the Discord channel.
+    send_embeds(sections: list)
+        Sends several report sections to the Discord channel in as few messages as possible.
     """
 
-    def __init__(self, webhook_url):
+    prefix = MESSAGE_PREFIX
+
+    def __init__(self, webhook_url, timeout=(5, 15), max_retries=5, backoff=1):
         self.webhook_url = webhook_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.session = get_session()
 
     def __repr__(self):
         return "Discord Webhook Url(%s)" % self.webhook_url
@@ -55,20 +143,123 @@ class Discord(object):
             If there is an error with the POST request.
         """
 
-        message = ">>> {0}".format(text)
+        message = self.prefix + text
         template = {
             "content": message  # limit 2000 chars
         }
 
-        headers = {'content-type': 'application/json'}
-
         if self.webhook_url not in (1, "1", ''):
-            r = requests.post(self.webhook_url,
-                              data=json.dumps(template), headers=headers)
+            return self.post(template)
+
+    def send_embeds(self, sections):
+        """
+        Sends several report sections to the Discord channel, packed as embeds into as few webhook calls as possible.
+
+        Parameters
+        ----------
+        sections : list of str
+            The report sections to be sent to the Discord channel.
+
+        Returns
+        -------
+        list
+            The response objects of the POST requests.
+
+        Raises
+        ------
+        DiscordException
+            If there is an error with a POST request.
+        """
+
+        if self.webhook_url in (1, "1", ''):
+            return []
+        return [self.post({"embeds": embeds}) for embeds in pack_embeds(sections)]
+
+    def post(self, template):
+        """
+        Posts a payload to the webhook, retrying rate limited, server error and connection failures with exponential
+        backoff and honoring Discord's Retry-After and X-RateLimit headers.
+
+        Parameters
+        ----------
+        template : dict
+            The JSON payload to post.
+
+        Returns
+        -------
+        r : requests.Response
+            The response object of the successful POST request.
 
-            if r.status_code != 204:
-                print(r.content)
-                logger.error(r.content)
-                raise DiscordException(r.content)
+        Raises
+        ------
+        DiscordException
+            If the webhook rejects the payload or every retry fails.
+        """
 
+        headers = {'content-type': 'application/json'}
+        data = json.dumps(template)
+        with span('webhook_post', platform='discord') as post:
+            post['bytes'] = len(data)
+            r = self._post(data, headers, post)
+            post['status'] = str(r.status_code)
             return r
+
+    def _post(self, data, headers, post):
+        delay = self.backoff
+
+        for attempt in range(self.max_retries + 1):
+            post['retries'] = attempt
+            # wait out a rate limit bucket emptied by the previous message, even one sent by an earlier job
+            with _ready_at_lock:
+                wait = _ready_at.get(self.webhook_url, 0) - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+
+            try:
+                r = self.session.post(self.webhook_url, data=data, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries:
+                    logger.error(e)
+                    raise DiscordException(str(e))
+                logger.warning("Discord request failed (%s), retrying in %.1fs" % (e, delay))
+                time.sleep(delay)
+                delay *= 2
+                continue
+
+            self._track_rate_limit(r)
+
+            if r.status_code in (200, 204):
+                return r
+
+            if (r.status_code == 429 or r.status_code >= 500) and attempt < self.max_retries:
+                retry_after = self._retry_after(r)
+                wait = retry_after if retry_after is not None else delay
+                logger.warning("Discord returned %d, retrying in %.1fs" % (r.status_code, wait))
+                time.sleep(wait)
+                delay *= 2
+                continue
+
+            print(r.content)
+            logger.error(r.content)
+            post['status'] = str(r.status_code)
+            raise DiscordException(r.content)
+
+    def _track_rate_limit(self, r):
+        # Discord reports how many requests are left in the current bucket and when it resets
+        if r.headers.get('X-RateLimit-Remaining') == '0':
+            try:
+                ready_at = time.monotonic() + float(r.headers['X-RateLimit-Reset-After'])
+            except (KeyError, ValueError):
+                return
+            with _ready_at_lock:
+                _ready_at[self.webhook_url] = ready_at
+
+    def _retry_after(self, r):
+        try:
+            return float(r.headers['Retry-After'])
+        except (KeyError, ValueError):
+            pass
+        try:
+            return float(r.json()['retry_after'])
+        except (ValueError, KeyError, TypeError):
+            return None
@@ -0,0 +1,360 @@
+import threading
+
+from gamedaybot.espn.league_cache import cached_league
+from gamedaybot.espn.week_store import is_final_week
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def week_scores(box_scores):
+    """
+    Collects every team's points for a week, including teams on a bye.
+
+    Parameters
+    ----------
+    box_scores : list
+        The week's box scores.
+
+    Returns
+    -------
+    dict
+        A dictionary mapping team ids to the points scored that week, every home team before the away teams.
+    """
+
+    scores = {}
+    for i in box_scores:
+        if i.home_team:
+            scores[i.home_team.team_id] = i.home_score
+    for i in box_scores:
+        if i.away_team:
+            scores[i.away_team.team_id] = i.away_score
+    return scores
+
+
+def bye_teams(box_scores):
+    """
+    Collects the teams on a bye in a week, which have no opponent to be compared against.
+
+    Parameters
+    ----------
+    box_scores : list
+        The week's box scores.
+
+    Returns
+    -------
+    set
+        The ids of the teams without an opponent.
+    """
+
+    sides = [(i.home_team, i.away_team) for i in box_scores] + [(i.away_team, i.home_team) for i in box_scores]
+    return {team.team_id for team, opponent in sides if team and not opponent}
+
+
+def average_ranks(values):
+    """
+    Ranks values in ascending order, giving tied values the average of the ranks they span.
+
+    Parameters
+    ----------
+    values : list of float
+        The values to rank.
+
+    Returns
+    -------
+    list of float
+        The 1-based rank of each value, in the same order as `values`.
+    """
+
+    order = sorted(range(len(values)), key=lambda k: values[k])
+    ranks = [0] * len(values)
+    start = 0
+    while start < len(order):
+        end = start
+        while end + 1 < len(order) and values[order[end + 1]] == values[order[start]]:
+            end += 1
+        for k in order[start:end + 1]:
+            ranks[k] = (start + end) / 2 + 1
+        start = end + 1
+    return ranks
+
+
+def _all_play_from_ranks(ranks, counts):
+    # a value's average rank is (lower + (equal + 1) / 2), so wins and ties fall out of the rank directly
+    n = len(ranks)
+    records = []
+    for rank, equal in zip(ranks, counts):
+        ties = equal - 1
+        wins = int(rank - (equal + 1) / 2)
+        records.append([wins, n - 1 - wins - ties, ties])
+    return records
+
+
+class ScoreMatrix(object):
+    """
+    Every team's points for a range of weeks, stored as one row per team and one column per week.
+
+    All-play records and top-half wins are derived from per-week ranks rather than pairwise comparisons.
+
+    Parameters
+    ----------
+    team_ids : list of int
+        The ids of the teams, one per row.
+    weeks : list of int
+        The weeks, one per column.
+
+    Attributes
+    ----------
+    scores : list of list
+        The points scored by each team in each week, or None if the team did not play.
+    byes : list of set
+        The ids of the teams on a bye in each week.
+    """
+
+    def __init__(self, team_ids, weeks):
+        self.team_ids = list(team_ids)
+        self.weeks = list(weeks)
+        self._rows = {team_id: row for row, team_id in enumerate(self.team_ids)}
+        self._columns = {week: column for column, week in enumerate(self.weeks)}
+        self.scores = [[None] * len(self.weeks) for _ in self.team_ids]
+        self.byes = [set() for _ in self.weeks]
+        self._orders = [[] for _ in self.weeks]
+
+    def __repr__(self):
+        return "ScoreMatrix(%d teams x %d weeks)" % (len(self.team_ids), len(self.weeks))
+
+    @classmethod
+    def from_box_scores(cls, team_ids, weeks, weekly_box_scores):
+        """
+        Builds a matrix from the box scores of each week.
+
+        Parameters
+        ----------
+        team_ids : list of int
+            The ids of the teams.
+        weeks : list of int
+            The weeks matching `weekly_box_scores`.
+        weekly_box_scores : list of list
+            The box scores of each week.
+
+        Returns
+        -------
+        ScoreMatrix
+            The filled matrix.
+        """
+
+        matrix = cls(team_ids, weeks)
+        for week, box_scores in zip(weeks, weekly_box_scores):
+            matrix.set_week(week, week_scores(box_scores), bye_teams(box_scores))
+        return matrix
+
+    def set_week(self, week, scores, byes=()):
+        """
+        Fills in one week.
+
+        Parameters
+        ----------
+        week : int
+            The week to fill in.
+        scores : dict
+            A dictionary mapping team ids to the points scored that week, in box score order.
+        byes : set, optional
+            The ids of the teams on a bye, which are left out of all-play records.
+        """
+
+        column = self._columns[week]
+        for team_id, points in scores.items():
+            if team_id in self._rows:
+                self.scores[self._rows[team_id]][column] = points
+        self.byes[column] = set(byes)
+        self._orders[column] = [team_id for team_id in scores if team_id in self._rows]
+
+    def _week_ranks(self, week):
+        # teams on a bye have no opponent, so they are not compared against the rest of the league
+        column = self._columns[week]
+        team_ids = [team_id for team_id, row in self._rows.items()
+                    if self.scores[row][column] is not None and team_id not in self.byes[column]]
+        values = [self.scores[self._rows[team_id]][column] for team_id in team_ids]
+        counts = {}
+        for value in values:
+            counts[value] = counts.get(value, 0) + 1
+        return team_ids, average_ranks(values), [counts[value] for value in values]
+
+    def all_play(self, weeks=None):
+        """
+        Returns every team's combined all-play record over the given weeks.
+
+        Parameters
+        ----------
+        weeks : list of int, optional
+            The weeks to include (default is every week in the matrix).
+
+        Returns
+        -------
+        dict
+            A dictionary mapping team ids to [wins, losses, ties] lists.
+        """
+
+        totals = {}
+        for week in (self.weeks if weeks is None else weeks):
+            team_ids, ranks, counts = self._week_ranks(week)
+            for team_id, record in zip(team_ids, _all_play_from_ranks(ranks, counts)):
+                total = totals.setdefault(team_id, [0, 0, 0])
+                for k in range(3):
+                    total[k] += record[k]
+        return totals
+
+    def top_half_wins(self, weeks=None):
+        """
+        Returns the number of weeks each team finished in the top half of the league in points.
+
+        Every team that scored counts, including teams on a bye. A tie for the last top-half spot goes to the team
+        listed first in the week's box scores, home teams before away teams.
+
+        Parameters
+        ----------
+        weeks : list of int, optional
+            The weeks to include (default is every week in the matrix).
+
+        Returns
+        -------
+        dict
+            A dictionary mapping team ids to their number of top-half finishes.
+        """
+
+        wins = {team_id: 0 for team_id in self.team_ids}
+        for week in (self.weeks if weeks is None else weeks):
+            column = self._columns[week]
+            order = sorted(self._orders[column], key=lambda team_id: self.scores[self._rows[team_id]][column],
+                           reverse=True)
+            for team_id in order[:len(order) // 2]:
+                wins[team_id] += 1
+        return wins
+
+
+def week_all_play(box_scores):
+    """
+    Determines each team's record for a week had it played every other team. Teams on a bye are left out.
+
+    Parameters
+    ----------
+    box_scores : list
+        The week's box scores.
+
+    Returns
+    -------
+    dict
+        A dictionary mapping team ids to a [wins, losses, ties] list for the week.
+    """
+
+    scores = week_scores(box_scores)
+    return ScoreMatrix.from_box_scores(list(scores), [0], [box_scores]).all_play()
+
+
+class AllPlayRecords(object):
+    """
+    Running all-play records for one league season, folded in one finished week at a time.
+
+    Parameters
+    ----------
+    league_id : int
+        The id of the fantasy football league.
+    year : int
+        The year of the league.
+
+    Attributes
+    ----------
+    totals : dict
+        A dictionary mapping each folded week to the cumulative {team_id: [wins, losses, ties]} through that week.
+    """
+
+    def __init__(self, league_id, year):
+        self.league_id = league_id
+        self.year = year
+        self.totals = {0: {}}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "AllPlayRecords(%s, %s, through week %d)" % (self.league_id, self.year, self.folded_week)
+
+    @property
+    def folded_week(self):
+        return max(self.totals)
+
+    def records(self, league, week):
+        """
+        Returns every team's cumulative all-play record through a given week.
+
+        Only weeks that have not been folded in yet are computed. Weeks that are still open to stat corrections are
+        computed on every call but never folded in.
+
+        Parameters
+        ----------
+        league : espn_api.football.League
+            The league the records belong to.
+        week : int
+            The last week to include.
+
+        Returns
+        -------
+        dict
+            A dictionary mapping team ids to [wins, losses, ties] lists.
+        """
+
+        league = cached_league(league)
+        with self._lock:
+            folded = min(self.folded_week, week)
+            running = {team_id: list(record) for team_id, record in self.totals[folded].items()}
+            new_weeks = range(folded + 1, week + 1)
+
+            for w, box_scores in zip(new_weeks, league.prefetch(new_weeks)):
+                for team_id, record in week_all_play(box_scores).items():
+                    total = running.setdefault(team_id, [0, 0, 0])
+                    for k in range(3):
+                        total[k] += record[k]
+                if w == self.folded_week + 1 and is_final_week(league, w):
+                    self.totals[w] = {team_id: list(record) for team_id, record in running.items()}
+
+        return running
+
+
+def get_all_play(league):
+    """
+    Returns the process-wide all-play engine for a league season.
+
+    Parameters
+    ----------
+    league : espn_api.football.League
+        The league for which to return the engine.
+
+    Returns
+    -------
+    AllPlayRecords
+        The league season's all-play engine.
+    """
+
+    key = (league.league_id, league.year)
+    with _engines_lock:
+        if key not in _engines:
+            _engines[key] = AllPlayRecords(league.league_id, league.year)
+        return _engines[key]
+
+
+def format_record(record):
+    """
+    Formats a [wins, losses, ties] list, leaving out ties when there are none.
+
+    Parameters
+    ----------
+    record : list
+        A [wins, losses, ties] list.
+
+    Returns
+    -------
+    str
+        The record in the format of "W-L" or "W-L-T".
+    """
+
+    if record[2] > 0:
+        return '%s-%s-%s' % (record[0], record[1], record[2])
+    return '%s-%s' % (record[0], record[1])
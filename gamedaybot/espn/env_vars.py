@@ -1,39 +1,165 @@
 import os
+import threading
+from collections.abc import Mapping
 import gamedaybot.utils.util as util
 
+_settings = None
+_settings_lock = threading.Lock()
+
+_lookups = {}
+_lookups_lock = threading.Lock()
+
+
+class TeamLookup(object):
+    """
+    A setting with one comma separated value per team, such as EMOTES or USERS, split once into a list indexed by
+    team id.
+
+    Parameters
+    ----------
+    value : str, optional
+        The setting as written in the environment, e.g. ":a:,:b:". If not provided, every team gets an empty value.
+    """
+
+    def __init__(self, value=None):
+        self.values = None if value is None else [''] + value.split(',')
+        self._blanks = {}
+
+    def __repr__(self):
+        return "TeamLookup(%s)" % (self.values if self.values is not None else 'blank')
+
+    def for_league(self, league):
+        """
+        Returns the value of every team of a league, indexed by team id.
+
+        The list is shared by every report of the league and must not be modified.
+
+        Parameters
+        ----------
+        league : espn_api.football.League
+            The league, used to size the list when the setting was not provided.
+
+        Returns
+        -------
+        list of str
+            The value of each team, with an empty value at index 0.
+        """
+
+        if self.values is not None:
+            return self.values
+        size = league.teams[-1].team_id
+        blanks = self._blanks.get(size)
+        if blanks is None:
+            blanks = [''] * (size + 1)
+            self._blanks[size] = blanks
+        return blanks
+
+
+class Settings(Mapping):
+    """
+    The settings of one league, parsed and validated once and read-only afterwards.
+
+    Settings are read either as items (`settings['league_id']`) or as attributes (`settings.league_id`), with the
+    values already converted to their types: booleans for flags, ints for counts and timeouts, strings otherwise.
+    Optional settings that were not provided (emotes, users, init_msg) are left out, so `settings.get` returns None
+    for them.
+
+    Parameters
+    ----------
+    data : dict
+        The parsed settings, as built by `get_env_vars`.
+
+    Attributes
+    ----------
+    emotes : TeamLookup
+        The emote of each team, split once.
+    users : TeamLookup
+        The user of each team, split once.
+    """
+
+    def __init__(self, data):
+        object.__setattr__(self, '_data', dict(data))
+        object.__setattr__(self, 'emotes', TeamLookup(data.get('emotes')))
+        object.__setattr__(self, 'users', TeamLookup(data.get('users')))
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getattr__(self, name):
+        # only called for names that are not attributes of the profile itself
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self._data[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Settings are read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError("Settings are read-only")
+
+    def __repr__(self):
+        return "Settings(league_id=%s, year=%s)" % (self._data.get('league_id'), self._data.get('year'))
+
+
+def get_env_vars(environ=None):
+    """
+    Reads the bot settings from environment variables, filling in defaults for anything not set.
+
+    Parameters
+    ----------
+    environ : dict, optional
+        A mapping of environment variable names to values to read instead of the process environment,
+        e.g. one league from a tenants file.
+
+    Returns
+    -------
+    Settings
+        The bot settings.
+    """
+
+    if environ is None:
+        environ = os.environ
 
-def get_env_vars():
     data = {}
     try:
-        ff_start_date = os.environ["START_DATE"]
+        ff_start_date = environ["START_DATE"]
     except KeyError:
         ff_start_date = '2024-09-05'
 
     data['ff_start_date'] = ff_start_date
 
     try:
-        ff_end_date = os.environ["END_DATE"]
+        ff_end_date = environ["END_DATE"]
     except KeyError:
         ff_end_date = '2025-01-05'
 
     data['ff_end_date'] = ff_end_date
 
     try:
-        my_timezone = os.environ["TIMEZONE"]
+        my_timezone = environ["TIMEZONE"]
     except KeyError:
         my_timezone = 'America/New_York'
 
     data['my_timezone'] = my_timezone
 
     try:
-        daily_waiver = util.str_to_bool(os.environ["DAILY_WAIVER"])
+        daily_waiver = util.str_to_bool(environ["DAILY_WAIVER"])
     except KeyError:
         daily_waiver = False
 
     data['daily_waiver'] = daily_waiver
 
     try:
-        monitor_report = util.str_to_bool(os.environ["MONITOR_REPORT"])
+        monitor_report = util.str_to_bool(environ["MONITOR_REPORT"])
     except KeyError:
         monitor_report = True
 
@@ -42,18 +168,18 @@ def get_env_vars():
     str_limit = 40000  # slack char limit
 
     try:
-        bot_id = os.environ["BOT_ID"]
+        bot_id = environ["BOT_ID"]
         str_limit = 1000
     except KeyError:
         bot_id = 1
 
     try:
-        slack_webhook_url = os.environ["SLACK_WEBHOOK_URL"]
+        slack_webhook_url = environ["SLACK_WEBHOOK_URL"]
     except KeyError:
         slack_webhook_url = 1
 
     try:
-        discord_webhook_url = os.environ["DISCORD_WEBHOOK_URL"]
+        discord_webhook_url = environ["DISCORD_WEBHOOK_URL"]
         str_limit = 2000
     except KeyError:
         discord_webhook_url = 1
@@ -70,17 +196,17 @@ def get_env_vars():
     data['slack_webhook_url'] = slack_webhook_url
     data['discord_webhook_url'] = discord_webhook_url
 
-    data['league_id'] = os.environ["LEAGUE_ID"]
+    data['league_id'] = environ["LEAGUE_ID"]
 
     try:
-        year = int(os.environ["LEAGUE_YEAR"])
+        year = int(environ["LEAGUE_YEAR"])
     except KeyError:
         year = 2024
 
     data['year'] = year
 
     try:
-        swid = os.environ["SWID"]
+        swid = environ["SWID"]
     except KeyError:
         swid = '{1}'
 
@@ -92,83 +218,245 @@ def get_env_vars():
     data['swid'] = swid
 
     try:
-        espn_s2 = os.environ["ESPN_S2"]
+        espn_s2 = environ["ESPN_S2"]
     except KeyError:
         espn_s2 = '1'
 
     data['espn_s2'] = espn_s2
 
     try:
-        test = util.str_to_bool(os.environ["TEST"])
+        test = util.str_to_bool(environ["TEST"])
     except KeyError:
         test = False
 
     data['test'] = test
 
     try:
-        top_half_scoring = util.str_to_bool(os.environ["TOP_HALF_SCORING"])
+        top_half_scoring = util.str_to_bool(environ["TOP_HALF_SCORING"])
     except KeyError:
         top_half_scoring = False
 
     data['top_half_scoring'] = top_half_scoring
 
-    data['random_phrase'] = get_random_phrase()
+    data['random_phrase'] = get_random_phrase(environ)
 
     try:
-        waiver_report = util.str_to_bool(os.environ["WAIVER_REPORT"])
+        waiver_report = util.str_to_bool(environ["WAIVER_REPORT"])
     except KeyError:
         waiver_report = False
 
     data['waiver_report'] = waiver_report
 
     try:
-        extra_trophies = util.str_to_bool(os.environ["EXTRA_TROPHIES"])
+        extra_trophies = util.str_to_bool(environ["EXTRA_TROPHIES"])
     except KeyError:
         extra_trophies = False
 
     data['extra_trophies'] = extra_trophies
 
     try:
-        score_warn = int(os.environ["SCORE_WARNING"])
+        score_warn = int(environ["SCORE_WARNING"])
     except KeyError:
         score_warn = 0
 
     data['score_warn'] = score_warn
 
     try:
-        data['init_msg'] = os.environ["INIT_MSG"]
+        league_ttl = int(environ["LEAGUE_TTL"])
+    except KeyError:
+        league_ttl = 300
+
+    data['league_ttl'] = league_ttl
+
+    try:
+        max_fetch_workers = int(environ["MAX_FETCH_WORKERS"])
+    except KeyError:
+        max_fetch_workers = 4
+
+    data['max_fetch_workers'] = max_fetch_workers
+
+    try:
+        data_dir = environ["DATA_DIR"]
+    except KeyError:
+        data_dir = ''
+
+    data['data_dir'] = data_dir
+
+    try:
+        http_cache = util.str_to_bool(environ["HTTP_CACHE"])
+    except KeyError:
+        http_cache = False
+
+    data['http_cache'] = http_cache
+
+    try:
+        http_cache_ttl = int(environ["HTTP_CACHE_TTL"])
+    except KeyError:
+        http_cache_ttl = 60
+
+    data['http_cache_ttl'] = http_cache_ttl
+
+    try:
+        live_scores = util.str_to_bool(environ["LIVE_SCORES"])
+    except KeyError:
+        live_scores = False
+
+    data['live_scores'] = live_scores
+
+    try:
+        live_interval = int(environ["LIVE_INTERVAL"])
+    except KeyError:
+        live_interval = 60
+
+    data['live_interval'] = live_interval
+
+    try:
+        data['emotes'] = environ["EMOTES"]
+    except KeyError:
+        pass
+
+    try:
+        data['users'] = environ["USERS"]
+    except KeyError:
+        pass
+
+    try:
+        data['init_msg'] = environ["INIT_MSG"]
     except KeyError:
         # do nothing here, empty init message
         pass
 
-    return data
+    return Settings(data)
 
 
-def get_random_phrase():
-    random_phrase = False
+def get_settings():
+    """
+    Returns the process-wide settings read from the environment, parsing and validating them on first use.
+
+    Returns
+    -------
+    Settings
+        The settings of the league configured in the environment.
+    """
+
+    global _settings
+    with _settings_lock:
+        if _settings is None:
+            _settings = get_env_vars()
+        return _settings
+
+
+def get_scheduler_vars(environ=None):
+    """
+    Reads the process-wide scheduler settings from environment variables, filling in defaults for anything not set.
+
+    Parameters
+    ----------
+    environ : dict, optional
+        A mapping of environment variable names to values to read instead of the process environment.
+
+    Returns
+    -------
+    dict
+        The scheduler settings.
+    """
+
+    if environ is None:
+        environ = os.environ
+
+    data = {}
     try:
-        random_phrase = util.str_to_bool(os.environ["RANDOM_PHRASE"])
+        job_workers = int(environ["JOB_WORKERS"])
     except KeyError:
-        random_phrase = False
+        job_workers = 10
 
-    return random_phrase
+    data['job_workers'] = job_workers
 
+    try:
+        max_concurrent_jobs = int(environ["MAX_CONCURRENT_JOBS"])
+    except KeyError:
+        max_concurrent_jobs = 4
+
+    data['max_concurrent_jobs'] = max_concurrent_jobs
 
-def split_emotes(league):
-    emotes = ['']
     try:
-        emotes += os.environ["EMOTES"].split(',')
+        max_league_jobs = int(environ["MAX_LEAGUE_JOBS"])
     except KeyError:
-        emotes += [''] * league.teams[-1].team_id
+        max_league_jobs = 2
+
+    data['max_league_jobs'] = max_league_jobs
 
-    return emotes
+    try:
+        metrics_port = int(environ["METRICS_PORT"])
+    except KeyError:
+        metrics_port = 0
 
+    data['metrics_port'] = metrics_port
 
-def split_users(league):
-    users = ['']
     try:
-        users += os.environ["USERS"].split(',')
+        metrics_log = util.str_to_bool(environ["METRICS_LOG"])
     except KeyError:
-        users += [''] * league.teams[-1].team_id
+        metrics_log = False
 
-    return users
+    data['metrics_log'] = metrics_log
+
+    return data
+
+
+def get_random_phrase(environ=None):
+    if environ is None:
+        environ = os.environ
+
+    random_phrase = False
+    try:
+        random_phrase = util.str_to_bool(environ["RANDOM_PHRASE"])
+    except KeyError:
+        random_phrase = False
+
+    return random_phrase
+
+
+def use_random_phrase(league):
+    """
+    Check whether reports for a league end with a random phrase.
+
+    The setting is read when a report is generated, so importing the report modules does no environment work.
+
+    Parameters
+    ----------
+    league : espn_api.football.League or LeagueCache
+        The league the report is for. A league with settings attached uses its own setting.
+
+    Returns
+    -------
+    bool
+        True if a random phrase should be added, False otherwise.
+    """
+
+    tenant = getattr(league, 'tenant', None)
+    if tenant is not None:
+        return bool(tenant.get('random_phrase', False))
+    return get_random_phrase()
+
+
+def _team_lookup(league, key, env_name):
+    # a league run by the bot carries its settings with the lookups already split, otherwise fall back to the
+    # environment and split each distinct value once
+    tenant = getattr(league, 'tenant', None)
+    if isinstance(tenant, Settings):
+        return getattr(tenant, key)
+    value = tenant.get(key) if tenant is not None else os.environ.get(env_name)
+    with _lookups_lock:
+        lookup = _lookups.get(value)
+        if lookup is None:
+            lookup = TeamLookup(value)
+            _lookups[value] = lookup
+        return lookup
+
+
+def split_emotes(league):
+    return _team_lookup(league, 'emotes', "EMOTES").for_league(league)
+
+
+def split_users(league):
+    return _team_lookup(league, 'users', "USERS").for_league(league)
@@ -3,12 +3,9 @@ import os
 import sys
 sys.path.insert(1, os.path.abspath('.'))
 import gamedaybot.utils.util as util
-from gamedaybot.chat.discord import Discord
-from gamedaybot.espn.env_vars import get_env_vars
-import gamedaybot.espn.functionality as espn
-import gamedaybot.espn.season_recap as recap
+from gamedaybot.utils.metrics import span
+from gamedaybot.espn.env_vars import get_settings
 
-from espn_api.football import League
 import json
 import logging
 
@@ -17,15 +14,22 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
 
-def espn_bot(function):
+def espn_bot(function, tenant=None, batch=None):
     """
     This function is used to send messages to a messaging platform (e.g. Slack, Discord, or GroupMe) with information
     about a fantasy football league.
 
     Parameters
     ----------
-    function: str
-        A string that specifies which type of information to send (e.g. "get_matchups", "get_power_rankings").
+    function: str or list of str
+        A string that specifies which type of information to send (e.g. "get_matchups", "get_power_rankings"),
+        or a list of them to generate together and send as one batch.
+    tenant: Settings, optional
+        The settings of one league from a tenants file. If not provided, the process-wide settings read from the
+        environment are used.
+    batch: int, optional
+        The batch of jobs this run was triggered with. Runs of the same league and batch share one box score cache, so
+        weeks are fetched from ESPN once for all of them. If not provided, the run uses its own cache.
 
     Returns
     -------
@@ -45,6 +49,18 @@ def espn_bot(function):
         If not provided, defaults to '{1}'.
     espn_s2: the espn s2 of the league.
         If not provided, defaults to '1'.
+    max_fetch_workers: the maximum number of weeks of box scores fetched from ESPN at the same time.
+        If not provided, defaults to 4.
+    data_dir: the directory in which completed weeks of box scores are kept between runs.
+        If not provided, completed weeks are always downloaded from ESPN.
+    league_ttl: the number of seconds the shared league is reused before it is refreshed from ESPN.
+        If not provided, defaults to 300.
+    http_cache: a boolean that indicates whether ESPN responses are cached and revalidated instead of downloaded again.
+        If not provided, defaults to False.
+    http_cache_ttl: the number of seconds a cached ESPN response is used without asking ESPN whether it changed.
+        If not provided, defaults to 60.
+    live_interval: the number of seconds between score checks while games are being played.
+        If not provided, defaults to 60.
     top_half_scoring: a boolean that indicates whether to include only the top half of the league in the standings.
         If not provided, defaults to False.
     random_phrase: a boolean that indicates whether to include a random phrase in the message.
@@ -60,6 +76,8 @@ def espn_bot(function):
     get_scoreboard_short: sends a short version of the current week's scores.
     get_projected_scoreboard: sends the projected scores for the remaining games.
     get_close_scores: sends a message with the scores of games that have a difference of less than 7 points.
+    live_scores: watches the scores until the current games are over and sends lead changes, newly close games and
+        final scores as they happen.
     get_power_rankings: sends a message with the power rankings for the league.
     get_trophies: sends a message with the trophies for the league.
     get_standings: sends a message with the standings for the league.
@@ -67,141 +85,181 @@ def espn_bot(function):
     get_waiver_report: sends a message with the waiver report for the league.
     init: sends a message to confirm that the bot has been set up.
     """
-    
-    data = get_env_vars()
-    str_limit = data['str_limit']
 
-    try:
-        discord_webhook_url = data['discord_webhook_url']
-    except KeyError:
-        discord_webhook_url = 1
+    # espn_api, requests and the report modules are loaded on the first run rather than when this module is
+    # imported, so a process that runs one job only loads what that job uses
+    from gamedaybot.chat.delivery import get_queue
+    from gamedaybot.chat.discord import Discord
+    import gamedaybot.espn.functionality as espn
+    from gamedaybot.espn.http_cache import get_http_cache
+    from gamedaybot.espn.league_cache import LeagueCache, shared_cache
+    from gamedaybot.espn.league_session import get_league
+    from gamedaybot.espn.week_store import WeekStore
+
+    # the settings are parsed, defaulted and validated once per process (or per tenant), not on every job
+    data = get_settings() if tenant is None else tenant
+    str_limit = data.str_limit
+    discord_webhook_url = data.discord_webhook_url
 
     if (len(str(discord_webhook_url)) <= 1):
         # Ensure that there's info for at least one messaging platform,
         # use length of str in case of blank but non null env variable
         raise Exception("No messaging platform info provided. Be sure DISCORD_WEBHOOK_URL env variable is set")
-    
-    league_id = data['league_id']
-
-    try:
-        year = int(data['year'])
-    except KeyError:
-        year = 2024
-
-    try:
-        swid = data['swid']
-    except KeyError:
-        swid = '{1}'
-
-    if swid.find("{", 0) == -1:
-        swid = "{" + swid
-    if swid.find("}", -1) == -1:
-        swid = swid + "}"
-
-    try:
-        espn_s2 = data['espn_s2']
-    except KeyError:
-        espn_s2 = '1'
-
-    try:
-        top_half_scoring = data['top_half_scoring']
-    except KeyError:
-        top_half_scoring = False
-
-    try:
-        warning = int(data['score_warn'])
-    except KeyError:
-        warning = 0
-
-    try:
-        extra_trophies = data['extra_trophies']
-    except KeyError:
-        extra_trophies = False
-
-    try:
-        test = data['test']
-    except KeyError:
-        test = False
+
+    league_id = data.league_id
+    swid = data.swid
+    espn_s2 = data.espn_s2
+    top_half_scoring = data.top_half_scoring
+    warning = data.score_warn
+    extra_trophies = data.extra_trophies
+    test = data.test
+    data_dir = data.data_dir
+    live_interval = data.live_interval
 
     discord_bot = Discord(discord_webhook_url)
 
+    # responses are kept next to the stored weeks when a data directory is configured
+    http_cache = None
+    if data.http_cache:
+        http_cache = get_http_cache(data.http_cache_ttl, os.path.join(data_dir, 'http') if data_dir else None)
+
+    # the league is built once per process and shared by every scheduled job
     if swid == '{1}' or espn_s2 == '1':
-        league = League(league_id=league_id, year=year)
+        league = get_league(league_id, data.year, ttl=data.league_ttl, http_cache=http_cache)
     else:
-        league = League(league_id=league_id, year=year, espn_s2=espn_s2, swid=swid)
-
-    try:
-        broadcast_message = data['broadcast_message']
-    except KeyError:
-        broadcast_message = None
-
-    # always let init and broadcast run
-    if function not in ["init", "broadcast", "win_matrix", "season_trophies"] and league.scoringPeriodId > len(league.settings.matchup_periods):
-        logger.info("Not in active season")
-        return
-
-    text = ''
-    logger.info("Function: " + function)
-
-    if function == "get_matchups":
-        text = espn.get_matchups(league)
-        # text = text + "\n\n" + espn.get_projected_scoreboard(league)
-    elif function == "get_monitor":
-        text = espn.get_monitor(league, warning)
-    elif function == "get_inactives":
-        text = espn.get_inactives(league)
-    elif function == "get_scoreboard_short":
-        text = espn.get_scoreboard_short(league)
-        text = text + "\n\n" + espn.get_projected_scoreboard(league)
-    elif function == "get_projected_scoreboard":
-        text = espn.get_projected_scoreboard(league)
-    elif function == "get_close_scores":
-        text = espn.get_close_scores(league)
-    elif function == "get_power_rankings":
-        text = espn.combined_power_rankings(league)
-    elif function == "get_trophies":
-        text = espn.get_trophies(league)
-    elif function == "win_matrix":
-        text = recap.win_matrix(league)
-    elif function == "season_trophies":
-        text = recap.season_trophies(league, extra_trophies)  
-    elif function == "get_standings":
-        text = espn.get_standings(league, top_half_scoring)
-    elif function == "get_optimal_scores":
-        text = espn.optimal_team_scores(league)
-    elif function == "get_final":
-        # on Tuesday we need to get the scores of last week
-        week = league.current_week - 1
-        text = espn.get_scoreboard_short(league, week=week)
-        text = text + "\n\n" + espn.get_trophies(league, extra_trophies, week=week)
-    elif function == "get_waiver_report" and swid != '{1}' and espn_s2 != '1':
-        faab = league.settings.faab
-        text = espn.get_waiver_report(league, faab)
-    elif function == "broadcast":
-        try:
-            text = broadcast_message
-        except KeyError:
-            # do nothing here, empty broadcast message
-            pass
-    elif function == "init":
-        try:
-            text = data["init_msg"]
-        except KeyError:
-            # do nothing here, empty init message
-            pass
+        league = get_league(league_id, data.year, espn_s2=espn_s2, swid=swid, ttl=data.league_ttl,
+                            http_cache=http_cache)
+
+    # completed weeks are read from disk instead of ESPN when a data directory is configured
+    store = WeekStore(data_dir) if data_dir else None
+
+    # share box scores between every report generated by this job, and with the jobs triggered alongside it. The
+    # settings go with the league so that every report reads the same emote and user lookups
+    if batch is None:
+        league = LeagueCache(league, max_workers=data.max_fetch_workers, store=store, tenant=data)
     else:
-        text = "Something bad happened. HALP"
+        league = shared_cache(league, batch, max_workers=data.max_fetch_workers, store=store, tenant=data)
+
+    def send(bot, text):
+        if test:
+            logger.debug(text)
+            return
+        delivery = get_queue()
+        with span('chunk') as chunking:
+            chunking['chars'] = len(text)
+            chunking['messages'] = 0
+            # leave room for the prefix the bot adds to every message, so no chunk goes over the platform's limit
+            for message in util.str_chunks(text, str_limit - len(getattr(bot, 'prefix', ''))):
+                delivery.submit(bot, message)
+                chunking['messages'] += 1
+
+    broadcast_message = data.get('broadcast_message')
+
+    functions = [function] if isinstance(function, str) else list(function)
+    in_season = league.scoringPeriodId <= len(league.settings.matchup_periods)
+    texts = []
+
+    for function in functions:
+        # always let init and broadcast run
+        if function not in ["init", "broadcast", "win_matrix", "season_trophies"] and not in_season:
+            logger.info("Not in active season")
+            continue
+
+        text = ''
+        logger.info("Function: " + function)
+        if function == "live_scores":
+            from gamedaybot.espn.live_scores import watch_live_scores
+            # updates are sent as they happen, there is nothing left to send once the games are over. The watcher
+            # lasts for hours, so it is timed on its own rather than as a report render
+            with span('live_scores', league=league_id):
+                watch_live_scores(league, lambda update: send(discord_bot, update), live_interval=live_interval)
+            continue
+
+        http_before = http_cache.snapshot() if http_cache else None
+        with span('render', report=function, league=league_id) as rendering:
+            if function == "get_matchups":
+                text = espn.get_matchups(league)
+                # text = text + "\n\n" + espn.get_projected_scoreboard(league)
+            elif function == "get_monitor":
+                text = espn.get_monitor(league, warning)
+            elif function == "get_inactives":
+                text = espn.get_inactives(league)
+            elif function == "get_scoreboard_short":
+                text = espn.get_scoreboard_short(league)
+                text = text + "\n\n" + espn.get_projected_scoreboard(league)
+            elif function == "get_projected_scoreboard":
+                text = espn.get_projected_scoreboard(league)
+            elif function == "get_close_scores":
+                text = espn.get_close_scores(league)
+            elif function == "get_power_rankings":
+                text = espn.combined_power_rankings(league)
+            elif function == "get_trophies":
+                text = espn.get_trophies(league)
+            elif function == "win_matrix":
+                import gamedaybot.espn.season_recap as recap
+                text = recap.win_matrix(league)
+            elif function == "season_trophies":
+                import gamedaybot.espn.season_recap as recap
+                text = recap.season_trophies(league, extra_trophies)  
+            elif function == "get_standings":
+                text = espn.get_standings(league, top_half_scoring)
+            elif function == "get_optimal_scores":
+                text = espn.optimal_team_scores(league)
+            elif function == "get_final":
+                # on Tuesday we need to get the scores of last week
+                week = league.current_week - 1
+                text = espn.get_scoreboard_short(league, week=week)
+                text = text + "\n\n" + espn.get_trophies(league, extra_trophies, week=week)
+            elif function == "get_waiver_report" and swid != '{1}' and espn_s2 != '1':
+                faab = league.settings.faab
+                text = espn.get_waiver_report(league, faab)
+            elif function == "broadcast":
+                try:
+                    text = broadcast_message
+                except KeyError:
+                    # do nothing here, empty broadcast message
+                    pass
+            elif function == "init":
+                try:
+                    text = data["init_msg"]
+                except KeyError:
+                    # do nothing here, empty init message
+                    pass
+            else:
+                text = "Something bad happened. HALP"
+            rendering['chars'] = len(text or '')
+
+        if http_cache:
+            logger.info("ESPN response cache for %s: %s" % (function, http_cache.record(function, http_before)))
+
+        if text:
+            texts.append(text)
 
     logger.debug(data)
-    if text != '' and not test:
-        logger.debug(text)
-        messages = util.str_limit_check(text, str_limit)
-        for message in messages:
-            discord_bot.send_message(message)  
+    logger.debug("Box score cache: %s" % league.cache_info())
+    if texts and not test:
+        logger.debug(texts)
+        delivery = get_queue()
+        if len(texts) > 1:
+            # reports that run together go out as one batch of embeds instead of one webhook call each
+            delivery.submit_embeds(discord_bot, texts)
+        else:
+            # hand each chunk to the delivery queue as it is split off, so a slow webhook doesn't hold up the next job
+            send(discord_bot, texts[0])
+        logger.debug("Delivery queue depth: %d, latency: %s" % (delivery.depth(), delivery.latency()))
 
 
 if __name__ == '__main__':
     from gamedaybot.espn.scheduler import scheduler
 
-    espn_bot("init")
-    scheduler()
+    tenants_file = os.environ.get("TENANTS_FILE")
+    if tenants_file:
+        from gamedaybot.espn.tenants import load_tenants
+
+        tenants = load_tenants(tenants_file)
+        for tenant in tenants:
+            espn_bot("init", tenant)
+        scheduler(tenants)
+    else:
+        espn_bot("init")
+        scheduler()
@@ -0,0 +1,357 @@
+import argparse
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from espn_api.football import League
+
+import gamedaybot.espn.functionality as espn
+from gamedaybot.espn.all_play import week_all_play
+from gamedaybot.espn.trophies import TrophyEngine, weekly_trophies
+from gamedaybot.espn.week_store import WeekStore
+
+logger = logging.getLogger(__name__)
+
+# the columns of each kind of record, with the Parquet type of each
+FIELDS = {
+    'team_week': [('league_id', 'int64'), ('year', 'int64'), ('week', 'int64'), ('team_id', 'int64'),
+                  ('team_name', 'string'), ('opponent_id', 'int64'), ('matchup_type', 'string'),
+                  ('score', 'float64'), ('projected', 'float64'), ('opponent_score', 'float64'),
+                  ('result', 'string'), ('optimal_score', 'float64'), ('bench_points', 'float64'),
+                  ('optimal_pct', 'float64'), ('all_play_wins', 'int64'), ('all_play_losses', 'int64'),
+                  ('all_play_ties', 'int64')],
+    'lineup': [('league_id', 'int64'), ('year', 'int64'), ('week', 'int64'), ('team_id', 'int64'),
+               ('player_id', 'int64'), ('name', 'string'), ('position', 'string'), ('slot', 'string'),
+               ('pro_team', 'string'), ('points', 'float64'), ('projected', 'float64')],
+    'trophies': [('league_id', 'int64'), ('year', 'int64'), ('week', 'int64'), ('lines', 'list<string>')],
+}
+
+
+def _result(score, opponent_score):
+    if score > opponent_score:
+        return 'W'
+    if score < opponent_score:
+        return 'L'
+    return 'T'
+
+
+def week_records(league, week, box_scores, starter_counts):
+    """
+    Yields the records of one week: every lineup entry, every team's result with its optimal score and all-play
+    record, and the week's trophies.
+
+    Parameters
+    ----------
+    league : espn_api.football.League
+        The league the week belongs to.
+    week : int
+        The week of the box scores.
+    box_scores : list
+        The week's box scores.
+    starter_counts : dict
+        The number of starters for each lineup slot, as returned by `get_starter_counts`.
+
+    Yields
+    ------
+    dict
+        One record, with its kind under "record" and the columns listed in FIELDS.
+    """
+
+    base = {'league_id': league.league_id, 'year': league.year, 'week': week}
+
+    teams = []
+    for i in box_scores:
+        matchup_type = getattr(i, 'matchup_type', 'NONE')
+        if i.home_team:
+            teams.append((i.home_team, i.home_score, i.home_projected, i.home_lineup, i.away_team, i.away_score,
+                          matchup_type))
+        if i.away_team:
+            teams.append((i.away_team, i.away_score, i.away_projected, i.away_lineup, i.home_team, i.home_score,
+                          matchup_type))
+
+    optimal = espn.optimal_lineup_scores([team[3] for team in teams], starter_counts)
+    all_play = week_all_play(box_scores)
+
+    for (team, score, projected, lineup, opponent, opponent_score, matchup_type), result in zip(teams, optimal):
+        for p in lineup:
+            yield dict(base, record='lineup', team_id=team.team_id, player_id=getattr(p, 'playerId', None),
+                       name=p.name, position=p.position, slot=p.slot_position, pro_team=getattr(p, 'proTeam', None),
+                       points=p.points, projected=p.projected_points)
+
+        record = all_play.get(team.team_id, [0, 0, 0])
+        yield dict(base, record='team_week', team_id=team.team_id, team_name=team.team_name,
+                   opponent_id=getattr(opponent, 'team_id', None), matchup_type=matchup_type, score=score,
+                   projected=projected, opponent_score=opponent_score if opponent else None,
+                   result=_result(score, opponent_score) if opponent else None, optimal_score=result[0],
+                   bench_points=result[2], optimal_pct=result[3], all_play_wins=record[0],
+                   all_play_losses=record[1], all_play_ties=record[2])
+
+    if teams:
+        emotes = [''] * (max(team[0].team_id for team in teams) + 1)
+        engine = TrophyEngine(weekly_trophies(True)).run(box_scores)
+        yield dict(base, record='trophies', lines=engine.lines(emotes))
+
+
+def season_weeks(league, weeks, store=None):
+    """
+    Yields each week's box scores in order, fetching the next week while the current one is being processed.
+
+    At most two weeks are held at a time, whatever the length of the season.
+
+    Parameters
+    ----------
+    league : espn_api.football.League
+        The league to fetch from.
+    weeks : list of int
+        The weeks to fetch.
+    store : WeekStore, optional
+        A persistent store that completed weeks are read from before asking ESPN, and written to after.
+
+    Yields
+    ------
+    tuple
+        The week and its box scores.
+    """
+
+    def fetch(week):
+        box_scores = store.load(league, week) if store else None
+        if box_scores is None:
+            box_scores = league.box_scores(week=week)
+            if store:
+                store.save(league, week, box_scores)
+        return box_scores
+
+    weeks = list(weeks)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pending = executor.submit(fetch, weeks[0]) if weeks else None
+        for k, week in enumerate(weeks):
+            box_scores = pending.result()
+            pending = executor.submit(fetch, weeks[k + 1]) if k + 1 < len(weeks) else None
+            yield week, box_scores
+
+
+def season_records(league, weeks=None, store=None):
+    """
+    Yields every record of a league season, week by week, as the weeks are fetched.
+
+    Parameters
+    ----------
+    league : espn_api.football.League
+        The league to export.
+    weeks : list of int, optional
+        The weeks to export (default is every finished week).
+    store : WeekStore, optional
+        A persistent store that completed weeks are read from before asking ESPN, and written to after.
+
+    Yields
+    ------
+    dict
+        One record, as yielded by `week_records`.
+    """
+
+    if weeks is None:
+        weeks = range(1, league.current_week)
+    starter_counts = espn.get_starter_counts(league)
+    for week, box_scores in season_weeks(league, weeks, store):
+        yield from week_records(league, week, box_scores, starter_counts)
+
+
+def write_ndjson(records, stream):
+    """
+    Writes records as newline-delimited JSON, one record per line, as they are produced.
+
+    Parameters
+    ----------
+    records : iterable of dict
+        The records to write.
+    stream : file
+        The text stream to write to.
+
+    Returns
+    -------
+    int
+        The number of records written.
+    """
+
+    count = 0
+    for record in records:
+        stream.write(json.dumps(record, separators=(',', ':'), default=str) + '\n')
+        count += 1
+    return count
+
+
+class ParquetSink(object):
+    """
+    Writes records to one Parquet file per kind of record, a row group at a time.
+
+    Only one row group per kind is held in memory. pyarrow is imported when the sink is created, so it is only
+    needed for Parquet exports.
+
+    Parameters
+    ----------
+    path : str
+        The directory the files are written to, e.g. lineup.parquet.
+    row_group_size : int, optional
+        The number of rows written per row group (default is 10000).
+
+    Raises
+    ------
+    ImportError
+        If pyarrow is not installed.
+    """
+
+    def __init__(self, path, row_group_size=10000):
+        import pyarrow
+        import pyarrow.parquet
+
+        self.pa = pyarrow
+        self.pq = pyarrow.parquet
+        self.path = path
+        self.row_group_size = row_group_size
+        self.rows = 0
+        self._buffers = {}
+        self._writers = {}
+
+    def __repr__(self):
+        return "ParquetSink(%s, rows=%d)" % (self.path, self.rows)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _schema(self, kind):
+        types = {'int64': self.pa.int64(), 'float64': self.pa.float64(), 'string': self.pa.string(),
+                 'list<string>': self.pa.list_(self.pa.string())}
+        return self.pa.schema([(name, types[type_name]) for name, type_name in FIELDS[kind]])
+
+    def _flush(self, kind):
+        rows = self._buffers.pop(kind, None)
+        if not rows:
+            return
+        writer = self._writers.get(kind)
+        if writer is None:
+            os.makedirs(self.path, exist_ok=True)
+            writer = self.pq.ParquetWriter(os.path.join(self.path, kind + '.parquet'), self._schema(kind))
+            self._writers[kind] = writer
+        writer.write_table(self.pa.Table.from_pylist(rows, schema=writer.schema))
+
+    def write(self, record):
+        """
+        Adds a record, writing its kind's row group once it is full.
+
+        Parameters
+        ----------
+        record : dict
+            The record, with its kind under "record".
+        """
+
+        kind = record['record']
+        rows = self._buffers.setdefault(kind, [])
+        rows.append({name: record.get(name) for name, _ in FIELDS[kind]})
+        self.rows += 1
+        if len(rows) >= self.row_group_size:
+            self._flush(kind)
+
+    def close(self):
+        """Writes the remaining rows and closes every file."""
+
+        for kind in list(self._buffers):
+            self._flush(kind)
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
+
+
+def write_parquet(records, path, row_group_size=10000):
+    """
+    Writes records to one Parquet file per kind of record, as they are produced.
+
+    Parameters
+    ----------
+    records : iterable of dict
+        The records to write.
+    path : str
+        The directory the files are written to.
+    row_group_size : int, optional
+        The number of rows written per row group (default is 10000).
+
+    Returns
+    -------
+    int
+        The number of records written.
+    """
+
+    with ParquetSink(path, row_group_size) as sink:
+        for record in records:
+            sink.write(record)
+    return sink.rows
+
+
+def _leagues(data, years):
+    # each season gets its own League rather than a shared session, so it is released once it has been exported
+    for year in years or [int(data['year'])]:
+        if data['swid'] == '{1}' or data['espn_s2'] == '1':
+            yield League(league_id=data['league_id'], year=year)
+        else:
+            yield League(league_id=data['league_id'], year=year, espn_s2=data['espn_s2'], swid=data['swid'])
+
+
+def export(tenants, years=None):
+    """
+    Yields every record of every league and year, one league season at a time.
+
+    Parameters
+    ----------
+    tenants : list of dict
+        The settings of each league, as returned by `get_env_vars` or `load_tenants`.
+    years : list of int, optional
+        The seasons to export (default is each league's configured year).
+
+    Yields
+    ------
+    dict
+        One record, as yielded by `week_records`.
+    """
+
+    for data in tenants:
+        store = WeekStore(data['data_dir']) if data.get('data_dir') else None
+        for league in _leagues(data, years):
+            logger.info("Exporting league %s, %s" % (league.league_id, league.year))
+            yield from season_records(league, store=store)
+
+
+if __name__ == '__main__':
+    # python -m gamedaybot.espn.export [--format parquet --output DIR] [--years 2023,2024], with the leagues set up
+    # as for the bot
+    parser = argparse.ArgumentParser(description="Export league seasons as NDJSON or Parquet")
+    parser.add_argument('--format', choices=['ndjson', 'parquet'], default='ndjson')
+    parser.add_argument('--output', help="The NDJSON file or Parquet directory to write (default is stdout for NDJSON)")
+    parser.add_argument('--years', help="Comma separated seasons to export (default is each league's year)")
+    parser.add_argument('--row-group-size', type=int, default=10000)
+    args = parser.parse_args()
+
+    tenants_file = os.environ.get("TENANTS_FILE")
+    if tenants_file:
+        from gamedaybot.espn.tenants import load_tenants
+        tenants = load_tenants(tenants_file)
+    else:
+        from gamedaybot.espn.env_vars import get_env_vars
+        tenants = [get_env_vars()]
+
+    years = [int(year) for year in args.years.split(',')] if args.years else None
+    records = export(tenants, years)
+
+    if args.format == 'parquet':
+        if not args.output:
+            parser.error("--output is required for Parquet exports")
+        count = write_parquet(records, args.output, args.row_group_size)
+    elif args.output:
+        with open(args.output, 'w') as f:
+            count = write_ndjson(records, f)
+    else:
+        count = write_ndjson(records, sys.stdout)
+    logger.info("Exported %d records" % count)
@@ -0,0 +1,281 @@
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import espn_api.football.box_player as box_player
+import requests
+from espn_api.football import League
+
+import gamedaybot.espn.functionality as espn
+import gamedaybot.espn.season_recap as recap
+from gamedaybot.espn.http_cache import (CachedResponse, request_key, use_http_cache, )
+from gamedaybot.espn.league_cache import LeagueCache
+
+logger = logging.getLogger(__name__)
+
+# every report that only depends on the recorded league, with the arguments the bot sends it with
+REPORTS = [
+    ('get_matchups', lambda league: espn.get_matchups(league)),
+    ('get_scoreboard_short', lambda league: espn.get_scoreboard_short(league)),
+    ('get_projected_scoreboard', lambda league: espn.get_projected_scoreboard(league)),
+    ('get_close_scores', lambda league: espn.get_close_scores(league)),
+    ('get_standings', lambda league: espn.get_standings(league)),
+    ('get_standings_top_half', lambda league: espn.get_standings(league, True)),
+    ('get_optimal_scores', lambda league: espn.optimal_team_scores(league)),
+    ('get_power_rankings', lambda league: espn.combined_power_rankings(league)),
+    ('get_monitor', lambda league: espn.get_monitor(league, 0)),
+    ('get_inactives', lambda league: espn.get_inactives(league)),
+    ('get_trophies', lambda league: espn.get_trophies(league, True)),
+    ('get_final', lambda league: espn.get_trophies(league, True, week=league.current_week - 1)),
+    ('win_matrix', lambda league: recap.win_matrix(league)),
+    ('season_trophies', lambda league: recap.season_trophies(league, True)),
+]
+
+
+class FixtureMissing(Exception):
+    pass
+
+
+@contextmanager
+def frozen_clock(timestamp):
+    """
+    Makes espn_api read the current time as a fixed timestamp while the block runs.
+
+    espn_api decides whether each player's game has been played by comparing its kickoff to the current time, so a
+    recording only renders the same on replay when both see the same clock.
+
+    Parameters
+    ----------
+    timestamp : float
+        The time espn_api sees, as a Unix timestamp.
+    """
+
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.fromtimestamp(timestamp, tz)
+
+    previous = box_player.datetime
+    box_player.datetime = FrozenDatetime
+    try:
+        yield
+    finally:
+        box_player.datetime = previous
+
+
+class FixtureRecorder(object):
+    """
+    A request backend that sends requests to ESPN and saves each response as a fixture file.
+
+    Parameters
+    ----------
+    path : str
+        The directory the fixture files are written to.
+    session : requests.Session, optional
+        The session used to reach ESPN (default is a new session).
+    """
+
+    def __init__(self, path, session=None):
+        self.path = path
+        self.session = session or requests.Session()
+        self.recorded = 0
+
+    def __repr__(self):
+        return "FixtureRecorder(%s, recorded=%d)" % (self.path, self.recorded)
+
+    def get(self, url, params=None, headers=None, cookies=None):
+        r = self.session.get(url, params=params, headers=headers, cookies=cookies)
+        os.makedirs(os.path.join(self.path, 'responses'), exist_ok=True)
+        with open(os.path.join(self.path, 'responses', request_key(url, params, headers) + '.json'), 'w') as f:
+            # cookies are never written to the fixture
+            json.dump({'url': url, 'params': params, 'headers': headers, 'status_code': r.status_code,
+                       'body': r.text}, f)
+        self.recorded += 1
+        # answer from the recorded body, so the recording sees exactly what a replay will
+        return CachedResponse(r.status_code, r.text)
+
+
+class FixtureReplay(object):
+    """
+    A request backend that answers requests from recorded fixture files, without reaching ESPN.
+
+    Parameters
+    ----------
+    path : str
+        The directory the fixture files were recorded to.
+
+    Raises
+    ------
+    FixtureMissing
+        From `get`, if a request was not recorded.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.replayed = 0
+
+    def __repr__(self):
+        return "FixtureReplay(%s, replayed=%d)" % (self.path, self.replayed)
+
+    def get(self, url, params=None, headers=None, cookies=None):
+        try:
+            with open(os.path.join(self.path, 'responses', request_key(url, params, headers) + '.json')) as f:
+                response = json.load(f)
+        except FileNotFoundError:
+            raise FixtureMissing("No fixture recorded for %s %s" % (url, params))
+        self.replayed += 1
+        return CachedResponse(response['status_code'], response['body'])
+
+
+def run_reports(league):
+    """
+    Runs every report against a league.
+
+    Parameters
+    ----------
+    league : espn_api.football.League or LeagueCache
+        The league to report on.
+
+    Returns
+    -------
+    dict
+        The text of each report, by report name.
+    """
+
+    league = LeagueCache(league) if not isinstance(league, LeagueCache) else league
+    return {name: report(league) for name, report in REPORTS}
+
+
+def record_league(path, league_id, year, espn_s2=None, swid=None, session=None, now=None):
+    """
+    Records every ESPN response the reports need for a league into a fixture directory, along with the text of each
+    report so that replays can be checked against it.
+
+    Parameters
+    ----------
+    path : str
+        The fixture directory.
+    league_id : int
+        The id of the fantasy football league.
+    year : int
+        The year of the league.
+    espn_s2 : str, optional
+        The espn_s2 cookie for private leagues. It is used to record but is not saved.
+    swid : str, optional
+        The SWID cookie for private leagues. It is used to record but is not saved.
+    session : requests.Session, optional
+        The session used to reach ESPN (default is a new session).
+    now : float, optional
+        The time the recording is taken at, as a Unix timestamp (default is the current time). It is saved so that
+        replays see the same clock.
+
+    Returns
+    -------
+    dict
+        The text of each report, by report name.
+    """
+
+    recorded_at = time.time() if now is None else now
+    league = League(league_id=league_id, year=year, espn_s2=espn_s2, swid=swid, fetch_league=False)
+    recorder = FixtureRecorder(path, session)
+    use_http_cache(league, recorder)
+
+    with frozen_clock(recorded_at):
+        league.fetch_league()
+        reports = run_reports(league)
+
+    with open(os.path.join(path, 'league.json'), 'w') as f:
+        json.dump({'league_id': league_id, 'year': year, 'recorded_at': recorded_at}, f)
+    os.makedirs(os.path.join(path, 'reports'), exist_ok=True)
+    for name, text in reports.items():
+        with open(os.path.join(path, 'reports', name + '.txt'), 'w') as f:
+            f.write(text)
+
+    logger.info("Recorded %d responses to %s" % (recorder.recorded, path))
+    return reports
+
+
+def replay_league(path):
+    """
+    Builds a league from a fixture directory, with every request answered from the recorded responses.
+
+    Parameters
+    ----------
+    path : str
+        The fixture directory.
+
+    Returns
+    -------
+    espn_api.football.League
+        The replayed league.
+    """
+
+    with open(os.path.join(path, 'league.json')) as f:
+        manifest = json.load(f)
+
+    league = League(league_id=manifest['league_id'], year=manifest['year'], fetch_league=False)
+    use_http_cache(league, FixtureReplay(path))
+    league.fetch_league()
+    return league
+
+
+def recorded_reports(path):
+    """
+    Returns the report texts saved when a fixture directory was recorded.
+
+    Parameters
+    ----------
+    path : str
+        The fixture directory.
+
+    Returns
+    -------
+    dict
+        The text of each report, by report name.
+    """
+
+    reports = {}
+    for name, _ in REPORTS:
+        try:
+            with open(os.path.join(path, 'reports', name + '.txt')) as f:
+                reports[name] = f.read()
+        except FileNotFoundError:
+            pass
+    return reports
+
+
+def replay_reports(path):
+    """
+    Runs every report against a replayed league, with espn_api seeing the clock of the recording.
+
+    Parameters
+    ----------
+    path : str
+        The fixture directory.
+
+    Returns
+    -------
+    dict
+        The text of each report, by report name, to compare with `recorded_reports`.
+    """
+
+    with open(os.path.join(path, 'league.json')) as f:
+        manifest = json.load(f)
+
+    with frozen_clock(manifest.get('recorded_at', time.time())):
+        return run_reports(replay_league(path))
+
+
+if __name__ == '__main__':
+    # python -m gamedaybot.espn.fixtures tests/fixtures/<name>, with the league set up as for the bot
+    import sys
+    from gamedaybot.espn.env_vars import get_env_vars
+
+    data = get_env_vars()
+    if data['swid'] == '{1}' or data['espn_s2'] == '1':
+        record_league(sys.argv[1], data['league_id'], data['year'])
+    else:
+        record_league(sys.argv[1], data['league_id'], data['year'], data['espn_s2'], data['swid'])
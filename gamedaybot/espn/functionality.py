@@ -1,8 +1,12 @@
 from datetime import date
 import gamedaybot.utils.util as util
 import gamedaybot.espn.env_vars as env_vars
+from gamedaybot.espn.league_cache import LeagueCache, cached_league
+import gamedaybot.espn.all_play as all_play
+import gamedaybot.espn.trophies as trophies
 
-random_phrase = env_vars.get_random_phrase()
+# projected margin, in points, at or under which a game counts as close
+CLOSE_SCORE_MARGIN = 11
 
 def get_scoreboard_short(league, week=None):
     """
@@ -83,6 +87,7 @@ def get_standings(league, top_half_scoring=False, week=None):
         A string containing the current standings, formatted as a list of teams with their records and positions.
     """
 
+    league = cached_league(league)
     emotes = env_vars.split_emotes(league)
     standings_txt = ''
     teams = league.teams
@@ -94,11 +99,12 @@ def get_standings(league, top_half_scoring=False, week=None):
     else:
         # top half scoring can be enabled by default in ESPN now.
         # this should generally not be used
-        top_half_totals = {t.team_name: 0 for t in teams}
         if not week:
             week = league.current_week
-        for w in range(1, week):
-            top_half_totals = top_half_wins(league, top_half_totals, w)
+        weeks = range(1, week)
+        matrix = all_play.ScoreMatrix.from_box_scores([t.team_id for t in teams], weeks, league.prefetch(weeks))
+        top_half = matrix.top_half_wins()
+        top_half_totals = {t.team_name: top_half[t.team_id] for t in teams}
 
         for t in teams:
             wins = top_half_totals[t.team_name] + t.wins
@@ -113,16 +119,12 @@ def get_standings(league, top_half_scoring=False, week=None):
 
 
 def top_half_wins(league, top_half_totals, week):
-    box_scores = league.box_scores(week=week)
-
-    scores = [(i.home_score, i.home_team.team_name) for i in box_scores] + \
-        [(i.away_score, i.away_team.team_name) for i in box_scores if i.away_team]
-
-    scores = sorted(scores, key=lambda tup: tup[0], reverse=True)
+    matrix = all_play.ScoreMatrix.from_box_scores([t.team_id for t in league.teams], [week],
+                                                  [league.box_scores(week=week)])
+    top_half = matrix.top_half_wins()
 
-    for i in range(0, len(scores) // 2):
-        points, team_name = scores[i]
-        top_half_totals[team_name] += 1
+    for t in league.teams:
+        top_half_totals[t.team_name] += top_half[t.team_id]
 
     return top_half_totals
 
@@ -212,7 +214,7 @@ def get_monitor(league, warning):
         return ('')
     
     text = ['__**Players to Monitor**__ '] + monitor
-    if random_phrase == True:
+    if env_vars.use_random_phrase(league):
         text += util.get_random_phrase()
     
     return '\n'.join(text)
@@ -247,7 +249,7 @@ def get_inactives(league, week=None):
         return ('')
 
     text = ['__**Inactive Players**__ '] + inactives
-    if random_phrase == True:
+    if env_vars.use_random_phrase(league):
         text += util.get_random_phrase()
 
     return '\n'.join(text)
@@ -396,7 +398,7 @@ def get_matchups(league, week=None):
             scores += [home_team.lstrip() + ' vs ' + away_team.lstrip()]
 
     text = ['__**Matchups**__ '] + scores + ['']
-    if random_phrase == True:
+    if env_vars.use_random_phrase(league):
         text += util.get_random_phrase()
 
     return '\n'.join(text)
@@ -428,7 +430,7 @@ def get_close_scores(league, week=None):
             away_projected = get_projected_total(i.away_lineup)
             home_projected = get_projected_total(i.home_lineup)
             diffScore = away_projected - home_projected
-            if (abs(diffScore) <= 11 and (not all_played(i.away_lineup) or not all_played(i.home_lineup))):
+            if (abs(diffScore) <= CLOSE_SCORE_MARGIN and (not all_played(i.away_lineup) or not all_played(i.home_lineup))):
                 score += ['%s`%4s %6.2f - %6.2f %4s`%s' % (emotes[i.home_team.team_id], i.home_team.team_abbrev, i.home_projected,
                                                  i.away_projected, i.away_team.team_abbrev, emotes[i.away_team.team_id])]
     if not score:
@@ -497,7 +499,7 @@ def get_waiver_report(league, faab=False):
         
     text = ['__**Waiver Report %s**__' % today] + report + ['']
 
-    if random_phrase == True:
+    if env_vars.use_random_phrase(league):
         text += util.get_random_phrase()
 
     return '\n'.join(text)
@@ -525,6 +527,7 @@ def combined_power_rankings(league, week=None):
         A string representing the power rankings with changes from the previous week, playoff chance, and simulated records
     """
 
+    league = cached_league(league)
     emotes = env_vars.split_emotes(league)
 
     # Check if the week is provided, if not use the previous week
@@ -571,7 +574,7 @@ def combined_power_rankings(league, week=None):
         rankings_text.append(f"{pos}: {emotes[current_team.team_id]}`{current_team.team_abbrev:4s} [{normalized_current_score}{rank_change_text} | {current_team.playoff_pct:.1f}% | {sr[current_team][0]}]`")
         pos += 1
 
-    if random_phrase == True:
+    if env_vars.use_random_phrase(league):
         rankings_text += [''] + util.get_random_phrase()
     
     return '\n'.join(rankings_text)
@@ -579,7 +582,8 @@ def combined_power_rankings(league, week=None):
 
 def sim_record(league, week=None):
     """
-    This function takes in a league object and an optional week parameter. It then iterates through each result each week and determines what the records of each team would be had they faced every other team through each week of the season.
+    This function takes in a league object and an optional week parameter. It returns what the records of each team would be had they faced every other team through each week of the season.
+    Finished weeks are folded into a running all-play total once, so only weeks since the last call are computed.
 
     Parameters:
     league (object): A league object containing information about the league and its teams.
@@ -589,41 +593,15 @@ def sim_record(league, week=None):
     list: A list containing the head-to-head records for the week.
     """
 
+    league = cached_league(league)
     if not week:
         week = league.current_week - 1
 
-    records = {}
-    weekly_records = {}
+    weekly_records = all_play.get_all_play(league).records(league, week)
 
+    records = {}
     for t in league.teams:
-        records[t] = ''
-        weekly_records[t] = [0,0,0]
-
-    for i in range(week):
-        weekNumber = i+1
-        box_scores = league.box_scores(weekNumber)
-        weekly_scores = {}
-        for i in box_scores: 
-            if i.home_team != 0 and i.away_team != 0:
-                weekly_scores[i.home_team] = [i.home_score]
-                weekly_scores[i.away_team] = [i.away_score]
-
-        for i in weekly_scores:
-            for j in weekly_scores:
-                if i != j:
-                    if weekly_scores[i][0] > weekly_scores[j][0]:
-                        weekly_records[i][0] += 1
-                    elif weekly_scores[i][0] < weekly_scores[j][0]:
-                        weekly_records[i][1] += 1
-                    else: # Just in case of a tie
-                        weekly_records[i][2] += 1
-            
-    for r in weekly_records:
-        if weekly_records[r][2] > 0:
-            records[r] = ['%s-%s-%s' % (weekly_records[r][0], weekly_records[r][1], weekly_records[r][2])]
-        else:
-            records[r] = ['%s-%s' % (weekly_records[r][0], weekly_records[r][1])]
-   
+        records[t] = [all_play.format_record(weekly_records.get(t.team_id, [0, 0, 0]))]
 
     return (records)
 
@@ -632,6 +610,38 @@ def get_starter_counts(league):
     """
     Get the number of starters for each position
 
+    The counts come from the league's lineup slot settings. If those are not available, they are counted from last
+    week's lineups and kept on the espn_api league, so they are counted again when the league session replaces it.
+
+    Parameters
+    ----------
+    league : object
+        The league object for which the starter counts are being generated
+
+    Returns
+    -------
+    dict
+        A dictionary containing the number of players at each position within the starting lineup.
+    """
+
+    slot_counts = getattr(getattr(league, 'settings', None), 'position_slot_counts', None) or {}
+    starters = {slot: count for slot, count in slot_counts.items() if count > 0 and slot not in ['BE', 'IR', '']}
+    if starters:
+        return starters
+
+    # a LeagueCache only lasts for one job, the league it wraps lasts until the next refresh
+    target = league.league if isinstance(league, LeagueCache) else league
+    counts = getattr(target, 'lineup_starter_counts', None)
+    if counts is None:
+        counts = count_lineup_starters(league)
+        target.lineup_starter_counts = counts
+    return counts
+
+
+def count_lineup_starters(league):
+    """
+    Count the number of starters for each position from last week's lineups
+
     Parameters
     ----------
     league : object
@@ -684,52 +694,100 @@ def get_starter_counts(league):
                 return h_starters
 
 
-def best_flex(flexes, player_pool, num):
+# positions that can fill the offensive and defensive player flex slots
+OP_POSITIONS = ['RB', 'WR', 'TE', 'QB']
+DP_POSITIONS = ['DT', 'DE', 'LB', 'CB', 'S']
+
+
+def slot_positions(slot):
     """
-    Given a list of flex positions, a dictionary of player pool, and a number of players to return,
-    this function returns the best flex players from the player pool.
+    Returns the player positions that are eligible to fill a lineup slot.
 
     Parameters
     ----------
-    flexes : list
-        a list of strings representing the flex positions
-    player_pool : dict
-        a dictionary with keys as position and values as a dictionary with player name as key and value as score
-    num : int
-        number of players to return from the player pool
+    slot : str
+        The lineup slot, e.g. 'RB', 'RB/WR/TE', 'OP' or 'DP'.
 
     Returns
-    ----------
-    best : dict
-        a dictionary containing the best flex players from the player pool
-    player_pool : dict
-        the updated player pool after removing the best flex players
-    """
+    -------
+    list
+        A list of the positions that can fill the slot.
+    """
+
+    if slot == 'OP':
+        return OP_POSITIONS
+    if slot == 'DP':
+        return DP_POSITIONS
+    if 'D/ST' not in slot and '/' in slot:
+        return slot.split('/')
+    return [slot]
+
+
+def _assign_player(player, eligible, capacity, assigned, visited):
+    # try to seat the player in an open slot, moving already seated players along an augmenting path if needed
+    for slot in eligible[player]:
+        if slot in visited:
+            continue
+        visited.add(slot)
+        if len(assigned[slot]) < capacity[slot]:
+            assigned[slot].append(player)
+            return True
+        for seated in assigned[slot]:
+            if _assign_player(seated, eligible, capacity, assigned, visited):
+                assigned[slot].remove(seated)
+                assigned[slot].append(player)
+                return True
+    return False
+
+
+def _slots_for_positions(starter_counts):
+    # map each player position to the indexes of the slots it can fill
+    slots_for_position = {}
+    for k, slot in enumerate(starter_counts):
+        for position in slot_positions(slot):
+            slots_for_position.setdefault(position, []).append(k)
+    return slots_for_position
+
+
+def _pack_lineup(lineup, slots_for_position):
+    # reduce a lineup to its started score plus the points and eligible slots of every player that can start
+    score = 0
+    points = []
+    eligible = []
+    for player in lineup:
+        if player.slot_position not in ['BE', 'IR']:
+            score += player.points
+        if player.position in slots_for_position:
+            points.append(player.points)
+            eligible.append(slots_for_position[player.position])
+    return score, points, eligible
 
-    pool = {}
-    # iterate through each flex position
-    for flex_position in flexes:
-        # add players from flex position to the pool
-        try:
-            pool = pool | player_pool[flex_position]
-        except KeyError:
-            pass
-    # sort the pool by score in descending order
-    pool = {k: v for k, v in sorted(pool.items(), key=lambda item: item[1], reverse=True)}
-    # get the top num players from the pool
-    best = dict(list(pool.items())[:num])
-    # remove the best flex players from the player pool
-    for pos in player_pool:
-        for p in best:
-            if p in player_pool[pos]:
-                player_pool[pos].pop(p)
-    return best, player_pool
+
+def _best_score(points, eligible, capacity):
+    best_score = 0
+    assigned = [[] for _ in capacity]
+    for p in sorted(range(len(points)), key=lambda p: points[p], reverse=True):
+        if _assign_player(p, eligible, capacity, assigned, set()):
+            best_score += points[p]
+    return best_score
+
+
+def _lineup_result(best_score, score):
+    score_pct = 0
+    if best_score != 0:
+        score_pct = (score / best_score) * 100
+    return (best_score, score, best_score - score, score_pct)
 
 
 def optimal_lineup_score(lineup, starter_counts):
     """
     This function returns the optimal lineup score based on the provided lineup and starter counts.
 
+    Filling the slots is an assignment problem: players are considered from highest to lowest score and each one is
+    kept if the players kept so far can still all be seated, moving earlier players between flex slots when needed.
+    Because the sets of players that can be seated together form a matroid, this greedy order is exact even when flex
+    slots overlap.
+
     Parameters
     ----------
     lineup : list
@@ -744,64 +802,38 @@ def optimal_lineup_score(lineup, starter_counts):
         and the percentage of the provided lineup's score compared to the optimal lineup's score.
     """
 
-    best_lineup = {}
-    position_players = {}
+    return optimal_lineup_scores([lineup], starter_counts)[0]
 
-    # get all players and points
-    score = 0
-    score_pct = 0
-    best_score = 0
 
-    for player in lineup:
-        try:
-            position_players[player.position][player.name] = player.points
-        except KeyError:
-            position_players[player.position] = {}
-            position_players[player.position][player.name] = player.points
-        if player.slot_position not in ['BE', 'IR']:
-            score += player.points
+def optimal_lineup_scores(lineups, starter_counts):
+    """
+    This function returns the optimal lineup score of many lineups that share the same starter counts,
+    e.g. every team's lineup for every week of a season.
 
-    # sort players by position for points
-    for position in starter_counts:
-        try:
-            position_players[position] = {k: v for k, v in sorted(
-                position_players[position].items(), key=lambda item: item[1], reverse=True)}
-            best_lineup[position] = dict(list(position_players[position].items())[:starter_counts[position]])
-            position_players[position] = dict(list(position_players[position].items())[starter_counts[position]:])
-        except KeyError:
-            best_lineup[position] = {}
-
-    # flexes. need to figure out best in other single positions first
-    for position in starter_counts:
-        # flex
-        if 'D/ST' not in position and '/' in position:
-            flex = position.split('/')
-            result = best_flex(flex, position_players, starter_counts[position])
-            best_lineup[position] = result[0]
-            position_players = result[1]
-
-    # Offensive Player. need to figure out best in other positions first
-    if 'OP' in starter_counts:
-        flex = ['RB', 'WR', 'TE', 'QB']
-        result = best_flex(flex, position_players, starter_counts['OP'])
-        best_lineup['OP'] = result[0]
-        position_players = result[1]
-
-    # Defensive Player. need to figure out best in other positions first
-    if 'DP' in starter_counts:
-        flex = ['DT', 'DE', 'LB', 'CB', 'S']
-        result = best_flex(flex, position_players, starter_counts['DP'])
-        best_lineup['DP'] = result[0]
-        position_players = result[1]
-
-    for position in best_lineup:
-        best_score += sum(best_lineup[position].values())
+    Each lineup is packed once into the started score plus the points and eligible slots of its players,
+    and the slot eligibility of each position is worked out once for all of them.
 
-    score_pct = 0
-    if best_score != 0:
-        score_pct = (score / best_score) * 100
+    Parameters
+    ----------
+    lineups : list
+        A list of lineups, each a list of player objects
+    starter_counts : dict
+        A dictionary containing the number of starters for each position
 
-    return (best_score, score, best_score - score, score_pct)
+    Returns
+    -------
+    list
+        A list with the result of `optimal_lineup_score` for each lineup, in the same order as `lineups`.
+    """
+
+    capacity = list(starter_counts.values())
+    slots_for_position = _slots_for_positions(starter_counts)
+
+    results = []
+    for lineup in lineups:
+        score, points, eligible = _pack_lineup(lineup, slots_for_position)
+        results.append(_lineup_result(_best_score(points, eligible, capacity), score))
+    return results
 
 
 def optimal_team_scores(league, week=None):
@@ -821,6 +853,7 @@ def optimal_team_scores(league, week=None):
         A string representing the full report of the optimal team scores.
     """
 
+    league = cached_league(league)
     emotes = env_vars.split_emotes(league)
     if not week:
         week = league.current_week - 1
@@ -829,11 +862,16 @@ def optimal_team_scores(league, week=None):
     best_scores = {}
     starter_counts = get_starter_counts(league)
 
+    team_lineups = []
     for i in box_scores:
         if i.home_team != 0:
-            best_scores[i.home_team] = optimal_lineup_score(i.home_lineup, starter_counts)
+            team_lineups.append((i.home_team, i.home_lineup))
         if i.away_team != 0:
-            best_scores[i.away_team] = optimal_lineup_score(i.away_lineup, starter_counts)
+            team_lineups.append((i.away_team, i.away_lineup))
+
+    optimal = optimal_lineup_scores([lineup for team, lineup in team_lineups], starter_counts)
+    for (team, lineup), result in zip(team_lineups, optimal):
+        best_scores[team] = result
 
     best_scores = {key: value for key, value in sorted(best_scores.items(), key=lambda item: item[1][3], reverse=True)}
 
@@ -871,37 +909,9 @@ def get_achievers_trophy(league, low_team_id, high_team_id, week=None):
         A string representing the overachiever and underachiever of the league
     """
 
-    box_scores = league.box_scores(week=week)
     emotes = env_vars.split_emotes(league)
-    achiever_str = []
-    best_performance = -9999
-    worst_performance = 9999
-    for i in box_scores:
-        home_performance = i.home_score - i.home_projected
-        away_performance = i.away_score - i.away_projected
-
-        if i.home_team != 0:
-            if home_performance > best_performance:
-                best_performance = home_performance
-                over_achiever = i.home_team
-            if home_performance < worst_performance:
-                worst_performance = home_performance
-                under_achiever = i.home_team
-        if i.away_team != 0:
-            if away_performance > best_performance:
-                best_performance = away_performance
-                over_achiever = i.away_team
-            if away_performance < worst_performance:
-                worst_performance = away_performance
-                under_achiever = i.away_team
-
-    if best_performance > 0 and over_achiever.team_id != high_team_id:
-        achiever_str += ['📈 `Overachiever:` %s \n- **%s** was %.2f points over their projection' % (emotes[over_achiever.team_id], over_achiever.team_name, best_performance)]
-
-    if worst_performance < 0 and under_achiever.team_id != low_team_id:
-        achiever_str += ['📉 `Underachiever:` %s \n- **%s** was %.2f points under their projection' % (emotes[under_achiever.team_id], under_achiever.team_name, abs(worst_performance))]
-
-    return achiever_str
+    achievers = trophies.AchieversTrophy(lambda: high_team_id, lambda: low_team_id)
+    return trophies.TrophyEngine([achievers]).run(league.box_scores(week=week)).lines(emotes)
 
 
 def get_weekly_score_with_win_loss(league, week=None):
@@ -928,33 +938,9 @@ def get_lucky_trophy(league, week=None):
     list: A list containing the lucky and unlucky teams, along with their records for the week.
     """
 
-    weekly_scores = get_weekly_score_with_win_loss(league, week=week)
     emotes = env_vars.split_emotes(league)
-    losses = 0
-    unlucky_record = ''
-    lucky_record = ''
-    num_teams = len(weekly_scores) - 1
-
-    for t in weekly_scores:
-        if weekly_scores[t][1] == 'L':
-            unlucky_team = t
-            unlucky_record = str(num_teams - losses) + '-' + str(losses)
-            break
-        losses += 1
-
-    wins = 0
-    weekly_scores = dict(sorted(weekly_scores.items(), key=lambda item: item[1]))
-    for t in weekly_scores:
-        if weekly_scores[t][1] == 'W':
-            lucky_team = t
-            lucky_record = str(wins) + '-' + str(num_teams - wins)
-            break
-        wins += 1
-
-
-    lucky_str = ['🍀 `Lucky:` %s \n- **%s** was %s against the league, but got the win' % (emotes[lucky_team.team_id], lucky_team.team_name, lucky_record)]
-    unlucky_str = ['💀 `Unlucky:` %s \n- **%s** was %s against the league, but still took an L' % (emotes[unlucky_team.team_id], unlucky_team.team_name, unlucky_record)]
-    return (lucky_str + unlucky_str)
+    return trophies.TrophyEngine([trophies.LuckyTrophy()]).run(league.box_scores(week=week)).lines(emotes)
+
 
 def get_mvp_trophy(league, week=None):
     """
@@ -975,56 +961,8 @@ def get_mvp_trophy(league, week=None):
     """
 
     emotes = env_vars.split_emotes(league)
-    matchups = league.box_scores(week=week)
-    mvp_score_diff = -100
-    mvp_proj = -100
-    mvp_score = ''
-    mvp = ''
-    mvp_team = -1
-
-    lvp_score_diff = 999
-    lvp_proj = 999
-    lvp_score = ''
-    lvp = ''
-    lvp_team = -1
+    return trophies.TrophyEngine([trophies.MvpTrophy()]).run(league.box_scores(week=week)).lines(emotes)
 
-    for i in matchups:
-        for p in i.home_lineup:
-            if p.slot_position != 'BE' and p.slot_position != 'IR' and p.position != 'D/ST' and p.projected_points > 0:
-                score_diff = (p.points - p.projected_points)/p.projected_points
-                proj_diff = p.points - p.projected_points
-                if (score_diff > mvp_score_diff) or (score_diff == mvp_score_diff and proj_diff > mvp_proj):
-                    mvp_score_diff = score_diff
-                    mvp_proj = proj_diff
-                    mvp_score = '%.2f points (%.2f proj, %.2f diff ratio)' % (p.points, p.projected_points, score_diff)
-                    mvp = p.position + ' ' + p.name
-                    mvp_team = i.home_team
-                elif (score_diff < lvp_score_diff) or (score_diff == lvp_score_diff and proj_diff < lvp_proj):
-                    lvp_score_diff = score_diff
-                    lvp_proj = proj_diff
-                    lvp_score = '%.2f points (%.2f proj, %.2f diff ratio)' % (p.points, p.projected_points, score_diff)
-                    lvp = p.position + ' ' + p.name
-                    lvp_team = i.home_team
-        for p in i.away_lineup:
-            if p.slot_position != 'BE' and p.slot_position != 'IR' and p.position != 'D/ST' and p.projected_points > 0:
-                score_diff = (p.points - p.projected_points)/p.projected_points
-                proj_diff = p.points - p.projected_points
-                if (score_diff > mvp_score_diff) or (score_diff == mvp_score_diff and proj_diff > mvp_proj):
-                    mvp_score_diff = score_diff
-                    mvp_proj = proj_diff
-                    mvp_score = '%.2f points (%.2f proj, %.2f diff ratio)' % (p.points, p.projected_points, score_diff)
-                    mvp = p.position + ' ' + p.name
-                    mvp_team = i.away_team
-                elif (score_diff < lvp_score_diff) or (score_diff == lvp_score_diff and proj_diff < lvp_proj):
-                    lvp_score_diff = score_diff
-                    lvp_proj = proj_diff
-                    lvp_score = '%.2f points (%.2f proj, %.2f diff ratio)' % (p.points, p.projected_points, score_diff)
-                    lvp = p.position + ' ' + p.name
-                    lvp_team = i.away_team
-
-    mvp_str = ['👍 `Week MVP:` %s \n- %s, **%s** with %s' % (emotes[mvp_team.team_id], mvp, mvp_team.team_abbrev, mvp_score)]
-    lvp_str = ['👎 `Week LVP:` %s \n- %s, **%s** with %s' % (emotes[lvp_team.team_id], lvp, lvp_team.team_abbrev, lvp_score)]
-    return (mvp_str + lvp_str)
 
 def get_trophies(league, extra_trophies, week=None):
     """
@@ -1045,76 +983,13 @@ def get_trophies(league, extra_trophies, week=None):
     if not week:
         week = league.current_week - 1
 
+    league = cached_league(league)
     emotes = env_vars.split_emotes(league)
-    matchups = league.box_scores(week=week)
-
-    low_score = 9999
-    low_team = -1
-
-    high_score = -1
-    high_team = -1
-
-    closest_score = 9999
-    close_winner = -1
-    close_loser = -1
-    close_emotes = ''
-
-    biggest_blowout = -1
-    blown_out_team = -1
-    ownerer_team = -1
-    blowout_emotes = ''
-
-    for i in matchups:
-        if i.home_score > high_score:
-            high_score = i.home_score
-            high_team = i.home_team
-        if i.home_score < low_score:
-            low_score = i.home_score
-            low_team = i.home_team
-        if i.away_score > high_score:
-            high_score = i.away_score
-            high_team = i.away_team
-        if i.away_score < low_score:
-            low_score = i.away_score
-            low_team = i.away_team
-
-        if i.away_score - i.home_score != 0 and \
-            abs(i.away_score - i.home_score) < closest_score:
-            closest_score = abs(i.away_score - i.home_score)
-            if i.away_score - i.home_score < 0:
-                close_winner = i.home_team
-                close_loser = i.away_team
-            else:
-                close_winner = i.away_team
-                close_loser = i.home_team
-
-        if abs(i.away_score - i.home_score) > biggest_blowout:
-            biggest_blowout = abs(i.away_score - i.home_score)
-            if i.away_score - i.home_score < 0:
-                ownerer_team = i.home_team
-                blown_out_team = i.away_team
-            else:
-                ownerer_team = i.away_team
-                blown_out_team = i.home_team
-        
-        if emotes[1]:
-            close_emotes = '%s> %s' % (emotes[close_winner.team_id], emotes[close_loser.team_id])
-            blowout_emotes = '%s< %s' % (emotes[blown_out_team.team_id], emotes[ownerer_team.team_id])
-        
-
-    high_score_str = ['👑 `Highest score:` %s \n- **%s** with %.2f points' % (emotes[high_team.team_id], high_team.team_name, high_score)]
-    low_score_str = ['💩 `Lowest score:` %s \n- **%s** with %.2f points' % (emotes[low_team.team_id], low_team.team_name, low_score)]
-    close_score_str = ['🧊 `Closest Win:` %s \n- **%s** barely beat **%s** by a margin of %.2f' % (close_emotes, close_winner.team_name, close_loser.team_name, closest_score)]
-    blowout_str = ['💥 `Biggest Loss:` %s \n- **%s** got blown out by **%s** by a margin of %.2f' % (blowout_emotes, blown_out_team.team_name, ownerer_team.team_name, biggest_blowout)]
-
-    text = ['__**Trophies of the week**__ '] + high_score_str + low_score_str + close_score_str + blowout_str
-
-    if extra_trophies == True:
-        text += get_achievers_trophy(league, low_team.team_id, high_team.team_id, week) + get_lucky_trophy(league, week) + get_mvp_trophy(league, week) + ['']
-    else:
-        text += ['']
+    # every trophy is folded in during a single pass over the week's matchups, teams and players
+    engine = trophies.TrophyEngine(trophies.weekly_trophies(extra_trophies == True))
+    text = ['__**Trophies of the week**__ '] + engine.run(league.box_scores(week=week)).lines(emotes) + ['']
 
-    if random_phrase == True:
+    if env_vars.use_random_phrase(league):
         text += util.get_random_phrase()
 
     return '\n'.join(text)
@@ -0,0 +1,338 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+from espn_api.requests.espn_requests import EspnFantasyRequests
+
+from gamedaybot.utils.metrics import span
+
+logger = logging.getLogger(__name__)
+
+STAT_KEYS = ('requests', 'hits', 'revalidated', 'misses', 'bytes_saved')
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def request_key(url, params=None, headers=None, cookies=None):
+    """
+    Returns a stable key for a GET request, made from its URL, parameters, headers and cookies.
+
+    The cookies carry a private league's espn_s2 and SWID credentials, so a response fetched with them is never served
+    to a request without them. They only enter the key through its digest.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the request.
+    params : dict, optional
+        The query string parameters.
+    headers : dict, optional
+        The request headers.
+    cookies : dict, optional
+        The request cookies.
+
+    Returns
+    -------
+    str
+        A hex digest identifying the request.
+    """
+
+    request = json.dumps([url, params, headers, cookies or None], sort_keys=True, default=str)
+    return hashlib.sha1(request.encode('utf-8')).hexdigest()
+
+
+class CachedResponse(object):
+    """
+    The parts of an HTTP response espn_api reads, for responses answered from the cache.
+
+    Parameters
+    ----------
+    status_code : int
+        The HTTP status of the response.
+    body : str
+        The response body.
+    """
+
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.body = body
+        self.text = body
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class HttpCache(object):
+    """
+    A cache of ESPN API responses that serves repeated requests from memory or disk.
+
+    A response younger than `ttl` is served without contacting ESPN. An older one is revalidated with its ETag or
+    Last-Modified validator, and served again if ESPN answers 304 Not Modified. Only successful responses are kept.
+
+    Parameters
+    ----------
+    ttl : int, optional
+        The number of seconds a response is served without revalidating it (default is 60).
+    path : str, optional
+        A directory where responses are also kept between runs. If not provided, responses are only kept in memory.
+    max_entries : int, optional
+        The number of responses kept in memory, least recently used first out (default is 256).
+
+    Attributes
+    ----------
+    stats : dict
+        The number of requests, hits, revalidated responses, misses and bytes not downloaded since the cache was
+        created.
+    reports : dict
+        The same counters for each report, as recorded with `record`.
+    """
+
+    def __init__(self, ttl=60, path=None, max_entries=256):
+        self.ttl = ttl
+        self.path = path
+        self.max_entries = max_entries
+        self.stats = dict.fromkeys(STAT_KEYS, 0)
+        self.reports = {}
+        self.session = requests.Session()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "HttpCache(ttl=%d, %s)" % (self.ttl, self.stats)
+
+    def _file(self, key):
+        return os.path.join(self.path, key + '.json')
+
+    def _load(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+        if not self.path:
+            return None
+        try:
+            with open(self._file(key)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, key, entry, persist=True):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        if not (self.path and persist):
+            return
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            tmp = self._file(key) + '.%d.%d.tmp' % (os.getpid(), threading.get_ident())
+            with open(tmp, 'w') as f:
+                json.dump(entry, f)
+            os.replace(tmp, self._file(key))
+        except OSError as e:
+            logger.warning("Could not save cached response: %s" % e)
+
+    def _count(self, **counts):
+        with self._lock:
+            self.stats['requests'] += 1
+            for name, count in counts.items():
+                self.stats[name] += count
+
+    def get(self, url, params=None, headers=None, cookies=None):
+        """
+        Sends a GET request, or answers it from the cache.
+
+        Parameters
+        ----------
+        url : str
+            The URL to request.
+        params : dict, optional
+            The query string parameters.
+        headers : dict, optional
+            The request headers.
+        cookies : dict, optional
+            The request cookies, part of the cache key so that responses are only shared between requests with the
+            same credentials.
+
+        Returns
+        -------
+        requests.Response or CachedResponse
+            The response.
+        """
+
+        key = request_key(url, params, headers, cookies)
+        entry = self._load(key)
+        now = time.time()
+
+        if entry is not None and now - entry['fetched_at'] < self.ttl:
+            self._count(hits=1, bytes_saved=len(entry['body']))
+            return CachedResponse(200, entry['body'])
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            if entry.get('etag'):
+                request_headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                request_headers['If-Modified-Since'] = entry['last_modified']
+
+        r = self.session.get(url, params=params, headers=request_headers, cookies=cookies)
+
+        if r.status_code == 304 and entry is not None:
+            entry = dict(entry, fetched_at=now)
+            self._save(key, entry, persist=False)
+            self._count(revalidated=1, bytes_saved=len(entry['body']))
+            return CachedResponse(200, entry['body'])
+
+        self._count(misses=1)
+        if r.status_code == 200:
+            self._save(key, {'url': url, 'etag': r.headers.get('ETag'), 'last_modified': r.headers.get('Last-Modified'),
+                             'fetched_at': now, 'body': r.text})
+        return r
+
+    def snapshot(self):
+        """
+        Returns a copy of the counters, to measure a report with `record`.
+
+        Returns
+        -------
+        dict
+            The current counters.
+        """
+
+        with self._lock:
+            return dict(self.stats)
+
+    def record(self, report, before):
+        """
+        Adds the requests made since a snapshot to a report's counters.
+
+        Counters are shared by every job in the process, so reports that run at the same time share their counts.
+
+        Parameters
+        ----------
+        report : str
+            The name of the report, e.g. "get_standings".
+        before : dict
+            The counters returned by `snapshot` before the report ran.
+
+        Returns
+        -------
+        dict
+            The counters of this run of the report.
+        """
+
+        with self._lock:
+            delta = {name: self.stats[name] - before[name] for name in STAT_KEYS}
+            totals = self.reports.setdefault(report, dict.fromkeys(STAT_KEYS, 0))
+            for name in STAT_KEYS:
+                totals[name] += delta[name]
+        return delta
+
+
+class CachingEspnRequests(EspnFantasyRequests):
+    """
+    espn_api's request class with its league and game requests sent through an HttpCache, and timed.
+
+    Parameters
+    ----------
+    cache : HttpCache, optional
+        The cache to send the requests through, or any object with the same `get` method, such as the fixture
+        recorder and replay backends. If not provided, requests go straight to ESPN.
+    *args, **kwargs
+        Passed on to EspnFantasyRequests.
+    """
+
+    def __init__(self, *args, cache=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache = cache
+
+    def _send(self, endpoint, params, headers):
+        view = params.get('view') if params else None
+        with span('espn_request', view=view if isinstance(view, str) else None) as request:
+            if self.cache is None:
+                r = requests.get(endpoint, params=params, headers=headers, cookies=self.cookies)
+            else:
+                r = self.cache.get(endpoint, params=params, headers=headers, cookies=self.cookies)
+            request['status'] = str(r.status_code)
+            request['bytes'] = len(r.text)
+            request['cached'] = isinstance(r, CachedResponse)
+        return r
+
+    def league_get(self, params=None, headers=None, extend=''):
+        endpoint = self.LEAGUE_ENDPOINT + extend
+        r = self._send(endpoint, params, headers)
+        alternate_response = self.checkRequestStatus(r.status_code, extend=extend, params=params, headers=headers)
+
+        response = alternate_response if alternate_response else r.json()
+        if self.logger:
+            self.logger.log_request(endpoint=endpoint, params=params, headers=headers, response=response)
+
+        return response[0] if isinstance(response, list) else response
+
+    def get(self, params=None, headers=None, extend=''):
+        endpoint = self.ENDPOINT + extend
+        r = self._send(endpoint, params, headers)
+        if r.status_code == 404:
+            return self.checkRequestStatus(r.status_code, extend=extend)
+        self.checkRequestStatus(r.status_code)
+
+        response = r.json()
+        if self.logger:
+            self.logger.log_request(endpoint=endpoint, params=params, headers=headers, response=response)
+        return response
+
+
+def use_http_cache(league, cache):
+    """
+    Sends a league's future requests to ESPN through an HttpCache, timing each one.
+
+    Parameters
+    ----------
+    league : espn_api.football.League
+        The league, usually created with `fetch_league=False` so that its first fetch goes through the cache too.
+    cache : HttpCache, optional
+        The cache to send the requests through. If not provided, requests go straight to ESPN and are only timed.
+
+    Returns
+    -------
+    espn_api.football.League
+        The same league.
+    """
+
+    league.espn_request = CachingEspnRequests('nfl', league.year, league.league_id, cookies=league.espn_request.cookies,
+                                              logger=league.espn_request.logger, cache=cache)
+    return league
+
+
+def get_http_cache(ttl=60, path=None):
+    """
+    Returns the process-wide HTTP cache for the given settings, creating it on first use.
+
+    Leagues with the same settings share a cache, and leagues with their own HTTP_CACHE_TTL or DATA_DIR get their own.
+
+    Parameters
+    ----------
+    ttl : int, optional
+        The number of seconds a response is served without revalidating it (default is 60).
+    path : str, optional
+        A directory where responses are also kept between runs.
+
+    Returns
+    -------
+    HttpCache
+        The shared cache.
+    """
+
+    key = (ttl, path)
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = HttpCache(ttl, path)
+        return _caches[key]
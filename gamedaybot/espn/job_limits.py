@@ -0,0 +1,103 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from gamedaybot.espn.league_cache import current_batch
+from gamedaybot.utils.metrics import span
+
+logger = logging.getLogger(__name__)
+
+
+class JobLimiter(object):
+    """
+    Caps how many scheduled jobs run at the same time, both across the process and for any one league.
+
+    Parameters
+    ----------
+    max_jobs : int, optional
+        The maximum number of jobs running at the same time across every league (default is 4).
+    max_league_jobs : int, optional
+        The maximum number of jobs running at the same time for one league (default is 2).
+
+    Attributes
+    ----------
+    running : int
+        The number of jobs currently running.
+    """
+
+    def __init__(self, max_jobs=4, max_league_jobs=2):
+        self.max_jobs = max_jobs
+        self.max_league_jobs = max_league_jobs
+        self.running = 0
+        self._jobs = threading.BoundedSemaphore(max_jobs)
+        self._leagues = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "JobLimiter(max_jobs=%d, max_league_jobs=%d, running=%d)" % (self.max_jobs, self.max_league_jobs,
+                                                                            self.running)
+
+    def _league(self, league_id):
+        with self._lock:
+            semaphore = self._leagues.get(league_id)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.max_league_jobs)
+                self._leagues[league_id] = semaphore
+            return semaphore
+
+    @contextmanager
+    def slot(self, league_id):
+        """
+        Waits until a job of the given league is allowed to run, and holds its place while the block runs.
+
+        The league's own cap is taken first, so a league with many waiting jobs does not hold up the global slots
+        other leagues could use.
+
+        Parameters
+        ----------
+        league_id : str
+            The id of the league the job belongs to.
+        """
+
+        league = self._league(league_id)
+        with league, self._jobs:
+            with self._lock:
+                self.running += 1
+            try:
+                yield
+            finally:
+                with self._lock:
+                    self.running -= 1
+
+    def wrap(self, job, league_id):
+        """
+        Wraps a bot job so that it runs within the limits and shares its ESPN fetches with the other jobs of its
+        league triggered in the same minute.
+
+        Parameters
+        ----------
+        job : callable
+            The job to run, called as `job(function, tenant, batch=batch)`, e.g. `espn_bot`.
+        league_id : str
+            The id of the league the job belongs to.
+
+        Returns
+        -------
+        callable
+            The limited job, taking the same `function` and `tenant` arguments.
+        """
+
+        def limited(function, tenant=None):
+            # the batch is taken when the job fires, before it waits for a slot
+            batch = current_batch()
+            queued_at = time.perf_counter()
+            with self.slot(league_id):
+                logger.debug("Running %s for league %s (%s)" % (function, league_id, self))
+                report = function if isinstance(function, str) else '+'.join(function)
+                with span('job', report=report, league=league_id) as running:
+                    running['wait_seconds'] = time.perf_counter() - queued_at
+                    return job(function, tenant, batch=batch)
+
+        limited.__name__ = getattr(job, '__name__', 'job')
+        return limited
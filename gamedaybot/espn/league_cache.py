@@ -0,0 +1,294 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from gamedaybot.utils.metrics import span
+
+logger = logging.getLogger(__name__)
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+class LeagueCache(object):
+    """
+    A wrapper around an espn_api League that memoizes box scores by week.
+
+    Every attribute that is not overridden here is looked up on the wrapped league, so a LeagueCache can be passed
+    anywhere a League is expected.
+
+    Parameters
+    ----------
+    league : espn_api.football.League
+        The league to wrap.
+    max_workers : int, optional
+        The maximum number of weeks fetched concurrently by `prefetch` (default is 4).
+    store : WeekStore, optional
+        A persistent store that completed weeks are read from before asking ESPN, and written to after.
+    tenant : dict, optional
+        The settings of the league when it is hosted from a tenants file rather than the environment.
+
+    Attributes
+    ----------
+    league : espn_api.football.League
+        The wrapped league.
+    hits : int
+        The number of box score requests answered from the cache, including requests that waited on a fetch already
+        in flight for the same week.
+    misses : int
+        The number of box score requests that were not in memory.
+    stored : int
+        The number of misses answered from the persistent store instead of ESPN.
+    """
+
+    def __init__(self, league, max_workers=4, store=None, tenant=None):
+        self.league = league
+        self.max_workers = max_workers
+        self.store = store
+        self.tenant = tenant
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self._box_scores = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        # only called for attributes not found on the wrapper itself
+        return getattr(self.league, name)
+
+    def __repr__(self):
+        return "LeagueCache(%s, hits=%d, misses=%d)" % (self.league, self.hits, self.misses)
+
+    def resolve_week(self, week=None):
+        """
+        Resolve a requested week the same way espn_api does, so that `None` and the current week share a cache entry.
+
+        Parameters
+        ----------
+        week : int, optional
+            The requested week.
+
+        Returns
+        -------
+        int
+            The scoring period espn_api would fetch for the requested week.
+        """
+
+        if week and week <= self.league.current_week:
+            return week
+        return self.league.current_week
+
+    def box_scores(self, week=None):
+        """
+        Returns the box scores for a given week, fetching them from ESPN at most once.
+
+        Parameters
+        ----------
+        week : int, optional
+            The week for which to retrieve the box scores (default is the current week).
+
+        Returns
+        -------
+        list
+            A list of espn_api BoxScore objects for the week.
+        """
+
+        week = self.resolve_week(week)
+        with self._lock:
+            if week in self._box_scores:
+                self.hits += 1
+                return self._box_scores[week]
+            pending = self._pending.get(week)
+            if pending is not None:
+                # another job is already fetching this week, wait for its result instead of asking ESPN again
+                self.hits += 1
+            else:
+                self.misses += 1
+                self._pending[week] = Future()
+
+        if pending is not None:
+            return pending.result()
+
+        try:
+            box_scores = self._fetch(week)
+        except Exception as e:
+            with self._lock:
+                pending = self._pending.pop(week)
+            pending.set_exception(e)
+            raise
+
+        with self._lock:
+            self._box_scores[week] = box_scores
+            pending = self._pending.pop(week)
+        pending.set_result(box_scores)
+        return box_scores
+
+    def _fetch(self, week):
+        with span('box_scores', league=self.league.league_id) as fetch:
+            fetch['week'] = week
+            box_scores = self.store.load(self.league, week) if self.store else None
+            if box_scores is not None:
+                fetch['source'] = 'store'
+                with self._lock:
+                    self.stored += 1
+                return box_scores
+
+            fetch['source'] = 'espn'
+            box_scores = self.league.box_scores(week=week)
+            if self.store:
+                self.store.save(self.league, week, box_scores)
+            return box_scores
+
+    def power_rankings(self, week=None):
+        """
+        Returns the league's power rankings for a week, timed.
+
+        Parameters
+        ----------
+        week : int, optional
+            The week for which to rank the teams (default is the current week).
+
+        Returns
+        -------
+        list
+            A list of (score, team) tuples, best first.
+        """
+
+        with span('power_rankings', league=self.league.league_id):
+            return self.league.power_rankings(week=week)
+
+    def recent_activity(self, *args, **kwargs):
+        """
+        Returns the league's recent activity, timed. Takes the same arguments as espn_api's `recent_activity`.
+
+        Returns
+        -------
+        list
+            A list of espn_api Activity objects.
+        """
+
+        with span('recent_activity', league=self.league.league_id):
+            return self.league.recent_activity(*args, **kwargs)
+
+    def prefetch(self, weeks, max_workers=None):
+        """
+        Fetches the box scores for several weeks concurrently and returns them in the order requested.
+
+        Weeks that are already cached are not fetched again.
+
+        Parameters
+        ----------
+        weeks : iterable of int
+            The weeks for which to retrieve the box scores.
+        max_workers : int, optional
+            The maximum number of concurrent requests (default is the wrapper's `max_workers`).
+
+        Returns
+        -------
+        list
+            A list with the box scores of each requested week, in the same order as `weeks`.
+        """
+
+        weeks = [self.resolve_week(week) for week in weeks]
+        with self._lock:
+            missing = sorted(set(week for week in weeks if week not in self._box_scores))
+
+        workers = min(max_workers or self.max_workers, len(missing))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(self.box_scores, missing))
+
+        return [self.box_scores(week) for week in weeks]
+
+    def cache_info(self):
+        """
+        Returns the cache statistics.
+
+        Returns
+        -------
+        dict
+            A dictionary with the number of hits, misses and store reads and the weeks currently cached.
+        """
+
+        return {'hits': self.hits, 'misses': self.misses, 'stored': self.stored, 'weeks': sorted(self._box_scores)}
+
+
+def cached_league(league, max_workers=4, store=None):
+    """
+    Wraps a league in a LeagueCache unless it is already wrapped.
+
+    Parameters
+    ----------
+    league : espn_api.football.League or LeagueCache
+        The league to wrap.
+    max_workers : int, optional
+        The maximum number of weeks a new wrapper fetches concurrently (default is 4).
+    store : WeekStore, optional
+        The persistent week store a new wrapper reads completed weeks from.
+
+    Returns
+    -------
+    LeagueCache
+        A caching wrapper around the league.
+    """
+
+    if isinstance(league, LeagueCache):
+        return league
+    return LeagueCache(league, max_workers, store)
+
+
+def shared_cache(league, batch, max_workers=4, store=None, tenant=None):
+    """
+    Returns the LeagueCache shared by every job of a league that was triggered in the same batch, creating it if needed.
+
+    Jobs that fire together, e.g. in the same minute, share one cache so each week of box scores is fetched from ESPN
+    once however many of them run in parallel. Caches from older batches are dropped.
+
+    Parameters
+    ----------
+    league : espn_api.football.League
+        The league to wrap.
+    batch : int
+        The batch the job belongs to, e.g. the minute it was triggered in.
+    max_workers : int, optional
+        The maximum number of weeks a new cache fetches concurrently (default is 4).
+    store : WeekStore, optional
+        The persistent week store a new cache reads completed weeks from.
+    tenant : dict, optional
+        The settings of the league when it is hosted from a tenants file.
+
+    Returns
+    -------
+    LeagueCache
+        The cache shared by the batch.
+    """
+
+    key = (league.league_id, league.year, id(tenant), batch)
+    with _shared_lock:
+        for stale in [k for k in _shared if k[3] < batch - 1]:
+            del _shared[stale]
+        cache = _shared.get(key)
+        if cache is None:
+            cache = LeagueCache(league, max_workers, store, tenant)
+            _shared[key] = cache
+        return cache
+
+
+def current_batch(interval=60):
+    """
+    Returns the batch that a job triggered now belongs to.
+
+    Parameters
+    ----------
+    interval : int, optional
+        The length of a batch in seconds (default is 60).
+
+    Returns
+    -------
+    int
+        The number of the current batch.
+    """
+
+    return int(time.time() // interval)
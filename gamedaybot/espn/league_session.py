@@ -0,0 +1,154 @@
+import logging
+import threading
+import time
+
+from espn_api.base_league import BaseLeague
+from espn_api.football import League
+from espn_api.football.settings import Settings
+from gamedaybot.espn.http_cache import use_http_cache
+from gamedaybot.utils.metrics import span
+
+logger = logging.getLogger(__name__)
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+class LeagueSession(object):
+    """
+    A process-wide handle on an espn_api League that is built once and replaced with a fresh copy when it goes stale.
+
+    A league handed out by `get` is never modified afterwards, so jobs and the live watcher still using it keep a
+    consistent view while a newer one is fetched.
+
+    Parameters
+    ----------
+    league_id : int
+        The id of the fantasy football league.
+    year : int
+        The year of the league.
+    espn_s2 : str, optional
+        The espn_s2 cookie for private leagues.
+    swid : str, optional
+        The SWID cookie for private leagues.
+    ttl : int, optional
+        The number of seconds after which the league data is considered stale (default is 300).
+    http_cache : HttpCache, optional
+        A cache that every request the league sends to ESPN goes through.
+
+    Attributes
+    ----------
+    league : espn_api.football.League
+        The shared league, or None until the first call to `get`.
+    refreshed_at : float
+        The monotonic time at which the league was last built or replaced.
+    """
+
+    def __init__(self, league_id, year, espn_s2=None, swid=None, ttl=300, http_cache=None):
+        self.league_id = league_id
+        self.year = year
+        self.espn_s2 = espn_s2
+        self.swid = swid
+        self.ttl = ttl
+        self.http_cache = http_cache
+        self.league = None
+        self.refreshed_at = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "LeagueSession(%s, %s)" % (self.league_id, self.year)
+
+    def is_stale(self):
+        return self.league is None or time.monotonic() - self.refreshed_at >= self.ttl
+
+    def get(self):
+        """
+        Returns the shared league, building it on first use and replacing it with a newly fetched one if it is older
+        than the ttl.
+
+        Returns
+        -------
+        espn_api.football.League
+            The shared league.
+        """
+
+        with self._lock:
+            if self.league is None:
+                logger.info("Building league %s (%s)" % (self.league_id, self.year))
+                with span('league_build', league=self.league_id):
+                    league = self._new_league()
+                    league.fetch_league()
+                self.league = league
+                self.refreshed_at = time.monotonic()
+            elif self.is_stale():
+                # only league status, settings and teams are fetched again, the player map and draft are carried over
+                logger.info("Refreshing league %s (%s)" % (self.league_id, self.year))
+                with span('league_refresh', league=self.league_id):
+                    self.league = self._refreshed(self.league)
+                self.refreshed_at = time.monotonic()
+            return self.league
+
+    def _new_league(self):
+        if self.espn_s2 and self.swid:
+            league = League(league_id=self.league_id, year=self.year, espn_s2=self.espn_s2, swid=self.swid,
+                            fetch_league=False)
+        else:
+            league = League(league_id=self.league_id, year=self.year, fetch_league=False)
+        # every request goes through our request class to be timed, and cached when a cache is set
+        use_http_cache(league, self.http_cache)
+        return league
+
+    def _refreshed(self, previous):
+        # League.refresh would rebuild the shared league's teams in place, and re-read its settings without the
+        # football fields such as position_slot_counts, so a new league is filled in instead
+        league = self._new_league()
+        data = BaseLeague._fetch_league(league, SettingsClass=Settings)
+        league.nfl_week = data["status"]["latestScoringPeriod"]
+        league.player_map = previous.player_map
+        league.draft = previous.draft
+        league._fetch_teams(data)
+        return league
+
+
+def get_league(league_id, year, espn_s2=None, swid=None, ttl=300, http_cache=None):
+    """
+    Returns the process-wide league for the given id and year, creating its session if needed.
+
+    Parameters
+    ----------
+    league_id : int
+        The id of the fantasy football league.
+    year : int
+        The year of the league.
+    espn_s2 : str, optional
+        The espn_s2 cookie for private leagues.
+    swid : str, optional
+        The SWID cookie for private leagues.
+    ttl : int, optional
+        The number of seconds after which the league data is refreshed (default is 300).
+    http_cache : HttpCache, optional
+        A cache that the requests of a newly created league go through.
+
+    Returns
+    -------
+    espn_api.football.League
+        The shared league.
+    """
+
+    key = (league_id, year, espn_s2, swid)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = LeagueSession(league_id, year, espn_s2, swid, ttl, http_cache)
+            _sessions[key] = session
+    session.ttl = ttl
+    return session.get()
+
+
+def clear_sessions():
+    """
+    Drops every shared league so that the next job rebuilds it from scratch.
+    """
+
+    with _sessions_lock:
+        _sessions.clear()
@@ -0,0 +1,292 @@
+import logging
+import threading
+from datetime import datetime, timedelta
+
+import gamedaybot.espn.env_vars as env_vars
+from gamedaybot.espn.functionality import (CLOSE_SCORE_MARGIN, all_played, get_projected_total, )
+from gamedaybot.espn.league_cache import LeagueCache
+
+logger = logging.getLogger(__name__)
+
+# espn_api marks a game as played three hours after kickoff
+GAME_LENGTH = timedelta(hours=3)
+
+
+def _starters(lineup):
+    return [i for i in lineup if i.slot_position != 'BE' and i.slot_position != 'IR']
+
+
+def _sign(value):
+    return (value > 0) - (value < 0)
+
+
+def game_window(box_scores, now=None):
+    """
+    Finds whether any starter's game is being played and when the next one kicks off.
+
+    Parameters
+    ----------
+    box_scores : list
+        The espn_api BoxScore objects of the week.
+    now : datetime, optional
+        The current time (default is now).
+
+    Returns
+    -------
+    tuple
+        A (live, next_kickoff) tuple. `live` is True if a starter's game is in progress and `next_kickoff` is the
+        datetime of the next starter's game that hasn't started, or None.
+    """
+
+    now = now or datetime.now()
+    live = False
+    next_kickoff = None
+    for i in box_scores:
+        for player in _starters(i.home_lineup) + (_starters(i.away_lineup) if i.away_team else []):
+            game_date = getattr(player, 'game_date', None)
+            if game_date is None:
+                continue
+            if game_date <= now < game_date + GAME_LENGTH:
+                live = True
+            elif game_date > now and (next_kickoff is None or game_date < next_kickoff):
+                next_kickoff = game_date
+    return live, next_kickoff
+
+
+def matchup_state(box_score, margin=CLOSE_SCORE_MARGIN):
+    """
+    Reduces a matchup to the few facts the live watcher reports on.
+
+    Parameters
+    ----------
+    box_score : espn_api.football.BoxScore
+        The matchup.
+    margin : float, optional
+        The projected margin at or under which a game is close, the same as `get_close_scores` uses.
+
+    Returns
+    -------
+    tuple
+        A (leader, close, final) tuple, where `leader` is 1 if the home team leads, -1 if the away team leads and 0 on
+        a tie, `close` is True if the projected scores are within `margin` with games left to play, and `final` is
+        True once every starter has played.
+    """
+
+    final = all_played(box_score.home_lineup) and all_played(box_score.away_lineup)
+    projected_diff = get_projected_total(box_score.away_lineup) - get_projected_total(box_score.home_lineup)
+    return (_sign(box_score.home_score - box_score.away_score), abs(projected_diff) <= margin and not final, final)
+
+
+class LiveWatcher(object):
+    """
+    Watches a week's matchups while games are being played and reports only the changes that matter.
+
+    Each poll reduces every matchup to a small state tuple and compares its hash with the previous poll, so matchups
+    that didn't change are skipped without rendering anything. A lead change, a matchup becoming projected close and a
+    matchup going final are reported.
+
+    Parameters
+    ----------
+    league : espn_api.football.League
+        The league to watch. Box scores are read from it on every poll, so it should not be a LeagueCache.
+    send : callable
+        Called with the text of each update.
+    emotes : list, optional
+        The emote of each team, indexed by team id, as returned by `env_vars.split_emotes`.
+    live_interval : int, optional
+        The number of seconds between polls while a game is in progress (default is 60).
+    idle_interval : int, optional
+        The longest number of seconds between polls while no game is in progress (default is 900).
+    max_idle : int, optional
+        The watcher stops once the next game is more than this many seconds away (default is 6 hours).
+    margin : float, optional
+        The projected margin at or under which a game is close (default is the `get_close_scores` margin).
+    max_failures : int, optional
+        The watcher stops after this many polls in a row fail (default is 10).
+
+    Attributes
+    ----------
+    polls : int
+        The number of times box scores were fetched.
+    updates : int
+        The number of updates sent.
+    """
+
+    def __init__(self, league, send, emotes=None, live_interval=60, idle_interval=900, max_idle=6 * 60 * 60,
+                 margin=CLOSE_SCORE_MARGIN, max_failures=10):
+        self.league = league
+        self.send = send
+        self.emotes = emotes
+        self.live_interval = live_interval
+        self.idle_interval = idle_interval
+        self.max_idle = max_idle
+        self.margin = margin
+        self.max_failures = max_failures
+        self.polls = 0
+        self.updates = 0
+        self._hashes = {}
+        self._states = {}
+        self._leaders = {}
+        self._stop = threading.Event()
+
+    def __repr__(self):
+        return "LiveWatcher(%s, polls=%d, updates=%d)" % (self.league, self.polls, self.updates)
+
+    def _emote(self, team):
+        if not self.emotes:
+            return ''
+        return self.emotes[team.team_id]
+
+    def _score(self, box_score):
+        return '%s`%4s %6.2f - %6.2f %4s`%s' % (self._emote(box_score.home_team), box_score.home_team.team_abbrev,
+                                                box_score.home_score, box_score.away_score,
+                                                box_score.away_team.team_abbrev, self._emote(box_score.away_team))
+
+    def changes(self, box_scores):
+        """
+        Compares the matchups with the previous call and returns a line for each meaningful change.
+
+        The first call only records the matchups and reports nothing.
+
+        Parameters
+        ----------
+        box_scores : list
+            The espn_api BoxScore objects of the week.
+
+        Returns
+        -------
+        list of str
+            A line for each lead change, newly close game and final score.
+        """
+
+        first = not self._hashes
+        lines = []
+        for i in box_scores:
+            if not i.away_team:
+                continue
+            key = (i.home_team.team_id, i.away_team.team_id)
+            state = matchup_state(i, self.margin)
+            state_hash = hash(state)
+            if self._hashes.get(key) == state_hash:
+                continue
+            previous = self._states.get(key)
+            # a lead change is measured against the last team to lead, so a tie in between doesn't hide it
+            last_leader = self._leaders.get(key, 0)
+            self._hashes[key] = state_hash
+            self._states[key] = state
+            leader, close, final = state
+            if leader:
+                self._leaders[key] = leader
+            if first or previous is None:
+                continue
+
+            if final and not previous[2]:
+                lines.append('Final: ' + self._score(i))
+            elif leader * last_leader < 0:
+                lines.append('Lead change: ' + self._score(i))
+            elif close and not previous[1]:
+                lines.append('Close game: ' + self._score(i))
+        return lines
+
+    def next_interval(self, box_scores, now=None):
+        """
+        Returns how long to wait before the next poll: short while a game is in progress, until the next kickoff
+        otherwise.
+
+        Parameters
+        ----------
+        box_scores : list
+            The espn_api BoxScore objects of the week.
+        now : datetime, optional
+            The current time (default is now).
+
+        Returns
+        -------
+        float or None
+            The number of seconds to wait, or None once there are no more games to watch.
+        """
+
+        now = now or datetime.now()
+        live, next_kickoff = game_window(box_scores, now)
+        if live:
+            return self.live_interval
+        if next_kickoff is None:
+            return None
+        wait = (next_kickoff - now).total_seconds()
+        if wait > self.max_idle:
+            return None
+        return max(min(wait, self.idle_interval), self.live_interval)
+
+    def poll(self):
+        """
+        Fetches the current box scores and sends an update if anything meaningful changed.
+
+        Returns
+        -------
+        float or None
+            The number of seconds until the next poll, or None once there are no more games to watch.
+        """
+
+        box_scores = self.league.box_scores()
+        self.polls += 1
+        lines = self.changes(box_scores)
+        if lines:
+            self.updates += 1
+            self.send('\n'.join(['__**Live Score Update**__'] + lines))
+        return self.next_interval(box_scores)
+
+    def run(self):
+        """
+        Polls until no game is in progress or coming up, until `max_failures` polls in a row fail, or until `stop` is
+        called.
+        """
+
+        failures = 0
+        while not self._stop.is_set():
+            try:
+                interval = self.poll()
+                failures = 0
+            except Exception:
+                logger.exception("Live score poll failed")
+                failures += 1
+                interval = self.live_interval if failures < self.max_failures else None
+            if interval is None:
+                break
+            logger.debug("Next live score poll in %ds" % interval)
+            self._stop.wait(interval)
+        logger.info("Live scores done after %d polls and %d updates" % (self.polls, self.updates))
+
+    def stop(self):
+        """
+        Stops a running watcher after its current poll.
+        """
+
+        self._stop.set()
+
+
+def watch_live_scores(league, send, **kwargs):
+    """
+    Watches a league's matchups until the current games are over, sending an update whenever something changes.
+
+    Parameters
+    ----------
+    league : LeagueCache or espn_api.football.League
+        The league to watch. When it is a LeagueCache, the watcher polls the wrapped league so that every poll gets
+        fresh scores.
+    send : callable
+        Called with the text of each update.
+    **kwargs
+        Passed on to LiveWatcher.
+
+    Returns
+    -------
+    LiveWatcher
+        The watcher, once it has finished.
+    """
+
+    emotes = env_vars.split_emotes(league)
+    if isinstance(league, LeagueCache):
+        league = league.league
+    watcher = LiveWatcher(league, send, emotes=emotes, **kwargs)
+    watcher.run()
+    return watcher
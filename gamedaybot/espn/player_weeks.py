@@ -0,0 +1,403 @@
+import threading
+from itertools import accumulate
+
+from gamedaybot.espn.league_cache import cached_league
+from gamedaybot.espn.week_store import is_final_week
+
+# the keys an MVP has to beat and an LVP has to undercut, as (diff ratio, points over projection)
+MVP_START = (-100, -100)
+LVP_START = (999, 999)
+
+_tables = {}
+_tables_lock = threading.Lock()
+
+
+def best_and_worst(keys, mvp_rows, lvp_rows):
+    """
+    Picks the best and worst of a sequence of performances the way a running MVP/LVP scan does.
+
+    A performance that beats the best one so far goes to the MVP side and is never the LVP, even if later ones beat
+    it. Only the MVP side is updated by performances in `mvp_rows`, and only performances in `lvp_rows` can be the LVP.
+    Ties go to the earlier performance.
+
+    Parameters
+    ----------
+    keys : list of tuple
+        The (diff ratio, points over projection) of each performance, in scan order.
+    mvp_rows : list of bool
+        Whether each performance can be the MVP.
+    lvp_rows : list of bool
+        Whether each performance can be the LVP.
+
+    Returns
+    -------
+    tuple
+        The index of the MVP and of the LVP, either of which is None if no performance qualified.
+    """
+
+    counted = [key if mvp else MVP_START for key, mvp in zip(keys, mvp_rows)]
+    best_before = accumulate(counted, max, initial=MVP_START)
+    claimed = [key > best for key, best in zip(keys, best_before)]
+
+    mvp = max((k for k in range(len(keys)) if claimed[k] and mvp_rows[k]), key=keys.__getitem__, default=None)
+    lvp = min((k for k in range(len(keys)) if not claimed[k] and lvp_rows[k] and keys[k] < LVP_START),
+              key=keys.__getitem__, default=None)
+    return mvp, lvp
+
+
+class PlayerWeeks(object):
+    """
+    Every lineup entry of a range of weeks, stored column by column with one row per player per week.
+
+    Queries are answered from whole columns rather than by walking box scores lineup by lineup.
+
+    Attributes
+    ----------
+    week, team, player_id, name, position, slot, points, projected : list
+        One column per attribute, each with one value per row. `team` holds the team objects.
+    """
+
+    COLUMNS = ['week', 'team', 'player_id', 'name', 'position', 'slot', 'points', 'projected']
+
+    def __init__(self):
+        for column in self.COLUMNS:
+            setattr(self, column, [])
+
+    def __repr__(self):
+        return "PlayerWeeks(%d rows, weeks %s)" % (len(self), sorted(set(self.week)))
+
+    def __len__(self):
+        return len(self.week)
+
+    @classmethod
+    def from_box_scores(cls, weeks, weekly_box_scores):
+        """
+        Builds a table from the box scores of each week.
+
+        Parameters
+        ----------
+        weeks : list of int
+            The weeks matching `weekly_box_scores`.
+        weekly_box_scores : list of list
+            The box scores of each week.
+
+        Returns
+        -------
+        PlayerWeeks
+            The filled table.
+        """
+
+        table = cls()
+        for week, box_scores in zip(weeks, weekly_box_scores):
+            table.add_week(week, box_scores)
+        return table
+
+    def add(self, week, team, player):
+        """
+        Adds one lineup entry.
+
+        Parameters
+        ----------
+        week : int
+            The week the entry belongs to.
+        team : object
+            The team whose lineup the player was in.
+        player : object
+            The lineup entry, e.g. an espn_api BoxPlayer.
+        """
+
+        self.week.append(week)
+        self.team.append(team)
+        self.player_id.append(getattr(player, 'playerId', player.name))
+        self.name.append(player.name)
+        self.position.append(player.position)
+        self.slot.append(player.slot_position)
+        self.points.append(player.points)
+        self.projected.append(player.projected_points)
+
+    def add_week(self, week, box_scores):
+        """
+        Adds every lineup entry of a week, home lineup before away lineup for each matchup.
+
+        Parameters
+        ----------
+        week : int
+            The week of the box scores.
+        box_scores : list
+            The week's box scores.
+        """
+
+        for i in box_scores:
+            for team, lineup in ((i.home_team, i.home_lineup), (i.away_team, i.away_lineup)):
+                if team:
+                    for player in lineup:
+                        self.add(week, team, player)
+
+    def copy(self):
+        table = PlayerWeeks()
+        for column in self.COLUMNS:
+            setattr(table, column, list(getattr(self, column)))
+        return table
+
+    def row(self, k):
+        """
+        Returns one row as a dictionary of column values.
+
+        Parameters
+        ----------
+        k : int
+            The index of the row.
+
+        Returns
+        -------
+        dict
+            The row's value in each column.
+        """
+
+        return {column: getattr(self, column)[k] for column in self.COLUMNS}
+
+    def starters(self, weeks=None):
+        """
+        Returns which rows are starters, optionally limited to some weeks.
+
+        Parameters
+        ----------
+        weeks : list of int, optional
+            The weeks to include (default is every week in the table).
+
+        Returns
+        -------
+        list of bool
+            Whether each row was in a starting slot during one of the weeks.
+        """
+
+        weeks = None if weeks is None else set(weeks)
+        return [slot != 'BE' and slot != 'IR' and (weeks is None or week in weeks)
+                for slot, week in zip(self.slot, self.week)]
+
+    def performances(self, weeks=None, min_projected=0, exclude_worst=()):
+        """
+        Returns the best and worst starting performances against projection, by (points - projected) / projected.
+
+        D/ST and players projected for no points are left out, and ties go to the larger points over projection.
+
+        Parameters
+        ----------
+        weeks : list of int, optional
+            The weeks to include (default is every week in the table).
+        min_projected : float, optional
+            The projection a player needs to be the best performance (default is 0).
+        exclude_worst : tuple of str, optional
+            The positions that cannot be the worst performance, e.g. ('K',).
+
+        Returns
+        -------
+        tuple
+            The rows of the best and worst performances, as returned by `row`, each with its `ratio` added. Either is
+            None if no performance qualified.
+        """
+
+        columns = zip(self.starters(weeks), self.position, self.projected)
+        rows = [k for k, (starter, position, projected) in enumerate(columns)
+                if starter and position != 'D/ST' and projected > 0]
+        keys = [((self.points[k] - self.projected[k]) / self.projected[k], self.points[k] - self.projected[k])
+                for k in rows]
+        mvp, lvp = best_and_worst(keys, [self.projected[k] > min_projected for k in rows],
+                                  [self.position[k] not in exclude_worst for k in rows])
+        return tuple(None if index is None else dict(self.row(rows[index]), ratio=keys[index][0])
+                     for index in (mvp, lvp))
+
+    def season_totals(self, weeks=None):
+        """
+        Sums every player's starting points and projections for each team they started for.
+
+        Parameters
+        ----------
+        weeks : list of int, optional
+            The weeks to include (default is every week in the table).
+
+        Returns
+        -------
+        list of dict
+            One entry per player and team, in order of first start, with the player's `name`, `position`, `team`,
+            `points`, `projected` and number of `starts`.
+        """
+
+        totals = {}
+        for k, starter in enumerate(self.starters(weeks)):
+            if not starter:
+                continue
+            key = (self.player_id[k], getattr(self.team[k], 'team_id', self.team[k]))
+            total = totals.get(key)
+            if total is None:
+                totals[key] = {'name': self.name[k], 'position': self.position[k], 'team': self.team[k],
+                               'points': self.points[k], 'projected': self.projected[k], 'starts': 1}
+            else:
+                total['points'] += self.points[k]
+                total['projected'] += self.projected[k]
+                total['starts'] += 1
+        return list(totals.values())
+
+    def season_performances(self, weeks=None):
+        """
+        Returns the season's most and least valuable players, by their summed starting points against projection.
+
+        Parameters
+        ----------
+        weeks : list of int, optional
+            The weeks to include (default is every week in the table).
+
+        Returns
+        -------
+        tuple
+            The totals of the season MVP and LVP, as returned by `season_totals`, each with its `ratio` added. Either
+            is None if no player qualified.
+        """
+
+        totals = [total for total in self.season_totals(weeks) if total['projected'] > 0 and
+                  total['position'] != 'D/ST']
+        keys = [((total['points'] - total['projected']) / total['projected'], total['points'] - total['projected'])
+                for total in totals]
+        mvp, lvp = best_and_worst(keys, [True] * len(keys), [True] * len(keys))
+        return tuple(None if index is None else dict(totals[index], ratio=keys[index][0]) for index in (mvp, lvp))
+
+    def projection_bias(self, weeks=None, by='position'):
+        """
+        Measures how far projections missed for starters, grouped by a column.
+
+        Parameters
+        ----------
+        weeks : list of int, optional
+            The weeks to include (default is every week in the table).
+        by : str, optional
+            The column to group by, e.g. "position", "team" or "week" (default is "position").
+
+        Returns
+        -------
+        dict
+            For each group, the number of `starts`, the total `points` and `projected` points, the average `bias` in
+            points per start (positive when projections were too low) and the `ratio` of points to projected points.
+        """
+
+        groups = {}
+        for group, starter, points, projected in zip(getattr(self, by), self.starters(weeks), self.points,
+                                                     self.projected):
+            if starter:
+                totals = groups.setdefault(group, [0, 0, 0])
+                totals[0] += 1
+                totals[1] += points
+                totals[2] += projected
+        return {group: {'starts': starts, 'points': points, 'projected': projected,
+                        'bias': (points - projected) / starts, 'ratio': points / projected if projected else None}
+                for group, (starts, points, projected) in groups.items()}
+
+    def best_weeks(self, count=1, weeks=None, position=None):
+        """
+        Returns the highest scoring starting weeks by any player.
+
+        Parameters
+        ----------
+        count : int, optional
+            The number of weeks to return (default is 1).
+        weeks : list of int, optional
+            The weeks to include (default is every week in the table).
+        position : str, optional
+            Only include players of this position.
+
+        Returns
+        -------
+        list of dict
+            The rows of the best weeks, highest first, as returned by `row`.
+        """
+
+        rows = [k for k, starter in enumerate(self.starters(weeks))
+                if starter and (position is None or self.position[k] == position)]
+        rows.sort(key=self.points.__getitem__, reverse=True)
+        return [self.row(k) for k in rows[:count]]
+
+
+class PlayerWeekTable(object):
+    """
+    The player-week table of one league season, with finished weeks folded in once and kept.
+
+    Parameters
+    ----------
+    league_id : int
+        The id of the fantasy football league.
+    year : int
+        The year of the league.
+
+    Attributes
+    ----------
+    folded : PlayerWeeks
+        The rows of every folded week.
+    folded_week : int
+        The last week folded in.
+    """
+
+    def __init__(self, league_id, year):
+        self.league_id = league_id
+        self.year = year
+        self.folded = PlayerWeeks()
+        self.folded_week = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "PlayerWeekTable(%s, %s, through week %d)" % (self.league_id, self.year, self.folded_week)
+
+    def through(self, league, week):
+        """
+        Returns the table of every week up to a given week.
+
+        Only weeks that have not been folded in yet are fetched. Weeks that are still open to stat corrections are
+        added on every call but never folded in.
+
+        Parameters
+        ----------
+        league : espn_api.football.League
+            The league the table belongs to.
+        week : int
+            The last week to include.
+
+        Returns
+        -------
+        PlayerWeeks
+            A copy of the table, which the caller may modify. Rows after `week` are included if they were folded in
+            before; limit queries with `weeks`.
+        """
+
+        league = cached_league(league)
+        with self._lock:
+            new_weeks = range(self.folded_week + 1, week + 1)
+            if not new_weeks:
+                return self.folded.copy()
+
+            table = self.folded.copy()
+            for w, box_scores in zip(new_weeks, league.prefetch(new_weeks)):
+                table.add_week(w, box_scores)
+                if w == self.folded_week + 1 and is_final_week(league, w):
+                    self.folded.add_week(w, box_scores)
+                    self.folded_week = w
+        return table
+
+
+def get_player_weeks(league):
+    """
+    Returns the process-wide player-week table for a league season.
+
+    Parameters
+    ----------
+    league : espn_api.football.League
+        The league for which to return the table.
+
+    Returns
+    -------
+    PlayerWeekTable
+        The league season's player-week table.
+    """
+
+    key = (league.league_id, league.year)
+    with _tables_lock:
+        if key not in _tables:
+            _tables[key] = PlayerWeekTable(league.league_id, league.year)
+        return _tables[key]
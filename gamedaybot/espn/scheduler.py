@@ -1,32 +1,95 @@
 import logging
 from datetime import datetime
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.schedulers.blocking import BlockingScheduler
-from gamedaybot.espn.env_vars import get_env_vars
+from gamedaybot.espn.env_vars import get_scheduler_vars, get_settings
 from gamedaybot.espn.espn_bot import espn_bot
+from gamedaybot.espn.job_limits import JobLimiter
+from gamedaybot.utils.metrics import enable_json_logs, serve_metrics
 
 
-def scheduler():
+def scheduler(tenants=None):
     """
     This function is used to schedule jobs to send messages.
 
     Parameters
     ----------
+    tenants : list of Settings, optional
+        The settings of every league to schedule, as loaded from a tenants file. If not provided, a single league is
+        scheduled from the environment.
+
+    Returns
+    -------
     None
 
+    Notes
+    -----
+    Jobs run on a pool of JOB_WORKERS threads (default 10). At most MAX_CONCURRENT_JOBS jobs (default 4) run at the
+    same time, and at most MAX_LEAGUE_JOBS (default 2) for any one league. Jobs of a league that fire in the same
+    minute share their ESPN fetches, so they can run in parallel. With LIVE_SCORES, each league's score watcher runs for
+    hours, so it runs on a pool of its own, outside those limits.
+
+    With METRICS_LOG set, the timing of every job, ESPN request and webhook post is logged as a JSON line, and with
+    METRICS_PORT set the totals are served for Prometheus at /metrics on that port.
+    """
+    settings = get_scheduler_vars()
+    if settings['metrics_log']:
+        enable_json_logs()
+    if settings['metrics_port']:
+        serve_metrics(settings['metrics_port'])
+    data = get_settings() if tenants is None else None
+    # one live score watcher runs at a time per league
+    live_workers = sum(1 for league in (tenants or [data]) if league['live_scores'])
+    sched = BlockingScheduler(executors={'default': ThreadPoolExecutor(settings['job_workers']),
+                                         'live': ThreadPoolExecutor(max(live_workers, 1))},
+                              job_defaults={'misfire_grace_time': 15 * 60, 'coalesce': True})
+    limiter = JobLimiter(settings['max_concurrent_jobs'], settings['max_league_jobs'])
+
+    if tenants is None:
+        add_jobs(sched, data, limiter=limiter, live_executor='live')
+    else:
+        for n, tenant in enumerate(tenants):
+            add_jobs(sched, tenant, tenant=tenant, prefix='%s-%d-' % (tenant['league_id'], n), limiter=limiter,
+                     live_executor='live')
+
+    sched.start()
+
+
+def add_jobs(sched, data, tenant=None, prefix='', limiter=None, live_executor='default'):
+    """
+    Adds the jobs of one league to a scheduler.
+
+    Parameters
+    ----------
+    sched : apscheduler.schedulers.base.BaseScheduler
+        The scheduler to add the jobs to.
+    data : Settings
+        The settings of the league.
+    tenant : Settings, optional
+        The settings passed to each job when the league is hosted from a tenants file.
+    prefix : str, optional
+        A prefix for the job ids, to keep the jobs of different leagues apart.
+    limiter : JobLimiter, optional
+        The concurrency limits the jobs run within. If not provided, the jobs run unlimited.
+    live_executor : str, optional
+        The executor the live score watchers run on. They run outside the limits, as each one lasts until the games
+        are over (default is 'default').
+
     Returns
     -------
     None
     """
-    data = get_env_vars()
     game_timezone = 'America/New_York'
-    sched = BlockingScheduler(job_defaults={'misfire_grace_time': 15 * 60})
     ff_start_date = data['ff_start_date']
     ff_end_date = data['ff_end_date']
     end_date = datetime.strptime(ff_end_date, "%Y-%m-%d").date()
     my_timezone = data['my_timezone']
     ready_text = "Ready!"
+    job = espn_bot if limiter is None else limiter.wrap(espn_bot, data['league_id'])
 
     #game day score update:              sunday at 4pm, 8pm east coast time.
+    #live scores (LIVE_SCORES):          instead of the game day score update, sunday from 1pm and monday and
+    #                                    thursday from 8:15pm east coast time until the games are over.
     #final scores and trophies:          tuesday morning at 7:30am local time.
     #standings, PR, PO%, SR:             tuesday evening at 6:30pm local time.
     #matchups & projections:             thursday evening at 6:30pm east coast time.
@@ -37,60 +100,61 @@ def scheduler():
     #waiver report:                      wed-sun morning at 7:30am local time.
     #season end trophies:                on the End Date provided at 7:30am local time.
 
-    sched.add_job(espn_bot, 'cron', ['get_scoreboard_short'], id='scoreboard2',
-        day_of_week='sun', hour='16,20', start_date=ff_start_date, end_date=ff_end_date,
-        timezone=game_timezone, replace_existing=True)
+    if data['live_scores']:
+        # watch the scores while games are played instead of posting fixed-time snapshots, without holding a slot
+        # the other jobs need for the hours the games last
+        sched.add_job(espn_bot, 'cron', ['live_scores', tenant], id=prefix + 'live_scores_sun',
+            day_of_week='sun', hour=13, start_date=ff_start_date, end_date=ff_end_date,
+            timezone=game_timezone, executor=live_executor, replace_existing=True)
+
+        sched.add_job(espn_bot, 'cron', ['live_scores', tenant], id=prefix + 'live_scores',
+            day_of_week='mon,thu', hour=20, minute=15, start_date=ff_start_date, end_date=ff_end_date,
+            timezone=game_timezone, executor=live_executor, replace_existing=True)
+    else:
+        sched.add_job(job, 'cron', ['get_scoreboard_short', tenant], id=prefix + 'scoreboard2',
+            day_of_week='sun', hour='16,20', start_date=ff_start_date, end_date=ff_end_date,
+            timezone=game_timezone, replace_existing=True)
     
-    sched.add_job(espn_bot, 'cron', ['get_final'], id='final',
+    sched.add_job(job, 'cron', ['get_final', tenant], id=prefix + 'final',
         day_of_week='tue', hour=7, minute=30, start_date=ff_start_date, end_date=ff_end_date,
         timezone=my_timezone, replace_existing=True)
 
-    sched.add_job(espn_bot, 'cron', ['get_standings'], id='standings',
+    # reports that go out at the same time run as one job and are sent as one batched message
+    sched.add_job(job, 'cron', [['get_standings', 'get_optimal_scores', 'get_power_rankings'], tenant],
+        id=prefix + 'standings',
         day_of_week='tue', hour=18, minute=30, start_date=ff_start_date, end_date=ff_end_date,
         timezone=my_timezone, replace_existing=True)
 
-    sched.add_job(espn_bot, 'cron', ['get_optimal_scores'], id='optimal_scores',
-        day_of_week='tue', hour=18, minute=30, second=5, start_date=ff_start_date, end_date=ff_end_date,
-        timezone=my_timezone, replace_existing=True)
-
-    sched.add_job(espn_bot, 'cron', ['get_power_rankings'], id='power_rankings',
-        day_of_week='tue', hour=18, minute=30, second=10, start_date=ff_start_date, end_date=ff_end_date,
-        timezone=my_timezone, replace_existing=True)
-
-    sched.add_job(espn_bot, 'cron', ['get_matchups'], id='matchups',
+    sched.add_job(job, 'cron', [['get_matchups', 'get_projected_scoreboard'], tenant], id=prefix + 'matchups',
         day_of_week='thu', hour=18, minute=30, start_date=ff_start_date, end_date=ff_end_date,
         timezone=game_timezone, replace_existing=True)
 
-    sched.add_job(espn_bot, 'cron', ['get_projected_scoreboard'], id='proj_scoreboard',
-        day_of_week='thu', hour=18, minute=30, second=3, start_date=ff_start_date, end_date=ff_end_date,
-        timezone=game_timezone, replace_existing=True)
-
-    sched.add_job(espn_bot, 'cron', ['get_monitor'], id='_monitor',
+    sched.add_job(job, 'cron', ['get_monitor', tenant], id=prefix + '_monitor',
         day_of_week='fri', hour=18, minute=30, start_date=ff_start_date, end_date=ff_end_date,
         timezone=my_timezone, replace_existing=True)
 
-    sched.add_job(espn_bot, 'cron', ['get_inactives'], id='inactives',
+    sched.add_job(job, 'cron', ['get_inactives', tenant], id=prefix + 'inactives',
         day_of_week='sun', hour=12, minute=5, start_date=ff_start_date, end_date=ff_end_date,
         timezone=game_timezone, replace_existing=True)
 
-    sched.add_job(espn_bot, 'cron', ['get_scoreboard_short'], id='scoreboard1',
+    sched.add_job(job, 'cron', ['get_scoreboard_short', tenant], id=prefix + 'scoreboard1',
         day_of_week='fri,mon', hour=7, minute=30, start_date=ff_start_date, end_date=ff_end_date,
         timezone=my_timezone, replace_existing=True)
 
-    sched.add_job(espn_bot, 'cron', ['get_close_scores'], id='close_scores',
+    sched.add_job(job, 'cron', ['get_close_scores', tenant], id=prefix + 'close_scores',
         day_of_week='sun,mon', hour=18, minute=30, start_date=ff_start_date, end_date=ff_end_date,
         timezone=game_timezone, replace_existing=True)
     
-    sched.add_job(espn_bot, 'cron', ['get_waiver_report'], id='waiver_report',
+    sched.add_job(job, 'cron', ['get_waiver_report', tenant], id=prefix + 'waiver_report',
             day_of_week='wed', hour=7, minute=31, start_date=ff_start_date, end_date=ff_end_date,
             timezone=my_timezone, replace_existing=True)  
 
     if data['daily_waiver']:
-        sched.add_job(espn_bot, 'cron', ['get_waiver_report'], id='daily_waiver',
+        sched.add_job(job, 'cron', ['get_waiver_report', tenant], id=prefix + 'daily_waiver',
             day_of_week='mon,tue,thu,fri,sat,sun', hour=7, minute=31, start_date=ff_start_date, end_date=ff_end_date,
             timezone=my_timezone, replace_existing=True)        
 
-    sched.add_job(espn_bot, 'date', ['season_trophies'], id='season_trophies',
+    sched.add_job(job, 'date', ['season_trophies', tenant], id=prefix + 'season_trophies',
         run_date=datetime(end_date.year, end_date.month, end_date.day, 7, 30), 
         timezone=my_timezone, replace_existing=True)
 
@@ -100,6 +164,6 @@ def scheduler():
     except KeyError:
         ready_text += " SWID and ESPN_S2 not provided."
 
+    ready_text = "%s League %s." % (ready_text, data['league_id'])
     print(ready_text)
     logging.info(ready_text)
-    sched.start()
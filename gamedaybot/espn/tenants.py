@@ -0,0 +1,33 @@
+import json
+from gamedaybot.espn.env_vars import get_env_vars
+
+
+def load_tenants(path):
+    """
+    Loads the settings of every league hosted by this process from a tenants file.
+
+    The file is a JSON object with an optional "defaults" object and a "leagues" list. Each league and the defaults use
+    the same names as the environment variables (LEAGUE_ID, DISCORD_WEBHOOK_URL, EMOTES, TIMEZONE, ...), and a league's
+    values take precedence over the defaults.
+
+    Parameters
+    ----------
+    path : str
+        The path of the tenants file.
+
+    Returns
+    -------
+    list of Settings
+        The settings of each league, parsed and validated as by `get_env_vars`.
+    """
+
+    with open(path) as f:
+        config = json.load(f)
+
+    defaults = config.get('defaults', {})
+    tenants = []
+    for league in config['leagues']:
+        environ = {key: str(value) for key, value in {**defaults, **league}.items()}
+        tenants.append(get_env_vars(environ))
+
+    return tenants
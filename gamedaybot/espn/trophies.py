@@ -0,0 +1,317 @@
+from gamedaybot.espn.player_weeks import PlayerWeeks
+
+
+class Trophy(object):
+    """
+    A weekly trophy, declared as a reducer over the week's records.
+
+    A trophy overrides any of `matchup`, `team` and `player` to fold the records it needs into its own state, and
+    `lines` to render the result. The engine only calls the hooks a trophy overrides.
+    """
+
+    def matchup(self, box_score):
+        """Folds in a matchup between two teams. Byes are not passed."""
+
+    def team(self, team, score, projected):
+        """Folds in one team's score for the week."""
+
+    def player(self, team, player):
+        """Folds in one player from a team's lineup."""
+
+    def lines(self, emotes):
+        """
+        Renders the trophy.
+
+        Parameters
+        ----------
+        emotes : list
+            The emote of each team, indexed by team id.
+
+        Returns
+        -------
+        list of str
+            The trophy's lines, or an empty list if it has nothing to award.
+        """
+
+        return []
+
+
+class TrophyEngine(object):
+    """
+    Evaluates a set of trophies in one pass over a week's box scores.
+
+    Each matchup, each team score and each lineup player is visited once and handed to every trophy that declares a
+    hook for it.
+
+    Parameters
+    ----------
+    trophies : list of Trophy
+        The trophies to evaluate, in the order they are rendered.
+    """
+
+    def __init__(self, trophies):
+        self.trophies = trophies
+        self._matchup = self._hooks('matchup')
+        self._team = self._hooks('team')
+        self._player = self._hooks('player')
+
+    def __repr__(self):
+        return "TrophyEngine(%s)" % ', '.join(type(trophy).__name__ for trophy in self.trophies)
+
+    def _hooks(self, name):
+        # skip the hooks a trophy inherits without overriding
+        return [getattr(trophy, name) for trophy in self.trophies
+                if getattr(type(trophy), name) is not getattr(Trophy, name)]
+
+    def run(self, box_scores):
+        """
+        Folds a week's box scores into every trophy.
+
+        Parameters
+        ----------
+        box_scores : list
+            The espn_api BoxScore objects of the week.
+
+        Returns
+        -------
+        TrophyEngine
+            The engine, to render with `lines`.
+        """
+
+        for i in box_scores:
+            if i.home_team and i.away_team:
+                for hook in self._matchup:
+                    hook(i)
+            for team, score, projected, lineup in ((i.home_team, i.home_score, i.home_projected, i.home_lineup),
+                                                   (i.away_team, i.away_score, i.away_projected, i.away_lineup)):
+                if not team:
+                    continue
+                for hook in self._team:
+                    hook(team, score, projected)
+                if self._player:
+                    for player in lineup:
+                        for hook in self._player:
+                            hook(team, player)
+        return self
+
+    def lines(self, emotes):
+        """
+        Renders every trophy, in order.
+
+        Parameters
+        ----------
+        emotes : list
+            The emote of each team, indexed by team id.
+
+        Returns
+        -------
+        list of str
+            The lines of every trophy.
+        """
+
+        lines = []
+        for trophy in self.trophies:
+            lines += trophy.lines(emotes)
+        return lines
+
+
+class HighScoreTrophy(Trophy):
+    def __init__(self):
+        self.score = -1
+        self.high_team = None
+
+    def team(self, team, score, projected):
+        if score > self.score:
+            self.score = score
+            self.high_team = team
+
+    def lines(self, emotes):
+        return ['👑 `Highest score:` %s \n- **%s** with %.2f points' % (emotes[self.high_team.team_id],
+                                                                       self.high_team.team_name, self.score)]
+
+
+class LowScoreTrophy(Trophy):
+    def __init__(self):
+        self.score = 9999
+        self.low_team = None
+
+    def team(self, team, score, projected):
+        if score < self.score:
+            self.score = score
+            self.low_team = team
+
+    def lines(self, emotes):
+        return ['💩 `Lowest score:` %s \n- **%s** with %.2f points' % (emotes[self.low_team.team_id],
+                                                                      self.low_team.team_name, self.score)]
+
+
+class ClosestWinTrophy(Trophy):
+    def __init__(self):
+        self.margin = 9999
+        self.winner = None
+        self.loser = None
+
+    def matchup(self, box_score):
+        diff = box_score.away_score - box_score.home_score
+        if diff != 0 and abs(diff) < self.margin:
+            self.margin = abs(diff)
+            if diff < 0:
+                self.winner, self.loser = box_score.home_team, box_score.away_team
+            else:
+                self.winner, self.loser = box_score.away_team, box_score.home_team
+
+    def lines(self, emotes):
+        close_emotes = ''
+        if emotes[1]:
+            close_emotes = '%s> %s' % (emotes[self.winner.team_id], emotes[self.loser.team_id])
+        return ['🧊 `Closest Win:` %s \n- **%s** barely beat **%s** by a margin of %.2f' % (
+            close_emotes, self.winner.team_name, self.loser.team_name, self.margin)]
+
+
+class BiggestLossTrophy(Trophy):
+    def __init__(self):
+        self.margin = -1
+        self.winner = None
+        self.loser = None
+
+    def matchup(self, box_score):
+        diff = box_score.away_score - box_score.home_score
+        if abs(diff) > self.margin:
+            self.margin = abs(diff)
+            if diff < 0:
+                self.winner, self.loser = box_score.home_team, box_score.away_team
+            else:
+                self.winner, self.loser = box_score.away_team, box_score.home_team
+
+    def lines(self, emotes):
+        blowout_emotes = ''
+        if emotes[1]:
+            blowout_emotes = '%s< %s' % (emotes[self.loser.team_id], emotes[self.winner.team_id])
+        return ['💥 `Biggest Loss:` %s \n- **%s** got blown out by **%s** by a margin of %.2f' % (
+            blowout_emotes, self.loser.team_name, self.winner.team_name, self.margin)]
+
+
+class AchieversTrophy(Trophy):
+    """
+    The teams that beat and missed their projection by the most, unless they already won the high or low score.
+
+    Parameters
+    ----------
+    high_team_id : callable
+        Returns the id of the week's highest scoring team once the week has been folded in.
+    low_team_id : callable
+        Returns the id of the week's lowest scoring team once the week has been folded in.
+    """
+
+    def __init__(self, high_team_id, low_team_id):
+        self.high_team_id = high_team_id
+        self.low_team_id = low_team_id
+        self.best = -9999
+        self.worst = 9999
+        self.over_achiever = None
+        self.under_achiever = None
+
+    def team(self, team, score, projected):
+        performance = score - projected
+        if performance > self.best:
+            self.best = performance
+            self.over_achiever = team
+        if performance < self.worst:
+            self.worst = performance
+            self.under_achiever = team
+
+    def lines(self, emotes):
+        lines = []
+        if self.best > 0 and self.over_achiever.team_id != self.high_team_id():
+            lines += ['📈 `Overachiever:` %s \n- **%s** was %.2f points over their projection' % (
+                emotes[self.over_achiever.team_id], self.over_achiever.team_name, self.best)]
+        if self.worst < 0 and self.under_achiever.team_id != self.low_team_id():
+            lines += ['📉 `Underachiever:` %s \n- **%s** was %.2f points under their projection' % (
+                emotes[self.under_achiever.team_id], self.under_achiever.team_name, abs(self.worst))]
+        return lines
+
+
+class LuckyTrophy(Trophy):
+    """
+    The lowest scoring team that won and the highest scoring team that lost, with their records against the league.
+    """
+
+    def __init__(self):
+        self.results = []
+
+    def matchup(self, box_score):
+        home_won = box_score.home_score > box_score.away_score
+        self.results.append((box_score.home_team, [box_score.home_score, 'W' if home_won else 'L']))
+        self.results.append((box_score.away_team, [box_score.away_score, 'L' if home_won else 'W']))
+
+    def lines(self, emotes):
+        num_teams = len(self.results) - 1
+
+        ranked = sorted(self.results, key=lambda item: item[1], reverse=True)
+        losses = 0
+        for team, result in ranked:
+            if result[1] == 'L':
+                unlucky_team = team
+                unlucky_record = '%d-%d' % (num_teams - losses, losses)
+                break
+            losses += 1
+
+        ranked = sorted(ranked, key=lambda item: item[1])
+        wins = 0
+        for team, result in ranked:
+            if result[1] == 'W':
+                lucky_team = team
+                lucky_record = '%d-%d' % (wins, num_teams - wins)
+                break
+            wins += 1
+
+        return ['🍀 `Lucky:` %s \n- **%s** was %s against the league, but got the win' % (
+                    emotes[lucky_team.team_id], lucky_team.team_name, lucky_record),
+                '💀 `Unlucky:` %s \n- **%s** was %s against the league, but still took an L' % (
+                    emotes[unlucky_team.team_id], unlucky_team.team_name, unlucky_record)]
+
+
+class MvpTrophy(Trophy):
+    """
+    The starters who beat and missed their projection by the largest ratio, D/ST and players projected for no points
+    excluded.
+    """
+
+    def __init__(self):
+        self.players = PlayerWeeks()
+
+    def player(self, team, player):
+        self.players.add(None, team, player)
+
+    def _line(self, title, award, emotes):
+        return '%s %s \n- %s, **%s** with %.2f points (%.2f proj, %.2f diff ratio)' % (
+            title, emotes[award['team'].team_id], award['position'] + ' ' + award['name'], award['team'].team_abbrev,
+            award['points'], award['projected'], award['ratio'])
+
+    def lines(self, emotes):
+        mvp, lvp = self.players.performances()
+        return [self._line('👍 `Week MVP:`', mvp, emotes), self._line('👎 `Week LVP:`', lvp, emotes)]
+
+
+def weekly_trophies(extra_trophies=False):
+    """
+    Declares the trophies of the week, in the order they are posted.
+
+    Parameters
+    ----------
+    extra_trophies : bool, optional
+        Whether to add the over/underachiever, lucky/unlucky and MVP/LVP trophies (default is False).
+
+    Returns
+    -------
+    list of Trophy
+        The trophies.
+    """
+
+    high = HighScoreTrophy()
+    low = LowScoreTrophy()
+    trophies = [high, low, ClosestWinTrophy(), BiggestLossTrophy()]
+    if extra_trophies:
+        trophies += [AchieversTrophy(lambda: high.high_team.team_id, lambda: low.low_team.team_id), LuckyTrophy(),
+                     MvpTrophy()]
+    return trophies
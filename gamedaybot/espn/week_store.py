@@ -0,0 +1,187 @@
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+# player attributes the reports read from a box score lineup
+PLAYER_FIELDS = ['name', 'playerId', 'position', 'slot_position', 'points', 'projected_points', 'pro_opponent',
+                 'injuryStatus', 'game_played', 'proTeam']
+
+
+class StoredPlayer(object):
+    """
+    A lineup entry restored from the week store, exposing the same attributes the reports use on espn_api BoxPlayer.
+    """
+
+    def __init__(self, values):
+        for field, value in zip(PLAYER_FIELDS, values):
+            setattr(self, field, value)
+
+    def __repr__(self):
+        return "Player(%s, points:%s, projected:%s)" % (self.name, self.points, self.projected_points)
+
+
+class StoredBoxScore(object):
+    """
+    A matchup restored from the week store, exposing the same attributes the reports use on espn_api BoxScore.
+    """
+
+    def __init__(self, data, teams):
+        self.matchup_type = data['matchup_type']
+        self.is_playoff = self.matchup_type != 'NONE'
+        self.home_team = teams.get(data['home_team'], data['home_team'])
+        self.home_score = data['home_score']
+        self.home_projected = data['home_projected']
+        self.home_lineup = [StoredPlayer(p) for p in data['home_lineup']]
+        self.away_team = teams.get(data['away_team'], data['away_team'])
+        self.away_score = data['away_score']
+        self.away_projected = data['away_projected']
+        self.away_lineup = [StoredPlayer(p) for p in data['away_lineup']]
+
+    def __repr__(self):
+        away_team = self.away_team or "BYE"
+        home_team = self.home_team or "BYE"
+        return "Box Score(%s at %s)" % (away_team, home_team)
+
+
+def is_final_week(league, week):
+    """
+    Check if a week's box scores can no longer change.
+
+    ESPN applies stat corrections during the week after a game, so only weeks before last week are final, unless the
+    season is already over.
+
+    Parameters
+    ----------
+    league : espn_api.football.League
+        The league the week belongs to.
+    week : int
+        The week to check.
+
+    Returns
+    -------
+    bool
+        True if the week is final, False otherwise.
+    """
+
+    if week < league.current_week - 1:
+        return True
+    return getattr(league, 'scoringPeriodId', 0) > getattr(league, 'finalScoringPeriod', league.current_week) \
+        and week <= league.current_week
+
+
+def _team_id(team):
+    # byes are stored as an empty team on espn_api box scores
+    return getattr(team, 'team_id', team or None)
+
+
+def _serialize_lineup(lineup):
+    return [[getattr(p, field, None) for field in PLAYER_FIELDS] for p in lineup]
+
+
+def _serialize_box_score(box_score):
+    return {
+        'matchup_type': getattr(box_score, 'matchup_type', 'NONE'),
+        'home_team': _team_id(box_score.home_team),
+        'home_score': box_score.home_score,
+        'home_projected': box_score.home_projected,
+        'home_lineup': _serialize_lineup(box_score.home_lineup),
+        'away_team': _team_id(box_score.away_team),
+        'away_score': box_score.away_score,
+        'away_projected': box_score.away_projected,
+        'away_lineup': _serialize_lineup(box_score.away_lineup),
+    }
+
+
+class WeekStore(object):
+    """
+    A persistent store of completed weeks of box scores, kept as one compact JSON file per league, year and week.
+
+    Parameters
+    ----------
+    path : str
+        The directory in which the week files are kept.
+
+    Attributes
+    ----------
+    path : str
+        The directory in which the week files are kept.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def __repr__(self):
+        return "WeekStore(%s)" % self.path
+
+    def week_path(self, league_id, year, week):
+        return os.path.join(self.path, str(league_id), str(year), 'week_%02d.json' % week)
+
+    def load(self, league, week):
+        """
+        Returns the stored box scores of a week, linked to the league's current team objects.
+
+        Parameters
+        ----------
+        league : espn_api.football.League
+            The league the week belongs to.
+        week : int
+            The week to load.
+
+        Returns
+        -------
+        list or None
+            A list of StoredBoxScore objects, or None if the week is not stored.
+        """
+
+        path = self.week_path(league.league_id, league.year, week)
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            logger.warning("Ignoring unreadable week file %s" % path)
+            return None
+
+        teams = {team.team_id: team for team in league.teams}
+        return [StoredBoxScore(matchup, teams) for matchup in data['matchups']]
+
+    def save(self, league, week, box_scores):
+        """
+        Stores the box scores of a week if the week is final. Stored weeks are never overwritten.
+
+        Parameters
+        ----------
+        league : espn_api.football.League
+            The league the week belongs to.
+        week : int
+            The week to store.
+        box_scores : list
+            The week's box scores.
+
+        Returns
+        -------
+        bool
+            True if the week was written, False otherwise.
+        """
+
+        if not is_final_week(league, week):
+            return False
+
+        path = self.week_path(league.league_id, league.year, week)
+        if os.path.exists(path):
+            return False
+
+        data = {'league_id': league.league_id, 'year': league.year, 'week': week, 'final': True,
+                'player_fields': PLAYER_FIELDS, 'matchups': [_serialize_box_score(i) for i in box_scores]}
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # write to a temporary file first so a crash never leaves a partial week behind
+        tmp_path = '%s.%d.%d.tmp' % (path, os.getpid(), threading.get_ident())
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+        return True
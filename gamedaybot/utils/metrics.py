@@ -0,0 +1,244 @@
+import json
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+_registry = None
+_registry_lock = threading.Lock()
+
+# span attributes summed across operations, and durations within an operation kept as summaries of their own; every
+# other attribute (week, status, chars...) is only logged
+COUNTERS = ('bytes', 'retries')
+DURATIONS = ('wait_seconds',)
+
+
+class Span(dict):
+    """
+    The attributes of one timed operation, e.g. the bytes it transferred or the number of times it was retried.
+
+    Parameters
+    ----------
+    name : str
+        The name of the operation, e.g. "box_scores".
+    labels : dict
+        The labels the operation is aggregated by, e.g. the report it belongs to.
+    """
+
+    def __init__(self, name, labels):
+        super().__init__()
+        self.name = name
+        self.labels = labels
+        self.duration = 0
+
+
+class Metrics(object):
+    """
+    Collects timed operations into per-operation totals and writes each one as a JSON log line.
+
+    Totals are kept per operation name and label set: the number of operations, their total duration, the number that
+    raised, the sum of each attribute in COUNTERS, and the count and sum of each duration in DURATIONS.
+    """
+
+    def __init__(self):
+        self._totals = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "Metrics(%d series)" % len(self._totals)
+
+    def record(self, span, error=None):
+        """
+        Adds a finished operation to the totals and logs it if INFO logging is enabled, as `enable_json_logs` does.
+
+        Parameters
+        ----------
+        span : Span
+            The finished operation.
+        error : Exception, optional
+            The exception the operation raised, if any.
+        """
+
+        key = (span.name, tuple(sorted(span.labels.items())))
+        with self._lock:
+            totals = self._totals.setdefault(key, {'count': 0, 'seconds': 0.0, 'errors': 0})
+            totals['count'] += 1
+            totals['seconds'] += span.duration
+            totals['errors'] += error is not None
+            for name in COUNTERS:
+                if name in span:
+                    totals[name] = totals.get(name, 0) + span[name]
+            for name in DURATIONS:
+                if name in span:
+                    summary = totals.setdefault(name, {'count': 0, 'seconds': 0.0})
+                    summary['count'] += 1
+                    summary['seconds'] += span[name]
+
+        # every ESPN request is a span, so the log line is only built when something will write it
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        entry = {'span': span.name, 'duration_ms': round(span.duration * 1000, 3)}
+        entry.update(span.labels)
+        entry.update(span)
+        if error is not None:
+            entry['error'] = repr(error)
+        logger.info(json.dumps(entry, default=str))
+
+    def totals(self):
+        """
+        Returns the totals of every operation.
+
+        Returns
+        -------
+        dict
+            The totals of each (name, labels) series.
+        """
+
+        with self._lock:
+            return {key: {name: dict(value) if isinstance(value, dict) else value for name, value in totals.items()}
+                    for key, totals in self._totals.items()}
+
+    def prometheus(self):
+        """
+        Renders the totals in the Prometheus text exposition format.
+
+        Returns
+        -------
+        str
+            The metrics page.
+        """
+
+        series = {}
+
+        def add(metric, kind, sample):
+            series.setdefault(metric, (kind, []))[1].append(sample)
+
+        for (name, labels), totals in sorted(self.totals().items()):
+            label_text = ','.join(['span="%s"' % name] + ['%s="%s"' % (k, str(v).replace('"', '\\"'))
+                                                          for k, v in labels])
+            add('gamedaybot_span_seconds', 'summary', 'gamedaybot_span_seconds_sum{%s} %s' % (label_text,
+                                                                                              totals['seconds']))
+            add('gamedaybot_span_seconds', 'summary', 'gamedaybot_span_seconds_count{%s} %s' % (label_text,
+                                                                                                totals['count']))
+            for total in ['errors'] + [counter for counter in COUNTERS if counter in totals]:
+                metric = 'gamedaybot_span_%s_total' % total
+                add(metric, 'counter', '%s{%s} %s' % (metric, label_text, totals[total]))
+            for duration in DURATIONS:
+                if duration in totals:
+                    metric = 'gamedaybot_span_%s' % duration
+                    add(metric, 'summary', '%s_sum{%s} %s' % (metric, label_text, totals[duration]['seconds']))
+                    add(metric, 'summary', '%s_count{%s} %s' % (metric, label_text, totals[duration]['count']))
+
+        lines = []
+        for metric, (kind, samples) in series.items():
+            lines.append('# TYPE %s %s' % (metric, kind))
+            lines.extend(samples)
+        return '\n'.join(lines) + '\n'
+
+
+def get_metrics():
+    """
+    Returns the process-wide metrics.
+
+    Returns
+    -------
+    Metrics
+        The shared metrics.
+    """
+
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = Metrics()
+        return _registry
+
+
+@contextmanager
+def span(name, **labels):
+    """
+    Times the block it wraps and records it in the process-wide metrics.
+
+    Attributes such as bytes or retries can be set on the yielded span while the block runs.
+
+    Parameters
+    ----------
+    name : str
+        The name of the operation, e.g. "box_scores".
+    **labels
+        The labels the operation is aggregated by, e.g. report="get_standings".
+
+    Yields
+    ------
+    Span
+        The operation's attributes.
+    """
+
+    current = Span(name, {k: v for k, v in labels.items() if v is not None})
+    start = time.perf_counter()
+    try:
+        yield current
+    except Exception as e:
+        current.duration = time.perf_counter() - start
+        get_metrics().record(current, error=e)
+        raise
+    current.duration = time.perf_counter() - start
+    get_metrics().record(current)
+
+
+def enable_json_logs(stream=None):
+    """
+    Writes every recorded operation to a stream as one JSON object per line.
+
+    Parameters
+    ----------
+    stream : file, optional
+        The stream to write to (default is stderr).
+    """
+
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+
+def serve_metrics(port, host=''):
+    """
+    Serves the process-wide metrics for Prometheus at /metrics from a background thread.
+
+    Parameters
+    ----------
+    port : int
+        The port to listen on.
+    host : str, optional
+        The address to listen on (default is every address).
+
+    Returns
+    -------
+    http.server.ThreadingHTTPServer
+        The running server.
+    """
+
+    # http.server is only imported by processes that serve metrics
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != '/metrics':
+                self.send_error(404)
+                return
+            body = get_metrics().prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True, name='metrics').start()
+    return server
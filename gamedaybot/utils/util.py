@@ -47,6 +47,76 @@ def str_to_bool(check: str) -> bool:
     return check.lower() in ("yes", "true", "t", "1")
 
 
+def str_chunks(text: str, limit: int):
+    """
+    Splits a string into as many parts of a maximum length as needed, breaking on line boundaries where possible.
+
+    The text is walked once from start to end. A part that ends inside a ``` code block is closed with a fence and the
+    block is reopened at the start of the next part, so every part renders on its own. Inline markup such as `code`
+    or **bold** is not balanced: it stays whole when parts break on line boundaries, but a single line longer than the
+    limit is cut wherever the limit falls.
+
+    Parameters
+    ----------
+    text : str
+        The text to be split.
+    limit : int
+        The maximum length of each split string part.
+
+    Yields
+    ------
+    str
+        The next part of the text.
+
+    Raises
+    ------
+    TypeError
+        If the text is not a string or the limit is not an integer.
+    ValueError
+        If the limit is not positive.
+    """
+
+    if not isinstance(text, str):
+        raise TypeError("text must be a string")
+    if not isinstance(limit, int):
+        raise TypeError("limit must be an integer")
+    if limit <= 0:
+        raise ValueError("limit must be positive")
+
+    fence = '```'
+    # very small limits leave no room to close and reopen code blocks
+    balance = limit > 2 * (len(fence) + 1)
+    text = text.strip()
+    start = 0
+    reopen = ''
+
+    while len(reopen) + len(text) - start > limit:
+        window = limit - len(reopen)
+        cut = text.rfind('\n', start, start + window)
+        if cut <= start:
+            # a single line longer than the limit has to be cut mid-line
+            cut = start + window
+        in_block = balance and (len(reopen) > 0) != (text.count(fence, start, cut) % 2 == 1)
+
+        if in_block and len(reopen) + cut - start + len(fence) + 1 > limit:
+            # leave room to close the code block
+            window -= len(fence) + 1
+            cut = text.rfind('\n', start, start + window)
+            if cut <= start:
+                cut = start + window
+            in_block = (len(reopen) > 0) != (text.count(fence, start, cut) % 2 == 1)
+
+        if in_block:
+            yield reopen + text[start:cut] + '\n' + fence
+        else:
+            yield reopen + text[start:cut]
+
+        reopen = fence + '\n' if in_block else ''
+        start = cut + 1 if cut < len(text) and text[cut] == '\n' else cut
+
+    yield reopen + text[start:]
+
+
 def str_limit_check(text: str, limit: int):
     """
     Splits a string into parts of a maximum length.
@@ -64,21 +134,7 @@ def str_limit_check(text: str, limit: int):
         A list of strings split by the maximum length.
     """
 
-    split_str = []
-
-    if len(text) > limit:
-        part_one = text[:limit].split('\n')
-        part_one.pop()
-        part_one = '\n'.join(part_one)
-
-        part_two = text[len(part_one) + 1:]
-
-        split_str.append(part_one)
-        split_str.append(part_two)
-    else:
-        split_str.append(text)
-
-    return split_str
+    return list(str_chunks(text, limit))
 
 
 def str_to_datetime(date_str: str) -> datetime:
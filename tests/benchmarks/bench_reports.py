@@ -0,0 +1,72 @@
+'''
+Benchmarks for report generation on synthetic leagues of 8 to 32 teams, 17 weeks each.
+
+Run them explicitly, saving the results so later runs can be compared against them. Saved results
+depend on the machine they were taken on, so tests/benchmarks/results is not committed:
+
+    python -m pytest tests/benchmarks/bench_reports.py --benchmark-autosave \
+        --benchmark-storage=file://tests/benchmarks/results
+
+and check a change against the last saved run with `--benchmark-compare --benchmark-compare-fail=mean:10%`.
+'''
+import sys
+import os
+sys.path.insert(1, os.path.abspath('.'))
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+import gamedaybot.espn.all_play as all_play
+import gamedaybot.espn.functionality as espn
+import gamedaybot.espn.player_weeks as player_weeks
+import gamedaybot.espn.season_recap as recap
+from synthetic_league import SyntheticLeague
+
+LEAGUE_SIZES = [8, 12, 20, 32]
+
+_leagues = {}
+
+
+@pytest.fixture(params=LEAGUE_SIZES, ids=lambda teams: '%d-teams' % teams)
+def league(request):
+    if request.param not in _leagues:
+        _leagues[request.param] = SyntheticLeague(request.param)
+    return _leagues[request.param]
+
+
+def clear_caches():
+    all_play._engines.clear()
+    player_weeks._tables.clear()
+
+
+def cold(benchmark, function, *args):
+    # the all-play engine and player-week tables keep finished weeks between calls, start every round without them
+    return benchmark.pedantic(function, args=args, setup=clear_caches, rounds=10, warmup_rounds=1)
+
+
+def test_optimal_lineup_score(benchmark, league):
+    lineups = [lineup for box_score in league.box_scores(1) for lineup in (box_score.home_lineup, box_score.away_lineup)]
+    starter_counts = espn.get_starter_counts(league)
+    results = benchmark(lambda: [espn.optimal_lineup_score(lineup, starter_counts) for lineup in lineups])
+    assert len(results) == len(league.teams)
+
+
+def test_sim_record(benchmark, league):
+    records = cold(benchmark, espn.sim_record, league, 17)
+    assert len(records) == len(league.teams)
+
+
+def test_win_matrix(benchmark, league):
+    assert cold(benchmark, recap.win_matrix, league).startswith('Standings')
+
+
+def test_season_trophies(benchmark, league):
+    assert 'End of Season Awards' in cold(benchmark, recap.season_trophies, league, True)
+
+
+def test_combined_power_rankings(benchmark, league):
+    assert 'Power Rankings' in cold(benchmark, espn.combined_power_rankings, league)
+
+
+def test_get_trophies(benchmark, league):
+    assert benchmark(espn.get_trophies, league, True)
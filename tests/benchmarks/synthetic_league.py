@@ -0,0 +1,169 @@
+import random
+
+# lineup slots of a league with superflex and IDP, as returned by espn_api's settings.position_slot_counts
+SLOT_COUNTS = {'QB': 1, 'RB': 2, 'WR': 2, 'TE': 1, 'RB/WR/TE': 1, 'OP': 1, 'D/ST': 1, 'K': 1, 'DE': 1, 'LB': 1, 'CB': 1,
+               'S': 1, 'DP': 2, 'BE': 7, 'IR': 1}
+
+# players rostered at each ESPN position, and their average weekly points
+ROSTER = {'QB': (2, 18), 'RB': (5, 11), 'WR': (5, 11), 'TE': (2, 7), 'D/ST': (1, 7), 'K': (1, 8), 'DT': (1, 5),
+          'DE': (2, 6), 'LB': (2, 8), 'CB': (2, 6), 'S': (1, 6)}
+
+# starting slot filled first for each position, then the flex slots in order
+STARTING_SLOTS = {'QB': ['QB', 'OP'], 'RB': ['RB', 'RB/WR/TE', 'OP'], 'WR': ['WR', 'RB/WR/TE', 'OP'],
+                  'TE': ['TE', 'RB/WR/TE', 'OP'], 'D/ST': ['D/ST'], 'K': ['K'], 'DT': ['DP'], 'DE': ['DE', 'DP'],
+                  'LB': ['LB', 'DP'], 'CB': ['CB', 'DP'], 'S': ['S', 'DP']}
+
+
+class Player(object):
+    def __init__(self, player_id, position, average):
+        self.playerId = player_id
+        self.name = 'Player %d' % player_id
+        self.position = position
+        self.average = average
+        self.proTeam = 'NYG'
+        self.injuryStatus = 'ACTIVE'
+        self.total_points = 0
+        self.projected_total_points = 0
+
+
+class BoxPlayer(object):
+    def __init__(self, player, slot_position, points, projected_points):
+        self.playerId = player.playerId
+        self.name = player.name
+        self.position = player.position
+        self.proTeam = player.proTeam
+        self.injuryStatus = player.injuryStatus
+        self.slot_position = slot_position
+        self.points = points
+        self.projected_points = projected_points
+        self.pro_opponent = 'DAL'
+        self.game_played = 100
+
+
+class Team(object):
+    def __init__(self, team_id):
+        self.team_id = team_id
+        self.team_name = 'Team %d' % team_id
+        self.team_abbrev = 'T%d' % team_id
+        self.scores = []
+        self.outcomes = []
+        self.wins = 0
+        self.losses = 0
+        self.ties = 0
+        self.points_for = 0
+        self.acquisitions = 0
+        self.drops = 0
+        self.trades = 0
+        self.playoff_pct = 0
+        self.roster = []
+
+    def __repr__(self):
+        return 'Team(%s)' % self.team_name
+
+
+class BoxScore(object):
+    def __init__(self, home_team, home_lineup, away_team, away_lineup):
+        self.matchup_type = 'NONE'
+        self.home_team = home_team
+        self.home_lineup = home_lineup
+        self.home_score = round(sum(p.points for p in home_lineup if p.slot_position not in ('BE', 'IR')), 2)
+        self.home_projected = round(sum(p.projected_points for p in home_lineup if p.slot_position not in ('BE', 'IR')), 2)
+        self.away_team = away_team
+        self.away_lineup = away_lineup
+        self.away_score = round(sum(p.points for p in away_lineup if p.slot_position not in ('BE', 'IR')), 2)
+        self.away_projected = round(sum(p.projected_points for p in away_lineup if p.slot_position not in ('BE', 'IR')), 2)
+
+
+class Settings(object):
+    def __init__(self, weeks):
+        self.position_slot_counts = dict(SLOT_COUNTS)
+        self.matchup_periods = {str(week): [week] for week in range(1, weeks + 1)}
+        self.reg_season_count = weeks
+        self.faab = False
+
+
+class SyntheticLeague(object):
+    """
+    An in-memory stand-in for espn_api's League with a finished season of randomly scored, round robin matchups.
+
+    Parameters
+    ----------
+    teams : int
+        The number of teams, an even number.
+    weeks : int, optional
+        The number of weeks played (default is 17).
+    seed : int, optional
+        The random seed, so that the same arguments always give the same league (default is 0).
+    """
+
+    def __init__(self, teams, weeks=17, seed=0):
+        self.league_id = 'synthetic-%d-%d-%d' % (teams, weeks, seed)
+        self.year = 2024
+        self.current_week = weeks + 1
+        self.scoringPeriodId = weeks + 1
+        self.settings = Settings(weeks)
+        self.teams = [Team(team_id) for team_id in range(1, teams + 1)]
+
+        rng = random.Random(seed)
+        player_id = 0
+        for team in self.teams:
+            for position, (count, average) in ROSTER.items():
+                for _ in range(count):
+                    player_id += 1
+                    team.roster.append(Player(player_id, position, average * rng.uniform(0.6, 1.4)))
+            team.acquisitions = rng.randint(0, 30)
+            team.drops = rng.randint(0, 30)
+            team.trades = rng.randint(0, 3)
+            team.playoff_pct = rng.uniform(0, 100)
+
+        self._box_scores = {week: self._play_week(week, rng) for week in range(1, weeks + 1)}
+
+    def __repr__(self):
+        return 'SyntheticLeague(%d teams)' % len(self.teams)
+
+    def _lineup(self, team, rng):
+        open_slots = {slot: count for slot, count in SLOT_COUNTS.items() if slot not in ('BE', 'IR')}
+        lineup = []
+        for player in sorted(team.roster, key=lambda p: -p.average):
+            slot_position = 'BE'
+            for slot in STARTING_SLOTS[player.position]:
+                if open_slots.get(slot):
+                    open_slots[slot] -= 1
+                    slot_position = slot
+                    break
+            points = round(max(rng.gauss(player.average, player.average * 0.5), -2), 2)
+            projected_points = round(player.average * rng.uniform(0.8, 1.2), 2)
+            player.total_points += points
+            player.projected_total_points += projected_points
+            lineup.append(BoxPlayer(player, slot_position, points, projected_points))
+        return lineup
+
+    def _play_week(self, week, rng):
+        # circle method round robin: the first team stays put and the others rotate
+        others = self.teams[1:]
+        shift = (week - 1) % len(others)
+        order = [self.teams[0]] + others[shift:] + others[:shift]
+        half = len(order) // 2
+        box_scores = []
+        for home_team, away_team in zip(order[:half], reversed(order[half:])):
+            box_score = BoxScore(home_team, self._lineup(home_team, rng), away_team, self._lineup(away_team, rng))
+            box_scores.append(box_score)
+            for team, score, other in ((home_team, box_score.home_score, box_score.away_score),
+                                       (away_team, box_score.away_score, box_score.home_score)):
+                team.scores.append(score)
+                team.points_for += score
+                team.outcomes.append('W' if score > other else 'L' if score < other else 'T')
+                team.wins += score > other
+                team.losses += score < other
+                team.ties += score == other
+        return box_scores
+
+    def box_scores(self, week=None):
+        if not week or week > len(self._box_scores):
+            week = len(self._box_scores)
+        return self._box_scores[week]
+
+    def power_rankings(self, week=None):
+        week = week or len(self._box_scores)
+        ranks = [(sum(team.scores[:week]) / week, team) for team in self.teams]
+        return [('%.2f' % score, team) for score, team in sorted(ranks, key=lambda item: -item[0])]
@@ -1,3 +1,5 @@
+import time
+from types import SimpleNamespace
 import pytest
 import requests_mock
 
@@ -6,3 +8,56 @@ import requests_mock
 def mock_requests():
     with requests_mock.Mocker() as m:
         yield m
+
+
+class Team:
+    '''Hashable stand-in for espn_api Team'''
+
+    def __init__(self, team_id):
+        self.team_id = team_id
+        self.team_name = 'Team %d' % team_id
+        self.team_abbrev = 'T%d' % team_id
+
+
+def make_player(name, position='RB', points=0.0, projected=10.0, slot_position=None, **attributes):
+    '''Stand-in for an espn_api BoxPlayer, identified by its name unless a playerId is given'''
+    player = SimpleNamespace(playerId=name, name=name, position=position, slot_position=slot_position or position,
+                             points=points, projected_points=projected, pro_opponent='DAL', injuryStatus='ACTIVE',
+                             game_played=100, proTeam='NYG')
+    player.__dict__.update(attributes)
+    return player
+
+
+def make_box_score(home_team, home_score, away_team, away_score, home_lineup=(), away_lineup=(), **attributes):
+    '''Stand-in for an espn_api BoxScore, projected to finish at the actual scores unless told otherwise'''
+    box_score = SimpleNamespace(matchup_type='NONE', home_team=home_team, home_score=home_score,
+                                home_projected=home_score, home_lineup=list(home_lineup), away_team=away_team,
+                                away_score=away_score, away_projected=away_score, away_lineup=list(away_lineup))
+    box_score.__dict__.update(attributes)
+    return box_score
+
+
+class FakeLeague:
+    '''
+    Stand-in for espn_api League that counts box score fetches.
+
+    Each week's box scores are built by `matchups(league, week)`, or are just the string 'week <n>' in a list when no
+    builder is given.
+    '''
+
+    def __init__(self, matchups=None, teams=2, current_week=5, settings=None):
+        self.league_id = 1234
+        self.year = 2024
+        self.current_week = current_week
+        self.teams = [Team(team_id) for team_id in range(1, teams + 1)]
+        self.settings = settings
+        self.matchups = matchups
+        self.fetches = []
+        self.delay = 0
+
+    def box_scores(self, week=None):
+        self.fetches.append(week)
+        time.sleep(self.delay)
+        if self.matchups is None:
+            return ['week %s' % week]
+        return self.matchups(self, week)
@@ -3,6 +3,7 @@ import os
 sys.path.insert(1, os.path.abspath('.'))
 
 from espn_api.football import League
+from gamedaybot.espn.league_cache import LeagueCache
 import gamedaybot.espn.season_recap as recap
 import gamedaybot.espn.functionality as espn
 from gamedaybot.chat.discord import Discord
@@ -37,7 +38,7 @@ try:
 except KeyError:
     warning = 0
 
-league = League(league_id, year)
+league = LeagueCache(League(league_id, year))
 # discord_bot = Discord(data['discord_webhook_url'])
 # discord_bot.send_message('test')
 
@@ -52,9 +53,10 @@ print(espn.get_monitor(league, warning) + '\n')
 print(espn.get_inactives(league) + '\n')
 print(espn.get_trophies(league, True) + '\n')
 if swid != '{1}' and espn_s2 != '1':
-    league = League(league_id, year, espn_s2, swid)
+    league = LeagueCache(League(league_id, year, espn_s2, swid))
     faab = league.settings.faab
     print(espn.get_waiver_report(league, faab))
 # print(recap.win_matrix(league) + '\n')
 # print(recap.season_trophies(league, True) + '\n')
+print(league.cache_info())
 
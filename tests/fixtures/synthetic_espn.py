@@ -0,0 +1,231 @@
+'''
+Builds the "synthetic" fixture: a small made-up league served as ESPN API responses and recorded through the same
+recorder as a real league, so it can be shared and regenerated without ESPN access:
+
+    python tests/fixtures/synthetic_espn.py tests/fixtures/synthetic
+'''
+import sys
+import os
+sys.path.insert(1, os.path.abspath('.'))
+import json
+import random
+from datetime import datetime, timezone
+
+from gamedaybot.espn.fixtures import record_league
+
+LEAGUE_ID = 424242
+YEAR = 2024
+TEAMS = 4
+WEEKS = 14
+# weeks 1-3 are finished and week 4 is being played: Thursday's game is over, Sunday's games have not started
+CURRENT_WEEK = 4
+RECORDED_AT = datetime(2024, 9, 27, 12, 0, tzinfo=timezone.utc).timestamp()
+
+# lineup slot id: starters, as in ESPN's rosterSettings.lineupSlotCounts (QB, RB, WR, TE, FLEX, D/ST, K, BE, IR)
+SLOT_COUNTS = {0: 1, 2: 2, 4: 2, 6: 1, 16: 1, 17: 1, 20: 3, 21: 1, 23: 1}
+ELIGIBLE_SLOTS = {'QB': [0, 7, 20, 21], 'RB': [2, 3, 23, 7, 20, 21], 'WR': [3, 4, 5, 23, 7, 20, 21],
+                  'TE': [5, 6, 23, 7, 20, 21], 'D/ST': [16, 20, 21], 'K': [17, 20, 21]}
+DEFAULT_POSITION_ID = {'QB': 1, 'RB': 2, 'WR': 3, 'TE': 4, 'K': 5, 'D/ST': 16}
+# each team's roster as (position, lineup slot id, average points)
+ROSTER = [('QB', 0, 19), ('RB', 2, 13), ('RB', 2, 11), ('WR', 4, 14), ('WR', 4, 12), ('TE', 6, 8), ('RB', 23, 9),
+          ('D/ST', 16, 7), ('K', 17, 8), ('QB', 20, 15), ('WR', 20, 9), ('RB', 20, 7)]
+NAMES = ['Avery', 'Blake', 'Casey', 'Devon', 'Emery', 'Finley', 'Gray', 'Harper', 'Indy', 'Jordan', 'Kai', 'Logan',
+         'Morgan', 'Noel', 'Oakley', 'Parker']
+SURNAMES = ['Stone', 'Rivers', 'Brooks', 'Fields', 'Hill', 'Lake', 'Woods', 'Marsh', 'Dale', 'Glenn', 'Ford', 'Shaw']
+TEAM_NAMES = ['Gridiron Gurus', 'Fourth and Long', 'Blitz Brigade', 'End Zone Elite']
+# matchups of each week as (home, away) team ids, repeating every three weeks
+PAIRINGS = [[(1, 2), (3, 4)], [(1, 3), (2, 4)], [(1, 4), (2, 3)]]
+
+
+def kickoff(week, thursday):
+    # Thursday night games start at 00:15 UTC on Friday, Sunday games at 17:00 UTC
+    day = datetime(2024, 9, 6 if thursday else 8, 0 if thursday else 17, 15 if thursday else 0, tzinfo=timezone.utc)
+    return int((day.timestamp() + (week - 1) * 7 * 86400) * 1000)
+
+
+class SyntheticLeague(object):
+    '''The made-up league, with one pro team per player and every pro game on Sunday except pro team 1's'''
+
+    def __init__(self, seed=0):
+        rng = random.Random(seed)
+        self.players = {}
+        self.rosters = {}
+        player_id = 1000
+        for team_id in range(1, TEAMS + 1):
+            self.rosters[team_id] = []
+            for position, slot, average in ROSTER:
+                player_id += 1
+                if position == 'D/ST':
+                    name = 'Team %d D/ST' % team_id
+                else:
+                    name = '%s %s' % (rng.choice(NAMES), rng.choice(SURNAMES))
+                # pro team 1 plays Thursday night, so its players have played when the recording is taken
+                self.players[player_id] = {'id': player_id, 'fullName': name, 'position': position,
+                                           'proTeamId': 1 + (player_id % 24),
+                                           'average': average * rng.uniform(0.8, 1.2)}
+                self.rosters[team_id].append((player_id, slot))
+        # a starter ruled out for the week being played
+        self.injured = self.rosters[2][1][0]
+
+        self.points = {}
+        for week in range(1, CURRENT_WEEK + 1):
+            for player_id, player in self.players.items():
+                played = week < CURRENT_WEEK or player['proTeamId'] == 1
+                points = round(max(rng.gauss(player['average'], player['average'] * 0.5), -2), 2) if played else 0
+                self.points[week, player_id] = (points, round(player['average'] * rng.uniform(0.85, 1.15), 2))
+
+    def team_score(self, team_id, week):
+        return round(sum(self.points[week, player_id][0] for player_id, slot in self.rosters[team_id]
+                         if slot not in (20, 21)), 2)
+
+    def entry(self, player_id, slot, week):
+        player = self.players[player_id]
+        points, projected = self.points[week, player_id]
+        stats = [{'seasonId': YEAR, 'scoringPeriodId': week, 'statSourceId': 1, 'statSplitTypeId': 1,
+                  'appliedTotal': projected, 'stats': {'0': 1}}]
+        if week < CURRENT_WEEK or points:
+            stats.append({'seasonId': YEAR, 'scoringPeriodId': week, 'statSourceId': 0, 'statSplitTypeId': 1,
+                          'appliedTotal': points, 'proTeamId': player['proTeamId'], 'stats': {'0': 1}})
+        injury = 'OUT' if player_id == self.injured and week == CURRENT_WEEK else 'ACTIVE'
+        return {'playerId': player_id, 'lineupSlotId': slot,
+                'playerPoolEntry': {'id': player_id, 'player': {
+                    'id': player_id, 'fullName': player['fullName'], 'proTeamId': player['proTeamId'],
+                    'defaultPositionId': DEFAULT_POSITION_ID[player['position']],
+                    'eligibleSlots': ELIGIBLE_SLOTS[player['position']], 'injuryStatus': injury,
+                    'injured': injury != 'ACTIVE', 'stats': stats}}}
+
+    def matchup(self, week, home, away, scores=True):
+        home_score, away_score = self.team_score(home, week), self.team_score(away, week)
+        if week >= CURRENT_WEEK:
+            winner = 'UNDECIDED'
+        else:
+            winner = 'HOME' if home_score > away_score else 'AWAY' if away_score > home_score else 'TIE'
+        matchup = {'id': week * 10 + home, 'matchupPeriodId': week, 'winner': winner, 'playoffTierType': 'NONE',
+                   'home': {'teamId': home, 'totalPoints': home_score if week <= CURRENT_WEEK else 0},
+                   'away': {'teamId': away, 'totalPoints': away_score if week <= CURRENT_WEEK else 0}}
+        if scores:
+            for side, team_id in (('home', home), ('away', away)):
+                matchup[side]['rosterForCurrentScoringPeriod'] = {
+                    'entries': [self.entry(player_id, slot, week) for player_id, slot in self.rosters[team_id]]}
+        return matchup
+
+    def schedule(self):
+        return [self.matchup(week, home, away, scores=False) if week <= CURRENT_WEEK else
+                {'id': week * 10 + home, 'matchupPeriodId': week, 'winner': 'UNDECIDED',
+                 'home': {'teamId': home, 'totalPoints': 0}, 'away': {'teamId': away, 'totalPoints': 0}}
+                for week in range(1, WEEKS + 1) for home, away in PAIRINGS[(week - 1) % 3]]
+
+    def team(self, team_id, schedule):
+        record = [0, 0, 0]
+        points_for = points_against = 0
+        for matchup in schedule:
+            if matchup['matchupPeriodId'] >= CURRENT_WEEK:
+                continue
+            for side, other in (('home', 'away'), ('away', 'home')):
+                if matchup[side]['teamId'] == team_id:
+                    mine, theirs = matchup[side]['totalPoints'], matchup[other]['totalPoints']
+                    points_for += mine
+                    points_against += theirs
+                    record[0 if mine > theirs else 1 if mine < theirs else 2] += 1
+        return {'id': team_id, 'abbrev': 'T%d' % team_id, 'name': TEAM_NAMES[team_id - 1], 'divisionId': 0,
+                'owners': ['{MEMBER-%d}' % team_id], 'playoffSeed': 0, 'rankCalculatedFinal': 0,
+                'record': {'overall': {'wins': record[0], 'losses': record[1], 'ties': record[2],
+                                       'pointsFor': round(points_for, 2), 'pointsAgainst': round(points_against, 2),
+                                       'streakLength': 1, 'streakType': 'WIN'}},
+                'transactionCounter': {'acquisitions': team_id * 2, 'drops': team_id * 2 - 1, 'trades': team_id % 2},
+                'currentSimulationResults': {'playoffPct': 0.25 * team_id},
+                'roster': {'entries': [self.entry(player_id, slot, CURRENT_WEEK)
+                                       for player_id, slot in self.rosters[team_id]]}}
+
+    def league(self):
+        schedule = self.schedule()
+        teams = [self.team(team_id, schedule) for team_id in range(1, TEAMS + 1)]
+        # playoff seeds follow wins, then points
+        standings = sorted(teams, key=lambda t: (-t['record']['overall']['wins'], -t['record']['overall']['pointsFor']))
+        for seed, team in enumerate(standings, 1):
+            team['playoffSeed'] = seed
+        lineup_slot_counts = {str(slot): SLOT_COUNTS.get(slot, 0) for slot in range(24)}
+        return {
+            'id': LEAGUE_ID, 'seasonId': YEAR, 'scoringPeriodId': CURRENT_WEEK,
+            'status': {'currentMatchupPeriod': CURRENT_WEEK, 'firstScoringPeriod': 1, 'finalScoringPeriod': 17,
+                       'latestScoringPeriod': CURRENT_WEEK, 'previousSeasons': []},
+            'settings': {
+                'name': 'Synthetic League', 'size': TEAMS,
+                'scheduleSettings': {'matchupPeriodCount': WEEKS, 'playoffTeamCount': 2,
+                                     'playoffSeedingRule': 'TOTAL_POINTS_SCORED',
+                                     'matchupPeriods': {str(week): [week] for week in range(1, WEEKS + 1)},
+                                     'divisions': [{'id': 0, 'name': 'East'}]},
+                'tradeSettings': {'vetoVotesRequired': 0},
+                'draftSettings': {'keeperCount': 0},
+                'scoringSettings': {'matchupTieRule': 'NONE', 'playoffMatchupTieRule': 'NONE', 'scoringItems': []},
+                'acquisitionSettings': {'isUsingAcquisitionBudget': False},
+                'rosterSettings': {'lineupSlotCounts': lineup_slot_counts}},
+            'members': [{'id': '{MEMBER-%d}' % team_id, 'displayName': 'manager%d' % team_id,
+                         'firstName': 'Manager', 'lastName': str(team_id)} for team_id in range(1, TEAMS + 1)],
+            'teams': teams,
+            'schedule': schedule,
+        }
+
+    def box_scores(self, week):
+        return {'schedule': [self.matchup(week, home, away) for home, away in PAIRINGS[(week - 1) % 3]]}
+
+    def positional_ratings(self):
+        # rank of every pro team against each position, 1 being the hardest matchup
+        ratings = {}
+        for position_id in sorted(DEFAULT_POSITION_ID.values()):
+            ranks = list(range(1, 25))
+            random.Random(position_id).shuffle(ranks)
+            ratings[str(position_id)] = {'ratingsByOpponent': {str(pro_team): {'rank': rank}
+                                                               for pro_team, rank in zip(range(1, 25), ranks)}}
+        return {'positionAgainstOpponent': {'positionalRatings': ratings}}
+
+    def pro_schedule(self):
+        games = {}
+        for week in range(1, WEEKS + 1):
+            for pro_team in range(1, 25, 2):
+                game = {'homeProTeamId': pro_team, 'awayProTeamId': pro_team + 1,
+                        'date': kickoff(week, thursday=pro_team == 1)}
+                games.setdefault(pro_team, {})[str(week)] = [game]
+                games.setdefault(pro_team + 1, {})[str(week)] = [game]
+        return {'settings': {'proTeams': [{'id': pro_team, 'proGamesByScoringPeriod': games[pro_team]}
+                                          for pro_team in sorted(games)]}}
+
+
+class SyntheticSession(object):
+    '''Stand-in for requests.Session that answers ESPN API requests from the made-up league'''
+
+    def __init__(self, league):
+        self.league = league
+
+    def get(self, url, params=None, headers=None, cookies=None):
+        view = (params or {}).get('view')
+        if url.endswith('/players'):
+            body = [{'id': player_id, 'fullName': player['fullName']}
+                    for player_id, player in self.league.players.items()]
+        elif view == 'proTeamSchedules_wl':
+            body = self.league.pro_schedule()
+        elif view == 'mDraftDetail':
+            body = {'draftDetail': {'drafted': False}}
+        elif view == 'mPositionalRatings':
+            body = self.league.positional_ratings()
+        elif view == ['mMatchupScore', 'mScoreboard']:
+            body = self.league.box_scores(params['scoringPeriodId'])
+        elif isinstance(view, list) and 'mSettings' in view:
+            body = self.league.league()
+        else:
+            raise ValueError("Unexpected request %s %s" % (url, params))
+        return SyntheticResponse(json.dumps(body))
+
+
+class SyntheticResponse(object):
+    def __init__(self, text):
+        self.status_code = 200
+        self.text = text
+        self.headers = {}
+
+    def json(self):
+        return json.loads(self.text)
+
+
+if __name__ == '__main__':
+    record_league(sys.argv[1], LEAGUE_ID, YEAR, session=SyntheticSession(SyntheticLeague()), now=RECORDED_AT)
@@ -0,0 +1,71 @@
+import sys
+import os
+sys.path.insert(1, os.path.abspath('.'))
+from conftest import FakeLeague, Team, make_box_score
+from gamedaybot.espn.all_play import (AllPlayRecords, ScoreMatrix, average_ranks, format_record, week_all_play, )
+
+# points scored by teams 1-4 each week, 1 v 2 and 3 v 4
+WEEKLY_POINTS = {1: [100, 90, 80, 70], 2: [70, 80, 90, 100], 3: [90, 90, 60, 50], 4: [50, 60, 70, 80]}
+
+
+def matchups(league, week):
+    points = WEEKLY_POINTS[week]
+    return [make_box_score(league.teams[0], points[0], league.teams[1], points[1]),
+            make_box_score(league.teams[2], points[2], league.teams[3], points[3])]
+
+
+class TestAllPlay:
+    '''Test the incremental all-play engine'''
+
+    def test_week_all_play_counts_ties(self):
+        league = FakeLeague(matchups, teams=4)
+        assert week_all_play(league.box_scores(3)) == {1: [2, 0, 1], 2: [2, 0, 1], 3: [1, 2, 0], 4: [0, 3, 0]}
+
+    def test_records_through_week(self):
+        league = FakeLeague(matchups, teams=4)
+        records = AllPlayRecords(league.league_id, league.year).records(league, 2)
+        assert records == {1: [3, 3, 0], 2: [3, 3, 0], 3: [3, 3, 0], 4: [3, 3, 0]}
+
+    def test_only_new_weeks_are_computed(self):
+        league = FakeLeague(matchups, teams=4)
+        engine = AllPlayRecords(league.league_id, league.year)
+        engine.records(league, 2)
+        engine.records(league, 3)
+        assert league.fetches == [1, 2, 3]
+        assert engine.folded_week == 3
+
+        # week 4 is still open to stat corrections, so it is computed again on each call
+        engine.records(league, 4)
+        engine.records(league, 4)
+        assert league.fetches == [1, 2, 3, 4, 4]
+        assert engine.records(league, 1) == {1: [3, 0, 0], 2: [2, 1, 0], 3: [1, 2, 0], 4: [0, 3, 0]}
+
+    def test_format_record(self):
+        assert format_record([5, 2, 0]) == '5-2'
+        assert format_record([5, 2, 1]) == '5-2-1'
+
+    def test_average_ranks(self):
+        assert average_ranks([30, 10, 20, 20]) == [4, 1, 2.5, 2.5]
+
+    def test_score_matrix_top_half(self):
+        league = FakeLeague(matchups, teams=4)
+        weeks = [1, 2, 3, 4]
+        matrix = ScoreMatrix.from_box_scores([1, 2, 3, 4], weeks, [league.box_scores(w) for w in weeks])
+        # teams 1 and 2 tie for first in week 3, both are in the top half
+        assert matrix.top_half_wins() == {1: 2, 2: 2, 3: 2, 4: 2}
+        assert matrix.top_half_wins([3]) == {1: 1, 2: 1, 3: 0, 4: 0}
+        assert matrix.all_play() == {1: [5, 6, 1], 2: [6, 5, 1], 3: [6, 6, 0], 4: [6, 6, 0]}
+
+    def test_byes_are_left_out_of_all_play(self):
+        teams = [Team(i) for i in range(1, 4)]
+        box_scores = [make_box_score(teams[0], 90, teams[1], 80), make_box_score(teams[2], 100, 0, 0)]
+        assert week_all_play(box_scores) == {1: [1, 0, 0], 2: [0, 1, 0]}
+        # the team on a bye still counts toward the top half
+        matrix = ScoreMatrix.from_box_scores([1, 2, 3], [1], [box_scores])
+        assert matrix.top_half_wins() == {1: 0, 2: 0, 3: 1}
+
+    def test_top_half_boundary_tie_goes_to_the_first_listed_team(self):
+        league = FakeLeague(lambda league, week: [make_box_score(league.teams[0], 80, league.teams[1], 100),
+                                                  make_box_score(league.teams[2], 80, league.teams[3], 60)], teams=4)
+        matrix = ScoreMatrix.from_box_scores([1, 2, 3, 4], [1], [league.box_scores(1)])
+        assert matrix.top_half_wins() == {1: 1, 2: 1, 3: 0, 4: 0}
@@ -0,0 +1,56 @@
+import sys
+import os
+import threading
+sys.path.insert(1, os.path.abspath('.'))
+from gamedaybot.chat.delivery import DeliveryQueue
+
+
+class FakeBot:
+    '''Chat bot that records messages, optionally blocking until released'''
+
+    def __init__(self, name, release=None):
+        self.name = name
+        self.release = release
+        self.sent = []
+
+    def __repr__(self):
+        return self.name
+
+    def send_message(self, text):
+        if self.release:
+            self.release.wait()
+        if text == 'boom':
+            raise Exception('webhook down')
+        self.sent.append(text)
+
+
+class TestDeliveryQueue:
+    '''Test DeliveryQueue class'''
+
+    def test_delivers_in_order_per_channel(self):
+        delivery = DeliveryQueue()
+        bot = FakeBot('a')
+        for message in ['one', 'boom', 'two', 'three']:
+            delivery.submit(bot, message)
+        delivery.join()
+        assert bot.sent == ['one', 'two', 'three']
+        assert delivery.delivered == 3
+        assert delivery.failed == 1
+        assert delivery.latency()['max'] >= delivery.latency()['avg'] >= 0
+
+    def test_slow_channel_does_not_block_others(self):
+        delivery = DeliveryQueue()
+        release = threading.Event()
+        slow = FakeBot('slow', release)
+        fast = FakeBot('fast')
+        delivery.submit(slow, 'one')
+        delivery.submit(slow, 'two')
+        delivery.submit(fast, 'hello')
+        for channel in delivery._channels.values():
+            if channel is not delivery._channels['slow']:
+                channel.join()
+        assert fast.sent == ['hello']
+        assert delivery.depth() >= 1
+        release.set()
+        delivery.join()
+        assert slow.sent == ['one', 'two']
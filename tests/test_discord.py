@@ -2,7 +2,8 @@ import pytest
 import sys
 import os
 sys.path.insert(1, os.path.abspath('.'))
-from gamedaybot.chat.discord import (Discord, DiscordException, )
+import gamedaybot.utils.util as util
+from gamedaybot.chat.discord import (Discord, DiscordException, pack_embeds, )
 
 
 @pytest.mark.usefixtures("mock_requests")
@@ -19,8 +20,79 @@ class TestDiscord:
         mock_requests.post(self.url, status_code=204)
         assert self.test_bot.send_message(self.test_text).status_code == 204
 
+    def test_chunks_fit_with_prefix(self, mock_requests):
+        '''Do chunks split with room for the quote prefix stay within Discord's 2000 characters?'''
+        mock_requests.post(self.url, status_code=204)
+        text = "\n".join(["x" * 150] * 40) + "\n" + "y" * 5000
+        for chunk in util.str_chunks(text, 2000 - len(self.test_bot.prefix)):
+            self.test_bot.send_message(chunk)
+        contents = [request.json()['content'] for request in mock_requests.request_history]
+        assert len(contents) > 3
+        assert max(len(content) for content in contents) == 2000
+
     def test_bad_bot_id(self, mock_requests):
         '''Does the expected error raise when a bot id is incorrect?'''
         mock_requests.post(self.url, status_code=404)
         with pytest.raises(DiscordException):
             self.test_bot.send_message(self.test_text)
+
+    def test_retries_rate_limit(self, mock_requests, monkeypatch):
+        '''Does a rate limited message wait for Retry-After and send again?'''
+        sleeps = []
+        monkeypatch.setattr('gamedaybot.chat.discord.time.sleep', sleeps.append)
+        mock_requests.post(self.url, [{'status_code': 429, 'headers': {'Retry-After': '2.5'}},
+                                      {'status_code': 204}])
+        assert self.test_bot.send_message(self.test_text).status_code == 204
+        assert sleeps == [2.5]
+
+    def test_retries_server_error_with_backoff(self, mock_requests, monkeypatch):
+        '''Do server errors back off exponentially until the retries run out?'''
+        sleeps = []
+        monkeypatch.setattr('gamedaybot.chat.discord.time.sleep', sleeps.append)
+        bot = Discord(self.url, max_retries=3, backoff=1)
+        mock_requests.post(self.url, status_code=502)
+        with pytest.raises(DiscordException):
+            bot.send_message(self.test_text)
+        assert sleeps == [1, 2, 4]
+
+    def test_rate_limit_outlives_the_bot(self, mock_requests, monkeypatch):
+        '''Does a bot created for the next job wait for the bucket the previous one emptied?'''
+        sleeps = []
+        monkeypatch.setattr('gamedaybot.chat.discord.time.sleep', sleeps.append)
+        monkeypatch.setattr('gamedaybot.chat.discord._ready_at', {})
+        mock_requests.post(self.url, status_code=204, headers={'X-RateLimit-Remaining': '0',
+                                                               'X-RateLimit-Reset-After': '30'})
+        self.test_bot.send_message(self.test_text)
+        assert sleeps == []
+        Discord(self.url).send_message(self.test_text)
+        assert len(sleeps) == 1 and 29 < sleeps[0] <= 30
+        # other webhooks have buckets of their own
+        other = "https://discordapp.com/api/webhooks/456/def"
+        mock_requests.post(other, status_code=204)
+        Discord(other).send_message(self.test_text)
+        assert len(sleeps) == 1
+
+    def test_send_embeds_batches_sections(self, mock_requests):
+        '''Are several sections sent as embeds in one webhook call?'''
+        mock_requests.post(self.url, status_code=204)
+        responses = self.test_bot.send_embeds(['Standings', 'Optimal scores', 'Power rankings'])
+        assert len(responses) == 1
+        assert mock_requests.last_request.json() == {'embeds': [{'description': 'Standings'},
+                                                                {'description': 'Optimal scores'},
+                                                                {'description': 'Power rankings'}]}
+
+
+class TestPackEmbeds:
+    '''Test pack_embeds'''
+
+    def test_splits_on_embed_count(self):
+        payloads = pack_embeds(['section %d' % i for i in range(12)])
+        assert [len(embeds) for embeds in payloads] == [10, 2]
+
+    def test_splits_on_total_characters(self):
+        payloads = pack_embeds(['a' * 4000, 'b' * 4000, 'c' * 10])
+        assert [[len(embed['description']) for embed in embeds] for embeds in payloads] == [[4000], [4000, 10]]
+
+    def test_splits_long_sections(self):
+        payloads = pack_embeds(['x' * 5000])
+        assert [len(embed['description']) for embeds in payloads for embed in embeds] == [4096, 904]
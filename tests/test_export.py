@@ -0,0 +1,73 @@
+import sys
+import os
+sys.path.insert(1, os.path.abspath('.'))
+import io
+import json
+from types import SimpleNamespace
+import pytest
+from conftest import FakeLeague, make_box_score, make_player
+from gamedaybot.espn.export import (season_records, week_records, write_ndjson, write_parquet, )
+
+STARTER_COUNTS = {'QB': 1, 'RB': 1}
+
+
+def player(player_id, position, points, slot_position):
+    return make_player('Player %d' % player_id, position, points, slot_position=slot_position, playerId=player_id)
+
+
+def matchups(league, week):
+    home, away = league.teams
+    return [make_box_score(home, 30.0 + week, away, 25.0, home_projected=25.0, away_projected=30.0,
+                           home_lineup=[player(1, 'QB', 20.0 + week, 'QB'), player(2, 'RB', 10.0, 'RB'),
+                                        player(3, 'RB', 15.0, 'BE')],
+                           away_lineup=[player(4, 'QB', 15.0, 'QB'), player(5, 'RB', 10.0, 'RB')])]
+
+
+class TestExport:
+    '''Test the league season export'''
+
+    def setup_method(self):
+        self.league = FakeLeague(matchups, current_week=6,
+                                 settings=SimpleNamespace(position_slot_counts={'QB': 1, 'RB': 1, 'BE': 1}))
+
+    def test_week_records(self):
+        records = list(week_records(self.league, 1, self.league.box_scores(1), STARTER_COUNTS))
+        assert [record['record'] for record in records] == ['lineup'] * 3 + ['team_week'] + ['lineup'] * 2 + \
+            ['team_week', 'trophies']
+
+        home = records[3]
+        assert (home['week'], home['team_id'], home['opponent_id']) == (1, 1, 2)
+        assert (home['score'], home['result'], home['optimal_score'], home['bench_points']) == (31.0, 'W', 36.0, 5.0)
+        assert (home['all_play_wins'], home['all_play_losses'], home['all_play_ties']) == (1, 0, 0)
+        assert records[6]['result'] == 'L'
+        assert records[0] == {'league_id': 1234, 'year': 2024, 'week': 1, 'record': 'lineup', 'team_id': 1,
+                              'player_id': 1, 'name': 'Player 1', 'position': 'QB', 'slot': 'QB', 'pro_team': 'NYG',
+                              'points': 21.0, 'projected': 10.0}
+        assert records[7]['lines'][0].endswith('**Team 1** with 31.00 points')
+
+    def test_weeks_are_fetched_as_records_are_read(self):
+        records = season_records(self.league)
+        first = next(records)
+        assert first['week'] == 1
+        # the next week is fetched while the first one is read, never the whole season
+        assert self.league.fetches[0] == 1 and len(self.league.fetches) <= 2
+        assert len(list(records)) == 8 * 5 - 1
+        assert self.league.fetches == [1, 2, 3, 4, 5]
+
+    def test_write_ndjson(self):
+        stream = io.StringIO()
+        assert write_ndjson(season_records(self.league, weeks=[2, 3]), stream) == 16
+        lines = stream.getvalue().splitlines()
+        assert len(lines) == 16
+        assert json.loads(lines[-1])['record'] == 'trophies'
+        assert json.loads(lines[-1])['week'] == 3
+
+    def test_write_parquet(self, tmp_path):
+        parquet = pytest.importorskip('pyarrow.parquet')
+        assert write_parquet(season_records(self.league), str(tmp_path), row_group_size=8) == 40
+        lineups = parquet.ParquetFile(str(tmp_path / 'lineup.parquet'))
+        assert lineups.metadata.num_rows == 25
+        assert lineups.metadata.num_row_groups == 4
+        teams = parquet.read_table(str(tmp_path / 'team_week.parquet')).to_pylist()
+        assert [team['week'] for team in teams] == [1, 1, 2, 2, 3, 3, 4, 4, 5, 5]
+        assert parquet.read_table(str(tmp_path / 'trophies.parquet')).num_rows == 5
@@ -0,0 +1,54 @@
+import sys
+import os
+sys.path.insert(1, os.path.abspath('.'))
+import json
+import pytest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+import espn_api.football.box_player as box_player
+from gamedaybot.espn.fixtures import (FixtureMissing, FixtureRecorder, FixtureReplay, frozen_clock, recorded_reports,
+                                      replay_reports, )
+from gamedaybot.espn.http_cache import CachingEspnRequests
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+LEAGUES = sorted(name for name in os.listdir(FIXTURES) if os.path.isfile(os.path.join(FIXTURES, name, 'league.json')))
+
+
+class FakeSession:
+    '''Stand-in for requests.Session that answers every request with the view it was asked for'''
+
+    def __init__(self):
+        self.requests = 0
+
+    def get(self, url, params=None, headers=None, cookies=None):
+        self.requests += 1
+        return SimpleNamespace(status_code=200, text=json.dumps({'view': params['view']}))
+
+
+class TestFixtures:
+    '''Test recording and replaying ESPN responses'''
+
+    def test_replays_recorded_responses(self, tmp_path):
+        session = FakeSession()
+        recorder = CachingEspnRequests('nfl', 2024, 1234, cache=FixtureRecorder(str(tmp_path), session))
+        recorder.league_get(params={'view': 'mTeam'})
+
+        replay = CachingEspnRequests('nfl', 2024, 1234, cache=FixtureReplay(str(tmp_path)))
+        assert replay.league_get(params={'view': 'mTeam'}) == {'view': 'mTeam'}
+        assert session.requests == 1
+        with pytest.raises(FixtureMissing):
+            replay.league_get(params={'view': 'mRoster'})
+
+    def test_frozen_clock(self):
+        recorded_at = datetime(2024, 9, 27, 12, 0, tzinfo=timezone.utc).timestamp()
+        with frozen_clock(recorded_at):
+            assert box_player.datetime.now().timestamp() == recorded_at
+        assert box_player.datetime is datetime
+
+    def test_synthetic_league_is_committed(self):
+        assert 'synthetic' in LEAGUES
+
+    @pytest.mark.parametrize('name', LEAGUES)
+    def test_reports_match_recording(self, name):
+        path = os.path.join(FIXTURES, name)
+        assert replay_reports(path) == recorded_reports(path)
@@ -0,0 +1,85 @@
+import sys
+import os
+sys.path.insert(1, os.path.abspath('.'))
+from types import SimpleNamespace
+from conftest import Team
+import gamedaybot.espn.functionality as espn
+from gamedaybot.espn.league_cache import LeagueCache
+
+
+def make_player(position, points, slot_position='BE'):
+    return SimpleNamespace(name='%s %s' % (position, points), position=position, points=points,
+                           slot_position=slot_position)
+
+
+class TestOptimalLineupScore:
+    ############ For `optimal_lineup_score`
+    def test_straight_positions(self):
+        lineup = [make_player('QB', 20, 'QB'), make_player('QB', 25), make_player('RB', 10, 'RB')]
+        assert espn.optimal_lineup_score(lineup, {'QB': 1, 'RB': 1}) == (35, 30, 5, 30 / 35 * 100)
+
+    def test_overlapping_flex_slots(self):
+        # filling WR/TE first with the WR would leave the TE on the bench
+        lineup = [make_player('WR', 20, 'RB/WR'), make_player('TE', 15), make_player('RB', 10, 'WR/TE')]
+        assert espn.optimal_lineup_score(lineup, {'WR/TE': 1, 'RB/WR': 1})[0] == 35
+
+    def test_offensive_player_slot(self):
+        lineup = [make_player('QB', 30), make_player('QB', 22), make_player('RB', 18), make_player('WR', 5)]
+        starter_counts = {'QB': 1, 'RB/WR/TE': 1, 'OP': 1}
+        assert espn.optimal_lineup_score(lineup, starter_counts)[0] == 70
+
+    def test_ignores_positions_without_slots(self):
+        lineup = [make_player('K', 12), make_player('D/ST', 8)]
+        assert espn.optimal_lineup_score(lineup, {'D/ST': 1}) == (8, 0, 8, 0)
+
+    def test_fills_slots_with_negative_scores(self):
+        lineup = [make_player('D/ST', -2, 'D/ST')]
+        assert espn.optimal_lineup_score(lineup, {'D/ST': 1}) == (-2, -2, 0, 100)
+
+    def test_batch_matches_single_lineups(self):
+        starter_counts = {'QB': 1, 'RB/WR/TE': 1, 'OP': 1}
+        lineups = [[make_player('QB', 30, 'QB'), make_player('RB', 18, 'OP')],
+                   [make_player('WR', 12, 'RB/WR/TE'), make_player('TE', 3)],
+                   []]
+        assert espn.optimal_lineup_scores(lineups, starter_counts) == \
+            [espn.optimal_lineup_score(lineup, starter_counts) for lineup in lineups]
+
+
+class TestStarterCounts:
+    ############ For `get_starter_counts`
+    def test_uses_league_settings(self):
+        settings = SimpleNamespace(position_slot_counts={'QB': 1, 'TQB': 0, 'RB': 2, 'OP': 1, 'BE': 7, 'IR': 1})
+        league = SimpleNamespace(league_id=1, year=2024, settings=settings)
+        assert espn.get_starter_counts(league) == {'QB': 1, 'RB': 2, 'OP': 1}
+
+    def test_counts_lineups_once_without_settings(self):
+        fetches = []
+
+        def box_scores(week=None):
+            fetches.append(week)
+            return [SimpleNamespace(home_lineup=[make_player('QB', 20, 'QB'), make_player('RB', 5)],
+                                    away_lineup=[make_player('QB', 18, 'QB'), make_player('RB', 9, 'RB')])]
+
+        league = SimpleNamespace(league_id=99, year=2024, current_week=3, box_scores=box_scores)
+        assert espn.get_starter_counts(league) == {'QB': 1, 'RB': 1}
+        assert espn.get_starter_counts(LeagueCache(league)) == {'QB': 1, 'RB': 1}
+        assert fetches == [2]
+
+        # a refreshed league is a new object and is counted again
+        refreshed = SimpleNamespace(league_id=99, year=2024, current_week=4, box_scores=box_scores)
+        assert espn.get_starter_counts(refreshed) == {'QB': 1, 'RB': 1}
+        assert fetches == [2, 3]
+
+
+class TestOptimalTeamScores:
+    ############ For `optimal_team_scores`
+    def test_report_lists_every_team(self):
+        teams = [Team(1), Team(2)]
+        settings = SimpleNamespace(position_slot_counts={'QB': 1, 'BE': 1})
+        box_scores = [SimpleNamespace(home_team=teams[0], home_lineup=[make_player('QB', 20, 'QB'),
+                                                                       make_player('QB', 25)],
+                                      away_team=teams[1], away_lineup=[make_player('QB', 18, 'QB')])]
+        league = SimpleNamespace(league_id=7, year=2024, current_week=2, teams=teams, settings=settings,
+                                 box_scores=lambda week=None: box_scores)
+        assert espn.optimal_team_scores(league).splitlines()[1:3] == ['1:  `  T2:  18.00 [ 18.00 - 100.00%]`',
+                                                                      '2:  `  T1:  25.00 [ 20.00 - 80.00%]`']
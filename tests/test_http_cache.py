@@ -0,0 +1,82 @@
+import sys
+import os
+sys.path.insert(1, os.path.abspath('.'))
+import json
+from types import SimpleNamespace
+from gamedaybot.espn.http_cache import (CachingEspnRequests, HttpCache, get_http_cache, )
+
+URL = 'https://lm-api-reads.fantasy.espn.com/apis/v3/games/ffl/seasons/2024/segments/0/leagues/1234'
+
+
+class FakeSession:
+    '''Stand-in for requests.Session that answers 304 when sent a matching ETag'''
+
+    def __init__(self, body):
+        self.body = body
+        self.requests = []
+
+    def get(self, url, params=None, headers=None, cookies=None):
+        self.requests.append(headers)
+        if headers.get('If-None-Match') == '"v1"':
+            return SimpleNamespace(status_code=304, headers={}, text='')
+        return SimpleNamespace(status_code=200, headers={'ETag': '"v1"'}, text=self.body,
+                               json=lambda: json.loads(self.body))
+
+
+class TestHttpCache:
+    '''Test the ESPN response cache'''
+
+    def make_cache(self, ttl=60, path=None):
+        cache = HttpCache(ttl=ttl, path=path)
+        cache.session = FakeSession('{"scoringPeriodId": 3}')
+        return cache
+
+    def test_serves_fresh_responses_from_memory(self):
+        cache = self.make_cache()
+        assert cache.get(URL, params={'view': 'mTeam'}).json() == {'scoringPeriodId': 3}
+        assert cache.get(URL, params={'view': 'mTeam'}).json() == {'scoringPeriodId': 3}
+        cache.get(URL, params={'view': 'mRoster'})
+        assert len(cache.session.requests) == 2
+        assert cache.stats == {'requests': 3, 'hits': 1, 'revalidated': 0, 'misses': 2, 'bytes_saved': 22}
+
+    def test_revalidates_stale_responses(self):
+        cache = self.make_cache(ttl=0)
+        cache.get(URL)
+        assert cache.get(URL).json() == {'scoringPeriodId': 3}
+        assert cache.session.requests == [{}, {'If-None-Match': '"v1"'}]
+        assert cache.stats['revalidated'] == 1
+
+    def test_keeps_responses_on_disk(self, tmp_path):
+        self.make_cache(path=str(tmp_path)).get(URL)
+        cache = self.make_cache(path=str(tmp_path))
+        assert cache.get(URL).json() == {'scoringPeriodId': 3}
+        assert cache.session.requests == []
+
+    def test_credentials_are_part_of_the_key(self, tmp_path):
+        cache = self.make_cache(path=str(tmp_path))
+        cache.get(URL, cookies={'espn_s2': 'secret', 'SWID': '{abc}'})
+        cache.get(URL)
+        cache.get(URL, cookies={'espn_s2': 'other', 'SWID': '{abc}'})
+        assert len(cache.session.requests) == 3
+        assert not [name for name in os.listdir(str(tmp_path)) if 'secret' in open(str(tmp_path / name)).read()]
+
+    def test_caches_are_kept_per_setting(self, tmp_path):
+        cache = get_http_cache(60, str(tmp_path))
+        assert get_http_cache(60, str(tmp_path)) is cache
+        assert get_http_cache(120, str(tmp_path)).ttl == 120
+        assert get_http_cache(60, None) is not cache
+
+    def test_records_counters_per_report(self):
+        cache = self.make_cache()
+        before = cache.snapshot()
+        cache.get(URL)
+        cache.get(URL)
+        assert cache.record('get_standings', before)['hits'] == 1
+        assert cache.reports['get_standings']['misses'] == 1
+
+    def test_espn_requests_go_through_cache(self):
+        cache = self.make_cache()
+        request = CachingEspnRequests('nfl', 2024, 1234, cache=cache)
+        assert request.league_get(params={'view': 'mTeam'}) == {'scoringPeriodId': 3}
+        assert request.league_get(params={'view': 'mTeam'}) == {'scoringPeriodId': 3}
+        assert cache.stats['hits'] == 1
@@ -0,0 +1,68 @@
+import sys
+import os
+sys.path.insert(1, os.path.abspath('.'))
+import subprocess
+import pytest
+
+# cumulative `python -X importtime` budgets, in milliseconds, only checked when IMPORT_BUDGETS is set since wall-clock
+# times vary too much on shared machines
+IMPORT_BUDGET_MS = 100
+JOB_IMPORT_BUDGET_MS = 500
+budget = pytest.mark.skipif(not os.environ.get('IMPORT_BUDGETS'), reason="set IMPORT_BUDGETS=1 to check import times")
+
+# modules only some processes need, which must not be loaded by importing the bot or running an unrelated job
+LAZY_MODULES = ['apscheduler', 'http.server', 'pyarrow', 'gamedaybot.espn.season_recap',
+                'gamedaybot.espn.live_scores', 'gamedaybot.espn.export', 'gamedaybot.espn.fixtures']
+
+JOB = '''
+from types import SimpleNamespace
+import gamedaybot.espn.league_session as league_session
+from gamedaybot.espn.env_vars import get_env_vars
+from gamedaybot.espn.espn_bot import espn_bot
+
+settings = SimpleNamespace(matchup_periods=[[1]] * 14)
+league_session.get_league = lambda *args, **kwargs: SimpleNamespace(league_id=1, year=2024, current_week=1,
+                                                                    scoringPeriodId=1, settings=settings)
+espn_bot('init', get_env_vars({'DISCORD_WEBHOOK_URL': 'https://discord.invalid', 'LEAGUE_ID': '1',
+                               'TEST': 'true', 'INIT_MSG': 'Hi'}))
+'''
+
+
+def import_times(code):
+    # maps each module imported by the code to its cumulative import time in microseconds, and lists the top level
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True,
+                            check=True, env=dict(os.environ, PYTHONPATH=os.path.abspath('.')))
+    times = {}
+    top_level = []
+    for line in result.stderr.splitlines():
+        fields = line.split('|')
+        if not line.startswith('import time:') or len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        name = fields[2].rstrip()
+        times[name.strip()] = int(fields[1])
+        if not name.startswith('  '):
+            top_level.append(name.strip())
+    return times, top_level
+
+
+class TestImportTime:
+    '''Test that the bot starts without loading what it does not use'''
+
+    def test_importing_the_bot_is_light(self):
+        times, _ = import_times('import gamedaybot.espn.espn_bot')
+        assert not [module for module in LAZY_MODULES + ['requests', 'espn_api', 'gamedaybot.espn.functionality']
+                    if module in times]
+
+    def test_job_only_loads_what_it_uses(self):
+        times, _ = import_times(JOB)
+        assert not [module for module in LAZY_MODULES if module in times]
+
+    @budget
+    def test_bot_import_budget(self):
+        times, _ = import_times('import gamedaybot.espn.espn_bot')
+        assert times['gamedaybot.espn.espn_bot'] / 1000 < IMPORT_BUDGET_MS
+
+    @budget
+    def test_job_import_budget(self):
+        times, top_level = import_times(JOB)
+        assert sum(times[module] for module in top_level) / 1000 < JOB_IMPORT_BUDGET_MS
@@ -0,0 +1,60 @@
+import sys
+import os
+sys.path.insert(1, os.path.abspath('.'))
+import threading
+import time
+from gamedaybot.espn.job_limits import JobLimiter
+
+
+def run_jobs(limiter, league_ids, together):
+    '''
+    Runs one job per league id at once and returns the highest number running together, overall and per league.
+
+    Every job is held until `together` jobs are running, so the limits are reached without relying on timing.
+    '''
+    changed = threading.Condition()
+    release = threading.Event()
+    running = {}
+    peak = {'all': 0}
+
+    def job(function, tenant, batch=None):
+        with changed:
+            running[function] = running.get(function, 0) + 1
+            peak[function] = max(peak.get(function, 0), running[function])
+            peak['all'] = max(peak['all'], sum(running.values()))
+            changed.notify_all()
+        release.wait(5)
+        with changed:
+            running[function] -= 1
+
+    threads = [threading.Thread(target=limiter.wrap(job, league_id), args=(league_id,)) for league_id in league_ids]
+    for thread in threads:
+        thread.start()
+    try:
+        with changed:
+            assert changed.wait_for(lambda: sum(running.values()) == together, timeout=5)
+    finally:
+        release.set()
+    for thread in threads:
+        thread.join()
+    return peak
+
+
+class TestJobLimiter:
+    '''Test the scheduler job concurrency limits'''
+
+    def test_league_cap(self):
+        peak = run_jobs(JobLimiter(max_jobs=10, max_league_jobs=2), ['1'] * 5 + ['2'], together=3)
+        assert peak['1'] == 2
+        assert peak['2'] == 1
+        assert peak['all'] == 3
+
+    def test_global_cap(self):
+        peak = run_jobs(JobLimiter(max_jobs=2, max_league_jobs=2), ['1', '2', '3', '4'], together=2)
+        assert peak['all'] == 2
+
+    def test_jobs_get_the_batch_they_fired_in(self):
+        batches = []
+        limited = JobLimiter().wrap(lambda function, tenant, batch=None: batches.append(batch), '1')
+        limited('get_matchups')
+        assert batches == [int(time.time() // 60)] or batches == [int(time.time() // 60) - 1]
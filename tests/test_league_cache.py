@@ -0,0 +1,59 @@
+import sys
+import os
+sys.path.insert(1, os.path.abspath('.'))
+import threading
+from conftest import FakeLeague
+from gamedaybot.espn.league_cache import (LeagueCache, cached_league, shared_cache, )
+
+
+class TestLeagueCache:
+    '''Test LeagueCache class'''
+
+    def setup_method(self):
+        self.league = FakeLeague()
+        self.cache = LeagueCache(self.league)
+
+    def test_fetches_each_week_once(self):
+        assert self.cache.box_scores(2) == ['week 2']
+        assert self.cache.box_scores(week=2) == ['week 2']
+        assert self.league.fetches == [2]
+        assert self.cache.hits == 1
+        assert self.cache.misses == 1
+
+    def test_current_week_shares_entry(self):
+        self.cache.box_scores()
+        self.cache.box_scores(week=5)
+        self.cache.box_scores(week=9)
+        assert self.league.fetches == [5]
+        assert self.cache.cache_info() == {'hits': 2, 'misses': 1, 'stored': 0, 'weeks': [5]}
+
+    def test_proxies_league_attributes(self):
+        assert self.cache.league_id == 1234
+
+    def test_cached_league_is_idempotent(self):
+        assert cached_league(self.cache) is self.cache
+        assert isinstance(cached_league(self.league), LeagueCache)
+
+    def test_prefetch_returns_weeks_in_order(self):
+        self.cache.box_scores(3)
+        assert self.cache.prefetch([4, 1, 3, 2]) == [['week 4'], ['week 1'], ['week 3'], ['week 2']]
+        assert sorted(self.league.fetches) == [1, 2, 3, 4]
+        assert self.cache.misses == 4
+
+    def test_concurrent_requests_share_one_fetch(self):
+        self.league.delay = 0.05
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.cache.box_scores(3))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == [['week 3']] * 4
+        assert self.league.fetches == [3]
+        assert (self.cache.hits, self.cache.misses) == (3, 1)
+
+    def test_shared_cache_per_batch(self):
+        cache = shared_cache(self.league, 100)
+        assert shared_cache(self.league, 100) is cache
+        assert shared_cache(self.league, 101) is not cache
+        assert shared_cache(self.league, 100, tenant={'league_id': '1234'}) is not cache
@@ -0,0 +1,40 @@
+import sys
+import os
+sys.path.insert(1, os.path.abspath('.'))
+from gamedaybot.espn.fixtures import FixtureReplay
+from gamedaybot.espn.league_session import LeagueSession
+
+SYNTHETIC = os.path.join(os.path.dirname(__file__), 'fixtures', 'synthetic')
+
+
+class TestLeagueSession:
+    '''Test LeagueSession class against the synthetic fixture league'''
+
+    def setup_method(self):
+        self.session = LeagueSession(424242, 2024, ttl=300, http_cache=FixtureReplay(SYNTHETIC))
+
+    def test_returns_the_same_league_while_fresh(self):
+        league = self.session.get()
+        assert self.session.get() is league
+
+    def test_refresh_replaces_the_league(self):
+        league = self.session.get()
+        teams = list(league.teams)
+        rosters = [list(team.roster) for team in teams]
+
+        self.session.ttl = 0
+        refreshed = self.session.get()
+
+        assert refreshed is not league
+        assert league.teams == teams
+        assert [team.roster for team in league.teams] == rosters
+        assert [team.team_name for team in refreshed.teams] == [team.team_name for team in teams]
+
+    def test_refresh_keeps_football_settings(self):
+        league = self.session.get()
+        self.session.ttl = 0
+        refreshed = self.session.get()
+
+        assert refreshed.settings.position_slot_counts == league.settings.position_slot_counts
+        assert refreshed.nfl_week == league.nfl_week
+        assert refreshed.player_map is league.player_map
@@ -0,0 +1,57 @@
+import sys
+import os
+sys.path.insert(1, os.path.abspath('.'))
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from gamedaybot.espn.live_scores import (LiveWatcher, game_window, )
+
+NOW = datetime(2024, 9, 8, 14, 0)
+
+
+def make_player(points, projected, kickoff, slot_position='RB'):
+    played = 100 if NOW > kickoff + timedelta(hours=3) else 0
+    return SimpleNamespace(points=points, projected_points=projected, game_played=played, game_date=kickoff,
+                           slot_position=slot_position)
+
+
+def make_matchup(home_score, away_score, home_projected=100, away_projected=80, kickoff=NOW - timedelta(hours=1)):
+    home = SimpleNamespace(team_id=1, team_abbrev='HOME')
+    away = SimpleNamespace(team_id=2, team_abbrev='AWAY')
+    return SimpleNamespace(home_team=home, away_team=away, home_score=home_score, away_score=away_score,
+                           home_lineup=[make_player(0, home_projected, kickoff)],
+                           away_lineup=[make_player(0, away_projected, kickoff)])
+
+
+class TestLiveWatcher:
+    '''Test the live scoring watcher'''
+
+    def setup_method(self):
+        self.sent = []
+        self.watcher = LiveWatcher(None, self.sent.append)
+
+    def test_first_snapshot_is_silent(self):
+        assert self.watcher.changes([make_matchup(10, 5)]) == []
+
+    def test_reports_lead_change_once(self):
+        self.watcher.changes([make_matchup(10, 5)])
+        assert self.watcher.changes([make_matchup(12, 5)]) == []
+        assert self.watcher.changes([make_matchup(12, 12)]) == []
+        lines = self.watcher.changes([make_matchup(12, 20)])
+        assert lines == ['Lead change: `HOME  12.00 -  20.00 AWAY`']
+        assert self.watcher.changes([make_matchup(12, 22)]) == []
+
+    def test_reports_newly_close_game(self):
+        self.watcher.changes([make_matchup(10, 5, 100, 80)])
+        assert self.watcher.changes([make_matchup(10, 5, 100, 92)]) == ['Close game: `HOME  10.00 -   5.00 AWAY`']
+
+    def test_game_window(self):
+        assert game_window([make_matchup(0, 0)], NOW) == (True, None)
+        later = NOW + timedelta(hours=2)
+        assert game_window([make_matchup(0, 0, kickoff=later)], NOW) == (False, later)
+
+    def test_next_interval(self):
+        assert self.watcher.next_interval([make_matchup(0, 0)], NOW) == 60
+        assert self.watcher.next_interval([make_matchup(0, 0, kickoff=NOW + timedelta(hours=2))], NOW) == 900
+        assert self.watcher.next_interval([make_matchup(0, 0, kickoff=NOW + timedelta(minutes=5))], NOW) == 300
+        assert self.watcher.next_interval([make_matchup(0, 0, kickoff=NOW - timedelta(hours=4))], NOW) is None
+        assert self.watcher.next_interval([make_matchup(0, 0, kickoff=NOW + timedelta(hours=8))], NOW) is None
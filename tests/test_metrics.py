@@ -0,0 +1,89 @@
+import sys
+import os
+sys.path.insert(1, os.path.abspath('.'))
+import io
+import json
+import logging
+from types import SimpleNamespace
+import pytest
+import requests
+import gamedaybot.utils.metrics as metrics
+
+
+class TestMetrics:
+    '''Test the span timing and metrics exports'''
+
+    def setup_method(self):
+        metrics._registry = None
+
+    def test_span_totals(self):
+        for size in (100, 250):
+            with metrics.span('espn_request', view='mTeam') as request:
+                request['bytes'] = size
+                request['status'] = '200'
+        with pytest.raises(ValueError):
+            with metrics.span('espn_request', view='mTeam'):
+                raise ValueError('boom')
+
+        totals = metrics.get_metrics().totals()[('espn_request', (('view', 'mTeam'),))]
+        assert totals['count'] == 3
+        assert totals['errors'] == 1
+        assert totals['bytes'] == 350
+        assert 'status' not in totals
+
+    def test_only_counters_are_summed(self):
+        for week in (3, 4):
+            with metrics.span('job', report='get_final') as running:
+                running['week'] = week
+                running['wait_seconds'] = 0.5
+        totals = metrics.get_metrics().totals()[('job', (('report', 'get_final'),))]
+        assert 'week' not in totals
+        assert totals['wait_seconds'] == {'count': 2, 'seconds': 1.0}
+
+    def test_json_log_lines(self):
+        stream = io.StringIO()
+        metrics.enable_json_logs(stream)
+        try:
+            with metrics.span('render', report='get_standings') as rendering:
+                rendering['chars'] = 42
+        finally:
+            metrics.logger.handlers.clear()
+        entry = json.loads(stream.getvalue().splitlines()[-1])
+        assert entry['span'] == 'render'
+        assert entry['report'] == 'get_standings'
+        assert entry['chars'] == 42
+
+    def test_no_log_line_unless_enabled(self, monkeypatch):
+        monkeypatch.setattr(metrics, 'json', SimpleNamespace(dumps=lambda *args, **kwargs: pytest.fail('log built')))
+        level = metrics.logger.level
+        metrics.logger.setLevel(logging.WARNING)
+        try:
+            with metrics.span('box_scores', week=3):
+                pass
+        finally:
+            metrics.logger.setLevel(level)
+        assert metrics.get_metrics().totals()[('box_scores', (('week', 3),))]['count'] == 1
+
+    def test_prometheus_endpoint(self):
+        with metrics.span('webhook_post', platform='discord') as post:
+            post['retries'] = 2
+        server = metrics.serve_metrics(0, host='127.0.0.1')
+        try:
+            r = requests.get('http://127.0.0.1:%d/metrics' % server.server_address[1])
+        finally:
+            server.shutdown()
+        assert r.status_code == 200
+        assert 'gamedaybot_span_seconds_count{span="webhook_post",platform="discord"} 1' in r.text
+        assert 'gamedaybot_span_retries_total{span="webhook_post",platform="discord"} 2' in r.text
+
+    def test_prometheus_types(self):
+        for name in ('job', 'render'):
+            with metrics.span(name) as running:
+                running['wait_seconds'] = 0.25
+                running['chars'] = 10
+        lines = metrics.get_metrics().prometheus().splitlines()
+        types = [line for line in lines if line.startswith('# TYPE')]
+        assert types == ['# TYPE gamedaybot_span_seconds summary', '# TYPE gamedaybot_span_errors_total counter',
+                         '# TYPE gamedaybot_span_wait_seconds summary']
+        assert 'gamedaybot_span_wait_seconds_sum{span="job"} 0.25' in lines
+        assert not [line for line in lines if 'chars' in line]
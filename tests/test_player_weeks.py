@@ -0,0 +1,100 @@
+import sys
+import os
+sys.path.insert(1, os.path.abspath('.'))
+from conftest import FakeLeague, make_box_score, make_player
+from gamedaybot.espn.player_weeks import (PlayerWeeks, PlayerWeekTable, best_and_worst, )
+
+
+# the same two lineups every week, with the points each player scores in weeks 1-3
+WEEKLY_POINTS = {'QB': [30, 18, 20], 'K': [2, 9, 8], 'RB': [5, 12, 40], 'D/ST': [25, 1, 4], 'WR': [14, 9, 9]}
+
+
+def matchups(league, week):
+    points = {name: weekly[week - 1] for name, weekly in WEEKLY_POINTS.items()}
+    home, away = league.teams
+    return [make_box_score(home, 0, away, 0,
+                           home_lineup=[make_player('QB', 'QB', points['QB'], 20),
+                                        make_player('K', 'K', points['K'], 8),
+                                        make_player('WR', 'WR', points['WR'], 10, 'BE')],
+                           away_lineup=[make_player('RB', 'RB', points['RB'], 10),
+                                        make_player('D/ST', 'D/ST', points['D/ST'], 8)])]
+
+
+class TestBestAndWorst:
+    '''Test the MVP/LVP selection'''
+
+    def test_running_best_is_never_the_worst(self):
+        # each of the first two beats the best so far, so only the third can be the LVP
+        assert best_and_worst([(-1, -1), (2, 2), (0, 0)], [True] * 3, [True] * 3) == (1, 2)
+
+    def test_ties_go_to_the_earlier_performance(self):
+        assert best_and_worst([(1, 1), (1, 1), (0, 0), (0, 0)], [True] * 4, [True] * 4) == (0, 2)
+
+    def test_ineligible_best_is_skipped(self):
+        assert best_and_worst([(5, 5), (1, 1)], [False, True], [True, True]) == (1, None)
+
+
+class TestPlayerWeeks:
+    '''Test the columnar player-week table'''
+
+    def setup_method(self):
+        self.league = FakeLeague(matchups, current_week=4)
+        self.table = PlayerWeeks.from_box_scores([1, 2, 3], [self.league.box_scores(w) for w in (1, 2, 3)])
+
+    def test_columns(self):
+        assert len(self.table) == 15
+        assert self.table.name[:5] == ['QB', 'K', 'WR', 'RB', 'D/ST']
+        away = self.league.teams[1]
+        assert self.table.row(3) == {'week': 1, 'team': away, 'player_id': 'RB', 'name': 'RB', 'position': 'RB',
+                                     'slot': 'RB', 'points': 5, 'projected': 10}
+
+    def test_performances(self):
+        mvp, lvp = self.table.performances()
+        assert (mvp['name'], mvp['week'], mvp['ratio']) == ('RB', 3, 3.0)
+        assert (lvp['name'], lvp['week'], lvp['ratio']) == ('K', 1, -0.75)
+        mvp, lvp = self.table.performances(weeks=[1, 2], exclude_worst=('K',))
+        assert (mvp['name'], mvp['week']) == ('QB', 1)
+        assert (lvp['name'], lvp['week']) == ('RB', 1)
+
+    def test_season_performances(self):
+        mvp, lvp = self.table.season_performances()
+        away = self.league.teams[1]
+        assert (mvp['name'], mvp['team'], mvp['points'], mvp['projected'], mvp['starts']) == ('RB', away, 57, 30, 3)
+        assert (lvp['name'], lvp['points'], lvp['projected']) == ('K', 19, 24)
+
+    def test_projection_bias(self):
+        bias = self.table.projection_bias()
+        assert sorted(bias) == ['D/ST', 'K', 'QB', 'RB']
+        assert bias['QB'] == {'starts': 3, 'points': 68, 'projected': 60, 'bias': 8 / 3, 'ratio': 68 / 60}
+        assert self.table.projection_bias(weeks=[3], by='team')[self.league.teams[1]]['points'] == 44
+
+    def test_best_weeks(self):
+        assert [(row['name'], row['week']) for row in self.table.best_weeks(3)] == [('RB', 3), ('QB', 1), ('D/ST', 1)]
+        assert self.table.best_weeks(position='K', weeks=[1])[0]['points'] == 2
+
+
+class TestPlayerWeekTable:
+    '''Test that finished weeks are folded into the table once'''
+
+    def test_only_new_weeks_are_fetched(self):
+        league = FakeLeague(matchups, current_week=4)
+        table = PlayerWeekTable(league.league_id, league.year)
+        assert len(table.through(league, 2)) == 10
+        assert len(table.through(league, 2)) == 10
+        assert league.fetches == [1, 2]
+        assert table.folded_week == 2
+
+        # week 3 is still open to stat corrections, so it is fetched again on each call
+        assert len(table.through(league, 3)) == 15
+        table.through(league, 3)
+        assert league.fetches == [1, 2, 3, 3]
+        assert len(table.folded) == 10
+
+    def test_result_is_a_copy(self):
+        league = FakeLeague(matchups, current_week=4)
+        table = PlayerWeekTable(league.league_id, league.year)
+        table.through(league, 2)
+        result = table.through(league, 2)
+        assert result is not table.folded
+        result.add_week(3, league.box_scores(3))
+        assert len(table.through(league, 2)) == 10
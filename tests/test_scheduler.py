@@ -0,0 +1,45 @@
+import sys
+import os
+sys.path.insert(1, os.path.abspath('.'))
+import pytest
+from gamedaybot.espn.espn_bot import espn_bot
+from gamedaybot.espn.job_limits import JobLimiter
+
+# apscheduler 3.3 cannot be imported on Python 3.10 and later
+scheduler = pytest.importorskip('gamedaybot.espn.scheduler', exc_type=ImportError)
+
+
+class FakeScheduler:
+    '''Stand-in for an apscheduler scheduler that keeps the jobs added to it'''
+
+    def __init__(self):
+        self.jobs = {}
+
+    def add_job(self, func, trigger, args=None, id=None, executor='default', **kwargs):
+        self.jobs[id] = {'func': func, 'args': args, 'executor': executor}
+
+
+class TestAddJobs:
+    '''Test where the scheduled jobs of a league run'''
+
+    def setup_method(self):
+        self.data = {'league_id': '1', 'ff_start_date': '2024-09-05', 'ff_end_date': '2025-01-06',
+                     'my_timezone': 'UTC', 'live_scores': True, 'daily_waiver': False, 'swid': None, 'espn_s2': None}
+
+    def test_live_scores_run_outside_the_limiter(self):
+        sched = FakeScheduler()
+        scheduler.add_jobs(sched, self.data, limiter=JobLimiter(), live_executor='live')
+
+        for job_id in ('live_scores', 'live_scores_sun'):
+            assert sched.jobs[job_id]['func'] is espn_bot
+            assert sched.jobs[job_id]['executor'] == 'live'
+        assert sched.jobs['final']['func'] is not espn_bot
+        assert sched.jobs['final']['executor'] == 'default'
+
+    def test_snapshots_without_live_scores(self):
+        self.data['live_scores'] = False
+        sched = FakeScheduler()
+        scheduler.add_jobs(sched, self.data, limiter=JobLimiter())
+
+        assert 'live_scores' not in sched.jobs
+        assert sched.jobs['scoreboard2']['executor'] == 'default'
@@ -0,0 +1,77 @@
+import sys
+import os
+sys.path.insert(1, os.path.abspath('.'))
+import json
+import pytest
+from types import SimpleNamespace
+import gamedaybot.espn.env_vars as env_vars
+from gamedaybot.espn.env_vars import get_env_vars, split_emotes
+from gamedaybot.espn.tenants import load_tenants
+
+
+def write_tenants(tmp_path, config):
+    path = tmp_path / 'tenants.json'
+    path.write_text(json.dumps(config))
+    return str(path)
+
+
+class TestTenants:
+    '''Test loading several leagues from a tenants file'''
+
+    def test_leagues_override_defaults(self, tmp_path):
+        path = write_tenants(tmp_path, {
+            'defaults': {'DISCORD_WEBHOOK_URL': 'https://example.com/hook', 'TIMEZONE': 'America/Chicago'},
+            'leagues': [{'LEAGUE_ID': 1}, {'LEAGUE_ID': 2, 'LEAGUE_YEAR': 2025, 'TIMEZONE': 'UTC'}]})
+        tenants = load_tenants(path)
+        assert [tenant['league_id'] for tenant in tenants] == ['1', '2']
+        assert tenants[0]['my_timezone'] == 'America/Chicago'
+        assert tenants[1]['my_timezone'] == 'UTC'
+        assert tenants[1]['year'] == 2025
+        assert tenants[1]['discord_webhook_url'] == 'https://example.com/hook'
+
+    def test_emotes_are_per_tenant(self, tmp_path):
+        path = write_tenants(tmp_path, {'defaults': {'DISCORD_WEBHOOK_URL': 'https://example.com/hook'},
+                                        'leagues': [{'LEAGUE_ID': 1, 'EMOTES': ':a:,:b:'}, {'LEAGUE_ID': 2}]})
+        first, second = load_tenants(path)
+        teams = [SimpleNamespace(team_id=1), SimpleNamespace(team_id=2)]
+        assert split_emotes(SimpleNamespace(tenant=first, teams=teams)) == ['', ':a:', ':b:']
+        assert split_emotes(SimpleNamespace(tenant=second, teams=teams)) == ['', '', '']
+
+
+class TestSettings:
+    '''Test the read-only league profile'''
+
+    def setup_method(self):
+        self.settings = get_env_vars({'DISCORD_WEBHOOK_URL': 'https://example.com/hook', 'LEAGUE_ID': '1',
+                                      'EMOTES': ':a:,:b:', 'TEST': 'true'})
+
+    def test_items_and_attributes(self):
+        assert self.settings['league_id'] == self.settings.league_id == '1'
+        assert self.settings.test is True
+        assert self.settings.get('users') is None
+        with pytest.raises(AttributeError):
+            self.settings.users_missing
+
+    def test_read_only(self):
+        with pytest.raises(AttributeError):
+            self.settings.league_id = '2'
+        with pytest.raises(TypeError):
+            self.settings['league_id'] = '2'
+        assert self.settings.league_id == '1'
+
+    def test_team_lookups_are_split_once(self):
+        teams = [SimpleNamespace(team_id=1), SimpleNamespace(team_id=2), SimpleNamespace(team_id=3)]
+        league = SimpleNamespace(tenant=self.settings, teams=teams)
+        emotes = split_emotes(league)
+        assert emotes == ['', ':a:', ':b:']
+        assert split_emotes(league) is emotes
+        assert self.settings.users.for_league(league) == ['', '', '', '']
+
+    def test_settings_are_parsed_once(self, monkeypatch):
+        monkeypatch.setattr(env_vars, '_settings', None)
+        monkeypatch.setenv('DISCORD_WEBHOOK_URL', 'https://example.com/hook')
+        monkeypatch.setenv('LEAGUE_ID', '5')
+        settings = env_vars.get_settings()
+        monkeypatch.setenv('LEAGUE_ID', '6')
+        assert env_vars.get_settings() is settings
+        assert settings.league_id == '5'
@@ -0,0 +1,59 @@
+import sys
+import os
+sys.path.insert(1, os.path.abspath('.'))
+from conftest import Team, make_box_score, make_player
+from gamedaybot.espn.trophies import (HighScoreTrophy, LuckyTrophy, MvpTrophy, Trophy, TrophyEngine,
+                                      weekly_trophies, )
+
+EMOTES = ['', ':a:', ':b:', ':c:', ':d:']
+TEAMS = [None] + [Team(team_id) for team_id in range(1, 5)]
+WEEK = [
+    make_box_score(TEAMS[1], 120, TEAMS[2], 118, home_projected=110, away_projected=90,
+                   home_lineup=[make_player('Starter', points=30, projected=10),
+                                make_player('Bench', points=50, projected=5, slot_position='BE')],
+                   away_lineup=[make_player('Defense', 'D/ST', 0, 10), make_player('Bust', points=2, projected=20)]),
+    make_box_score(TEAMS[3], 80, TEAMS[4], 140, home_projected=100, away_projected=150),
+]
+
+
+class CountingTrophy(Trophy):
+    def __init__(self):
+        self.players = 0
+
+    def player(self, team, player):
+        self.players += 1
+
+
+class TestTrophyEngine:
+    '''Test the weekly trophy engine'''
+
+    def test_weekly_trophies(self):
+        lines = TrophyEngine(weekly_trophies()).run(WEEK).lines(EMOTES)
+        assert lines == ['👑 `Highest score:` :d: \n- **Team 4** with 140.00 points',
+                         '💩 `Lowest score:` :c: \n- **Team 3** with 80.00 points',
+                         '🧊 `Closest Win:` :a:> :b: \n- **Team 1** barely beat **Team 2** by a margin of 2.00',
+                         '💥 `Biggest Loss:` :c:< :d: \n- **Team 3** got blown out by **Team 4** by a margin of 60.00']
+
+    def test_extra_trophies(self):
+        lines = TrophyEngine(weekly_trophies(True)).run(WEEK).lines(EMOTES)
+        assert lines[4:] == [
+            '📈 `Overachiever:` :b: \n- **Team 2** was 28.00 points over their projection',
+            '🍀 `Lucky:` :a: \n- **Team 1** was 2-1 against the league, but got the win',
+            '💀 `Unlucky:` :b: \n- **Team 2** was 1-2 against the league, but still took an L',
+            '👍 `Week MVP:` :a: \n- RB Starter, **T1** with 30.00 points (10.00 proj, 2.00 diff ratio)',
+            '👎 `Week LVP:` :b: \n- RB Bust, **T2** with 2.00 points (20.00 proj, -0.90 diff ratio)']
+
+    def test_skips_byes(self):
+        bye = make_box_score(TEAMS[1], 150, 0, 0, home_projected=100, away_projected=100)
+        high = HighScoreTrophy()
+        lucky = LuckyTrophy()
+        TrophyEngine([high, lucky]).run(WEEK + [bye])
+        assert high.high_team is TEAMS[1]
+        assert [team for team, _ in lucky.results] == TEAMS[1:5]
+
+    def test_only_calls_declared_hooks(self):
+        counting = CountingTrophy()
+        engine = TrophyEngine([counting, MvpTrophy()])
+        assert engine._matchup == [] and engine._team == []
+        engine.run(WEEK)
+        assert counting.players == 4
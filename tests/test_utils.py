@@ -142,6 +142,35 @@ class TestStringLimitCheck:
         with pytest.raises(TypeError):
             util.str_limit_check("hello", "five")
 
+class TestStringChunks:
+    ############ For `str_chunks`
+    def test_str_chunks_many_parts(self):
+        text = "\n".join(["line %02d" % i for i in range(10)])
+        assert list(util.str_chunks(text, 16)) == ["line 00\nline 01", "line 02\nline 03", "line 04\nline 05",
+                                                   "line 06\nline 07", "line 08\nline 09"]
+
+    def test_str_chunks_long_line(self):
+        assert list(util.str_chunks("a" * 25, 10)) == ["a" * 10, "a" * 10, "a" * 5]
+
+    def test_str_chunks_respects_limit(self):
+        text = "\n".join(["row %d" % i for i in range(1000)])
+        chunks = list(util.str_chunks(text, 100))
+        assert all(len(chunk) <= 100 for chunk in chunks)
+        assert "\n".join(chunks) == text
+
+    def test_str_chunks_reopens_code_block(self):
+        text = "intro\n```\n" + "\n".join(["line %02d" % i for i in range(6)]) + "\n```\noutro"
+        chunks = list(util.str_chunks(text, 30))
+        assert all(len(chunk) <= 30 for chunk in chunks)
+        assert all(chunk.count("```") % 2 == 0 for chunk in chunks)
+        assert chunks[0] == "intro\n```\nline 00\nline 01\n```"
+        assert chunks[1].startswith("```\nline 02")
+
+    def test_str_chunks_is_lazy(self):
+        chunks = util.str_chunks("hello\nworld", 8)
+        assert next(chunks) == "hello"
+
+
 class TestStringToDatetime:
     ############ For `str_to_datetime`
     def test_str_to_datetime_valid_date(self):
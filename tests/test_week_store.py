@@ -0,0 +1,48 @@
+import sys
+import os
+sys.path.insert(1, os.path.abspath('.'))
+from conftest import FakeLeague, make_box_score, make_player
+from gamedaybot.espn.league_cache import LeagueCache
+from gamedaybot.espn.week_store import (WeekStore, is_final_week, )
+
+
+def matchups(league, week):
+    home, away = league.teams
+    return [make_box_score(home, 100.5, away, 90.25, home_lineup=[make_player('Home RB', points=20.0)],
+                           away_lineup=[make_player('Away RB', points=8.0)], home_projected=99.0, away_projected=95.0)]
+
+
+class TestWeekStore:
+    '''Test WeekStore class'''
+
+    def setup_method(self):
+        self.league = FakeLeague(matchups)
+
+    def test_is_final_week(self):
+        assert is_final_week(self.league, 3)
+        assert not is_final_week(self.league, 4)
+        assert not is_final_week(self.league, 5)
+
+    def test_round_trip(self, tmp_path):
+        store = WeekStore(str(tmp_path))
+        assert store.save(self.league, 2, self.league.box_scores(2))
+        restored = store.load(self.league, 2)
+        assert restored[0].home_team is self.league.teams[0]
+        assert restored[0].away_score == 90.25
+        assert restored[0].home_lineup[0].name == 'Home RB'
+        assert restored[0].home_lineup[0].points == 20.0
+
+    def test_skips_open_weeks(self, tmp_path):
+        store = WeekStore(str(tmp_path))
+        assert not store.save(self.league, 4, self.league.box_scores(4))
+        assert store.load(self.league, 4) is None
+
+    def test_cache_reads_store_before_espn(self, tmp_path):
+        store = WeekStore(str(tmp_path))
+        LeagueCache(self.league, store=store).prefetch([1, 2, 3])
+        assert sorted(self.league.fetches) == [1, 2, 3]
+
+        cache = LeagueCache(self.league, store=store)
+        cache.prefetch([1, 2, 3, 4])
+        assert sorted(self.league.fetches) == [1, 2, 3, 4]
+        assert cache.stored == 3